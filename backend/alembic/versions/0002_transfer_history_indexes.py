@@ -0,0 +1,42 @@
+"""transfer history indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+Composite indexes behind GET /accounts/{id}/transfers: one range scan per
+side of the UNION ALL, already in (created_at, id) keyset order.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_transfers_from_account_history",
+        "transfers",
+        ["from_account_id", "created_at", "id"],
+        postgresql_include=["to_account_id", "amount"],
+    )
+    op.create_index(
+        "ix_transfers_to_account_history",
+        "transfers",
+        ["to_account_id", "created_at", "id"],
+        postgresql_include=["from_account_id", "amount"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transfers_to_account_history", table_name="transfers")
+    op.drop_index("ix_transfers_from_account_history", table_name="transfers")
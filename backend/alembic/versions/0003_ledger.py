@@ -0,0 +1,73 @@
+"""append-only ledger and balance checkpoints
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+Every balance change is posted to ledger_entries; balance_checkpoints
+snapshot each account every LEDGER_CHECKPOINT_INTERVAL entries so
+GET /accounts/{id}/balance?as_of= replays a bounded window. Existing
+accounts get a carried_over entry for their current balance; their history
+before it is unknown, so as_of queries before it are rejected.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("accounts") as batch:
+        batch.add_column(sa.Column("ledger_count", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "ledger_entries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("transfer_id", sa.Integer(), sa.ForeignKey("transfers.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_ledger_entries_account_time",
+        "ledger_entries",
+        ["account_id", "created_at", "id"],
+    )
+
+    op.create_table(
+        "balance_checkpoints",
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("seq", sa.Integer(), sa.ForeignKey("ledger_entries.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_balance_checkpoints_account_time",
+        "balance_checkpoints",
+        ["account_id", "created_at"],
+    )
+
+    op.execute(
+        "INSERT INTO ledger_entries (account_id, amount, kind, created_at) "
+        "SELECT id, balance, 'carried_over', CURRENT_TIMESTAMP FROM accounts"
+    )
+    op.execute("UPDATE accounts SET ledger_count = 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_balance_checkpoints_account_time", table_name="balance_checkpoints")
+    op.drop_table("balance_checkpoints")
+    op.drop_index("ix_ledger_entries_account_time", table_name="ledger_entries")
+    op.drop_table("ledger_entries")
+    with op.batch_alter_table("accounts") as batch:
+        batch.drop_column("ledger_count")
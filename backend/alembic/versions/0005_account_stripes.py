@@ -0,0 +1,49 @@
+"""striped account balances
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:00:00
+
+Accounts with stripe_count > 0 take transfer credits on one of their
+account_stripes rows instead of the accounts row; the stripes are folded
+back into accounts.balance by a background job.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("accounts") as batch:
+        batch.add_column(sa.Column("stripe_count", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "account_stripes",
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("stripe", sa.Integer(), primary_key=True),
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+        sa.Column("ledger_count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # fold pending credits back before dropping them
+    op.execute(
+        "UPDATE accounts SET "
+        "balance = balance + (SELECT COALESCE(SUM(balance), 0) FROM account_stripes WHERE account_id = accounts.id), "
+        "ledger_count = ledger_count + (SELECT COALESCE(SUM(ledger_count), 0) FROM account_stripes WHERE account_id = accounts.id) "
+        "WHERE stripe_count > 0"
+    )
+    op.drop_table("account_stripes")
+    with op.batch_alter_table("accounts") as batch:
+        batch.drop_column("stripe_count")
@@ -0,0 +1,41 @@
+"""daily per-account rollups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:00:00
+
+daily_account_rollups holds each account's money in, money out and
+transfer counts per UTC day, maintained as ledger entries are posted.
+The table starts empty: run ``python -m app.cli rollups`` once to build
+it from the existing ledger.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_account_rollups",
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("slot", sa.Integer(), primary_key=True),
+        sa.Column("money_in", sa.Numeric(16, 2), nullable=False),
+        sa.Column("money_out", sa.Numeric(16, 2), nullable=False),
+        sa.Column("transfers_in", sa.Integer(), nullable=False),
+        sa.Column("transfers_out", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_account_rollups")
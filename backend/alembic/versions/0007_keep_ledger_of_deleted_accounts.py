@@ -0,0 +1,67 @@
+"""keep the ledger of deleted accounts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:00:00
+
+ledger_entries and balance_checkpoints no longer reference accounts, so
+deleting an account leaves its ledger in place. On SQLite, accounts.id
+becomes AUTOINCREMENT so a new account never takes a deleted one's id
+(and with it that account's ledger). PostgreSQL sequences never reuse ids.
+
+Downgrading deletes the ledger rows of accounts that no longer exist, since
+the foreign keys it restores would reject them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEDGER_TABLES = ("ledger_entries", "balance_checkpoints")
+# SQLite foreign keys are unnamed; batch mode names them by this convention
+SQLITE_NAMES = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _is_sqlite() -> bool:
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_sqlite():
+        for table in LEDGER_TABLES:
+            op.drop_constraint(f"{table}_account_id_fkey", table, type_="foreignkey")
+        return
+
+    for table in LEDGER_TABLES:
+        with op.batch_alter_table(table, naming_convention=SQLITE_NAMES) as batch:
+            batch.drop_constraint(f"fk_{table}_account_id_accounts", type_="foreignkey")
+    with op.batch_alter_table("accounts", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+        pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in LEDGER_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE account_id NOT IN (SELECT id FROM accounts)")
+
+    if not _is_sqlite():
+        for table in LEDGER_TABLES:
+            op.create_foreign_key(
+                f"{table}_account_id_fkey", table, "accounts", ["account_id"], ["id"], ondelete="CASCADE",
+            )
+        return
+
+    with op.batch_alter_table("accounts", recreate="always", table_kwargs={"sqlite_autoincrement": False}):
+        pass
+    for table in LEDGER_TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.create_foreign_key(
+                f"fk_{table}_account_id_accounts", "accounts", ["account_id"], ["id"], ondelete="CASCADE",
+            )
@@ -0,0 +1,34 @@
+"""transfers created_at index
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 17:00:00
+
+The transfer volume reports and GET /transfers/ select transfers by time
+across all accounts; without this index each of them scans the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_transfers_created_at",
+        "transfers",
+        ["created_at", "id"],
+        postgresql_include=["from_account_id", "to_account_id", "amount"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transfers_created_at", table_name="transfers")
@@ -0,0 +1,56 @@
+"""Operational commands, run from ``backend/``::
+
+    python -m app.cli seed                  # first admin + sample customers
+    python -m app.cli seed --create-schema  # also create missing tables (no Alembic)
+    python -m app.cli rollups               # rebuild daily account rollups from the ledger
+
+With ``FAST_START`` the API neither creates tables nor seeds on boot;
+run ``alembic upgrade head`` and this command once per environment instead.
+"""
+import argparse
+import os
+
+from app.db import Base, SessionLocal, engine
+from app.services.rollups import rebuild
+from app.services.seed import DEFAULT_ADMIN_EMAIL, seed_admin_employee, seed_initial_customers
+
+
+def seed(args) -> None:
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        password = os.getenv("SEED_ADMIN_PASSWORD")
+        extra = {"password": password} if password else {}
+        if seed_admin_employee(db, email=args.admin_email, **extra):
+            print(f"✔ Admin user {args.admin_email} created")
+        if not args.no_customers and seed_initial_customers(db):
+            print("✔ Sample customers added")
+
+
+def rollups(args) -> None:
+    with SessionLocal() as db:
+        rows = rebuild(db, account_id=args.account)
+        db.commit()
+    print(f"✔ {rows} daily rollup rows rebuilt")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_cmd = commands.add_parser("seed", help="create the first admin and sample customers if missing")
+    seed_cmd.add_argument("--admin-email", default=DEFAULT_ADMIN_EMAIL)
+    seed_cmd.add_argument("--no-customers", action="store_true", help="only seed the admin")
+    seed_cmd.add_argument("--create-schema", action="store_true", help="create missing tables first")
+    seed_cmd.set_defaults(run=seed)
+
+    rollups_cmd = commands.add_parser("rollups", help="rebuild daily account rollups from the ledger")
+    rollups_cmd.add_argument("--account", type=int, help="only this account")
+    rollups_cmd.set_defaults(run=rollups)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,84 @@ class Settings(BaseSettings):
     # DB
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./bank.db")
 
+    # Connection pool (QueuePool for file SQLite / Postgres)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # Postgres; 0 = off
+
+    # SQLite tuning profile, applied to every new connection
+    sqlite_tuning: bool = os.getenv("SQLITE_TUNING", "true").lower() in ("1", "true", "yes")
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+
+    # Read replica for GET endpoints (empty = read from the primary). Clients
+    # that wrote within the window keep reading from the primary.
+    database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+    read_your_writes_window: float = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
+    # Serve the accounts/transfers hot paths with async handlers on an
+    # AsyncEngine (aiosqlite / asyncpg) instead of the sync threadpool
+    db_async: bool = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+    # POST /transfers/batch
+    transfer_batch_max_items: int = int(os.getenv("TRANSFER_BATCH_MAX_ITEMS", "50000"))
+    transfer_batch_chunk_size: int = int(os.getenv("TRANSFER_BATCH_CHUNK_SIZE", "1000"))
+
+    # POST /transfers/tickets: queued transfers, group-committed (app.services.group_commit)
+    transfer_queue_size: int = int(os.getenv("TRANSFER_QUEUE_SIZE", "10000"))
+    transfer_group_size: int = int(os.getenv("TRANSFER_GROUP_SIZE", "500"))
+    transfer_group_wait_ms: float = float(os.getenv("TRANSFER_GROUP_WAIT_MS", "10"))
+    transfer_tickets_kept: int = int(os.getenv("TRANSFER_TICKETS_KEPT", "100000"))
+
+    # bcrypt hashing pool (app.core.hashing)
+    hash_pool_workers: int = int(os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+    hash_pool_queue_size: int = int(os.getenv("HASH_POOL_QUEUE_SIZE", "16"))
+    hash_pool_retry_after: int = int(os.getenv("HASH_POOL_RETRY_AFTER", "1"))
+    # POST /customers/bulk hashes on its own threads, one per core by default
+    bulk_hash_workers: int = int(os.getenv("BULK_HASH_WORKERS", str(os.cpu_count() or 1)))
+    customer_import_batch_size: int = int(os.getenv("CUSTOMER_IMPORT_BATCH_SIZE", "1000"))
+
+    # Adaptive admission control (app.core.admission); limits are the AIMD maxima
+    admission_control: bool = os.getenv("ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes")
+    admission_write_limit: int = int(os.getenv("ADMISSION_WRITE_LIMIT", "16"))
+    admission_write_target_ms: float = float(os.getenv("ADMISSION_WRITE_TARGET_MS", "250"))
+    admission_read_limit: int = int(os.getenv("ADMISSION_READ_LIMIT", "24"))
+    admission_read_target_ms: float = float(os.getenv("ADMISSION_READ_TARGET_MS", "100"))
+    admission_retry_after: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+    # In-process balance cache for GET /accounts/{id}/balance (0 disables)
+    balance_cache_size: int = int(os.getenv("BALANCE_CACHE_SIZE", "100000"))
+
+    # Seconds between background folds of striped account balances (0 disables)
+    stripe_fold_interval: float = float(os.getenv("STRIPE_FOLD_INTERVAL", "5"))
+
+    # Ledger: write a balance checkpoint every N entries per account
+    ledger_checkpoint_interval: int = int(os.getenv("LEDGER_CHECKPOINT_INTERVAL", "100"))
+
+    # Idempotency-Key support on money-movement endpoints (seconds)
+    idempotency_ttl: int = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+    idempotency_lease: float = float(os.getenv("IDEMPOTENCY_LEASE", "30"))
+    idempotency_wait_timeout: float = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "10"))
+    idempotency_sweep_interval: float = float(os.getenv("IDEMPOTENCY_SWEEP_INTERVAL", "300"))
+
+    # Prometheus /metrics endpoint and per-request instrumentation
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Opt-in SQL profiler: per-request query stats, slow-query log with EXPLAIN
+    sql_profiler: bool = os.getenv("SQL_PROFILER", "false").lower() in ("1", "true", "yes")
+    sql_slow_query_ms: float = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+    sql_n_plus_one_threshold: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+    # Production boot: no create_all / seeding on import and startup
+    # (schema via Alembic, seed data via `python -m app.cli seed`)
+    fast_start: bool = os.getenv("FAST_START", "false").lower() in ("1", "true", "yes")
+
     # CORS allowed
     cors_origins: list[str] = [
         origin.strip()
@@ -19,6 +97,15 @@ class Settings(BaseSettings):
     jwt_secret: str = os.getenv("JWT_SECRET", "change-me-in-prod")
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 disables
+
+    # Staff principals resolved by get_current_user (seconds; 0 disables)
+    principal_cache_ttl: float = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+    principal_cache_size: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+    # /reports/ results: served fresh for TTL seconds, then stale while a refresh runs (0 disables)
+    report_cache_ttl: float = float(os.getenv("REPORT_CACHE_TTL", "30"))
+    report_cache_stale: float = float(os.getenv("REPORT_CACHE_STALE", "300"))
 
     class Config:
            env_file = ".env"
@@ -0,0 +1,142 @@
+import threading
+import time
+
+from fastapi import Depends, HTTPException, status
+
+from app.config import settings
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for one class of requests.
+
+    At most ``limit`` requests run at once; the rest are refused at once
+    with 503 + Retry-After instead of queueing for a threadpool thread.
+    Every completion within ``target`` seconds while at least half the
+    limit is in use grows it by ``1 / limit`` (additive increase); a
+    completion slower than ``target``, or one that failed, multiplies it by
+    ``backoff``. Cuts happen at most once per ``target`` so a burst of slow
+    completions counts as one congestion signal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        target: float,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+        retry_after: int = 1,
+        enabled: bool = True,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.target = target
+        self.backoff = backoff
+        self.retry_after = retry_after
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self.rejected += 1
+                return False
+            self._in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        with self._lock:
+            in_use = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+            if failed or latency > self.target:
+                now = self._clock()
+                if now - self._last_decrease >= self.target:
+                    self._limit = max(self.min_limit, self._limit * self.backoff)
+                    self._last_decrease = now
+            elif in_use:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._limit = float(self.max_limit)
+            self._last_decrease = float("-inf")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+# The default maxima add up to AnyIO's 40 threadpool workers, so writes
+# alone can never take every thread from the reads.
+write_limiter = AdaptiveLimiter(
+    "write",
+    max_limit=settings.admission_write_limit,
+    target=settings.admission_write_target_ms / 1000,
+    retry_after=settings.admission_retry_after,
+    enabled=settings.admission_control,
+)
+read_limiter = AdaptiveLimiter(
+    "read",
+    max_limit=settings.admission_read_limit,
+    target=settings.admission_read_target_ms / 1000,
+    retry_after=settings.admission_retry_after,
+    enabled=settings.admission_control,
+)
+
+
+def admission(limiter: AdaptiveLimiter):
+    """Route dependency holding a ``limiter`` slot for the whole request.
+
+    It is async, so a refused request never reaches the threadpool, and
+    belongs in the decorator's ``dependencies`` so it runs before the
+    database session is opened.
+    """
+
+    async def admit():
+        if not limiter.enabled:
+            yield
+            return
+        if not limiter.try_acquire():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": str(limiter.retry_after)},
+            )
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except HTTPException as exc:
+            # 4xx are the client's doing, not a sign of overload
+            failed = exc.status_code >= 500
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            limiter.release(time.perf_counter() - started, failed)
+
+    return Depends(admit)
+
+
+AdmitWrite = admission(write_limiter)
+AdmitRead = admission(read_limiter)
@@ -0,0 +1,201 @@
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, NamedTuple, Optional, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+class CachedBalance(NamedTuple):
+    customer_id: int  # for the ownership check on reads
+    balance: Decimal
+
+
+# -------------------------------------------------
+# Storage backends
+# -------------------------------------------------
+class BalanceBackend(Protocol):
+    """Where cached balances live; swap in a shared store by implementing these."""
+
+    def get(self, account_id: int) -> Optional[CachedBalance]: ...
+    def set(self, account_id: int, value: CachedBalance) -> None: ...
+    def delete(self, account_id: int) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+
+
+class LRUBackend:
+    """In-process LRU; ``maxsize`` 0 stores nothing."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, CachedBalance]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, account_id: int) -> Optional[CachedBalance]:
+        with self._lock:
+            value = self._entries.get(account_id)
+            if value is not None:
+                self._entries.move_to_end(account_id)
+            return value
+
+    def set(self, account_id: int, value: CachedBalance) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[account_id] = value
+            self._entries.move_to_end(account_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, account_id: int) -> None:
+        with self._lock:
+            self._entries.pop(account_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# -------------------------------------------------
+# Coherence with writers
+# -------------------------------------------------
+class BalanceCache:
+    """Read-through, write-through cache of account balances.
+
+    Writers ``stage`` every balance they change inside their transaction.
+    Until that transaction ends the account is never served from the cache
+    (nor filled), so readers see the last committed balance from the
+    database. On commit the writer's RETURNING value is written through,
+    unless other writers overlapped it, in which case the entry is dropped.
+
+    Readers that miss take an ``epoch()`` before their SELECT; ``fill`` is
+    refused if a write to the account finished since then, so a slow reader
+    cannot put back a balance older than a commit it raced with.
+    """
+
+    # Remembered write epochs per account (older ones fold into a floor)
+    EPOCH_HISTORY = 100_000
+
+    def __init__(self, backend: BalanceBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._written: "OrderedDict[int, int]" = OrderedDict()  # account -> epoch of last finished write
+        self._floor = 0
+        self._writers: Dict[int, list] = {}  # account -> [open transactions, overlapped]
+        self.hits = 0
+        self.misses = 0
+
+    # ---- reads ----
+    def get(self, account_id: int) -> Optional[CachedBalance]:
+        with self._lock:
+            value = None if account_id in self._writers else self.backend.get(account_id)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def epoch(self) -> int:
+        with self._lock:
+            return self._epoch
+
+    def fill(self, account_id: int, epoch: int, value: CachedBalance) -> bool:
+        with self._lock:
+            if account_id in self._writers or self._written.get(account_id, self._floor) > epoch:
+                return False
+            self.backend.set(account_id, value)
+            return True
+
+    # ---- writes ----
+    def _finished(self, account_id: int) -> None:
+        self._epoch += 1
+        self._written[account_id] = self._epoch
+        self._written.move_to_end(account_id)
+        while len(self._written) > self.EPOCH_HISTORY:
+            _, epoch = self._written.popitem(last=False)
+            self._floor = max(self._floor, epoch)
+
+    def begin_write(self, account_id: int) -> None:
+        with self._lock:
+            writer = self._writers.get(account_id)
+            if writer is None:
+                self._writers[account_id] = [1, False]
+            else:
+                writer[0] += 1
+                writer[1] = True
+            self.backend.delete(account_id)
+
+    def end_write(self, account_id: int, value: Optional[CachedBalance]) -> None:
+        """``value`` is the committed balance, or None to just invalidate."""
+        with self._lock:
+            writer = self._writers[account_id]
+            writer[0] -= 1
+            if writer[0] == 0:
+                del self._writers[account_id]
+            self._finished(account_id)
+            if writer[0] == 0 and not writer[1] and value is not None:
+                self.backend.set(account_id, value)
+            else:
+                self.backend.delete(account_id)
+
+    def stage(self, session: Session, account_id: int, value: Optional[CachedBalance]) -> None:
+        """Record a balance change made in ``session``'s open transaction."""
+        writes = session.info.setdefault("balance_writes", {})
+        if account_id not in writes:
+            self.begin_write(account_id)
+        writes[account_id] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self.backend.clear()
+            self._floor = self._epoch = self._epoch + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+balance_cache = BalanceCache(LRUBackend(settings.balance_cache_size))
+
+
+# -------------------------------------------------
+# Transaction boundaries
+# -------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    if "balance_writes" in session.info:
+        session.info["balance_committed"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    # includes savepoints: staged values may no longer be what commits
+    if "balance_writes" in session.info:
+        session.info["balance_committed"] = False
+        session.info["balance_rolled_back"] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release(session, transaction):
+    if transaction.parent is not None or "balance_writes" not in session.info:
+        return
+    writes = session.info.pop("balance_writes")
+    committed = session.info.pop("balance_committed", False)
+    rolled_back = session.info.pop("balance_rolled_back", False)
+    write_through = committed and not rolled_back
+    for account_id, value in writes.items():
+        balance_cache.end_write(account_id, value if write_through else None)
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+# Upper bounds (seconds) of the hash latency histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class HashPool:
+    """Bounded executor for bcrypt password / PIN hashing.
+
+    bcrypt releases the GIL, so a small dedicated thread pool hashes in
+    parallel without borrowing threads from the request threadpool. At most
+    ``workers + queue_size`` hashes are admitted at once; beyond that callers
+    get an immediate 503 with Retry-After instead of piling up.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retry_after: int = 1):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    # ---------------- submit ---------------- #
+    def submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        with self._lock:
+            self._admitted += 1
+            self._submitted += 1
+
+        try:
+            future = self._executor.submit(self._timed, fn, *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def run(self, fn, *args):
+        """Hash on the pool and wait for the result (sync handlers)."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn, *args):
+        """Hash on the pool without blocking the event loop (async handlers)."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _timed(self, fn, *args):
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._latency_sum += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+                self._buckets[next(
+                    (i for i, le in enumerate(LATENCY_BUCKETS) if elapsed <= le),
+                    len(LATENCY_BUCKETS),
+                )] += 1
+
+    def _done(self, _future):
+        with self._lock:
+            self._admitted -= 1
+        self._slots.release()
+
+    # ---------------- metrics ---------------- #
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_size,
+                "running": self._running,
+                "queue_depth": self._admitted - self._running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "latency_avg_ms": round(self._latency_sum / self._completed * 1000, 2) if self._completed else 0.0,
+                "latency_max_ms": round(self._latency_max * 1000, 2),
+                "latency_buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], self._buckets)),
+            }
+
+
+hash_pool = HashPool(
+    workers=settings.hash_pool_workers,
+    queue_size=settings.hash_pool_queue_size,
+    retry_after=settings.hash_pool_retry_after,
+)
+
+
+# Bulk imports hash on threads of their own, so a large import never takes
+# the capacity (or the 503 budget) of interactive logins.
+bulk_hash_executor = ThreadPoolExecutor(max_workers=settings.bulk_hash_workers, thread_name_prefix="bulk-hash")
+
+
+def hash_many(fn, values) -> list:
+    """``[fn(v) for v in values]``, spread over every bulk hashing thread."""
+    return list(bulk_hash_executor.map(fn, values))
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+from fastapi import Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models.idempotency import IdempotencyKey
+
+log = logging.getLogger("app.idempotency")
+
+# Seconds between looks at a key another request is still working on
+POLL_INTERVAL = 0.05
+
+IdempotencyKeyHeader = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Retries with the same key return the first response instead of running again",
+)
+
+
+class Claim(Enum):
+    OWNED = "owned"  # this request runs the operation
+    DONE = "done"  # a stored response exists
+    BUSY = "busy"  # another request holds the key
+
+
+def owner_of(role: str, sub) -> str:
+    return f"{role}:{sub}"
+
+
+def request_fingerprint(method: str, path: str, **params) -> str:
+    raw = json.dumps([method, path, jsonable_encoder(params)], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _key(owner: str, key: str):
+    return (IdempotencyKey.owner == owner) & (IdempotencyKey.key == key)
+
+
+# -------------------------------------------------
+# Primitives (sync Session; async callers use run_sync)
+# -------------------------------------------------
+def claim(db: Session, owner: str, key: str, fingerprint: str):
+    """Take ownership of a key, or report who has it. Commits.
+
+    Returns ``(Claim, stored)`` where ``stored`` is the replayable
+    ``(status_code, body)`` for ``Claim.DONE``. A claim whose lease ran out
+    (its request died mid-way) is taken over.
+    """
+    now = datetime.now(timezone.utc)
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body,
+            (IdempotencyKey.expires_at <= now).label("expired"),
+            (IdempotencyKey.locked_until <= now).label("stale"),
+        ).where(_key(owner, key))
+    ).first()
+
+    lease = {"locked_until": now + timedelta(seconds=settings.idempotency_lease)}
+    try:
+        if row is None:
+            db.execute(insert(IdempotencyKey).values(
+                owner=owner,
+                key=key,
+                fingerprint=fingerprint,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_ttl),
+                **lease,
+            ))
+        elif row.expired:
+            db.execute(update(IdempotencyKey).where(_key(owner, key)).values(
+                fingerprint=fingerprint,
+                status_code=None,
+                response_body=None,
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_ttl),
+                **lease,
+            ))
+        elif row.fingerprint != fingerprint:
+            db.rollback()
+            raise HTTPException(422, "Idempotency-Key was already used for a different request")
+        elif row.status_code is not None:
+            db.rollback()
+            return Claim.DONE, (row.status_code, json.loads(row.response_body))
+        elif row.stale:
+            taken = db.execute(
+                update(IdempotencyKey)
+                .where(_key(owner, key), IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until <= now)
+                .values(**lease)
+            )
+            if taken.rowcount != 1:
+                db.rollback()
+                return Claim.BUSY, None
+        else:
+            db.rollback()
+            return Claim.BUSY, None
+        db.commit()
+    except IntegrityError:
+        # another request inserted the key first
+        db.rollback()
+        return Claim.BUSY, None
+    return Claim.OWNED, None
+
+
+def complete(db: Session, owner: str, key: str, status_code: int, body) -> None:
+    """Store the response inside the operation's own transaction."""
+    db.execute(
+        update(IdempotencyKey)
+        .where(_key(owner, key))
+        .values(status_code=status_code, response_body=json.dumps(body), locked_until=None)
+    )
+
+
+def release(db: Session, owner: str, key: str) -> None:
+    """Give a key back after its operation failed, so a retry runs it afresh."""
+    db.execute(delete(IdempotencyKey).where(_key(owner, key), IdempotencyKey.status_code.is_(None)))
+    db.commit()
+
+
+def replay(stored) -> JSONResponse:
+    status_code, body = stored
+    return JSONResponse(status_code=status_code, content=body, headers={"Idempotent-Replayed": "true"})
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="A request with this Idempotency-Key is still in progress",
+        headers={"Retry-After": "1"},
+    )
+
+
+# -------------------------------------------------
+# Drivers
+# -------------------------------------------------
+def run_idempotent(db: Session, key, owner: str, fingerprint: str, operation, status_code: int = 200):
+    """Run ``operation(db)`` at most once per (owner, key) and commit.
+
+    ``operation`` must not commit; it returns the JSON-able response body,
+    which is stored in the same transaction as its writes. Retries get that
+    body back from a single primary-key lookup; a retry that arrives while
+    the first request is still running waits for it. Failed operations
+    store nothing.
+    """
+    if key is None:
+        try:
+            body = operation(db)
+            db.commit()
+        except BaseException:
+            db.rollback()
+            raise
+        return body
+
+    deadline = time.monotonic() + settings.idempotency_wait_timeout
+    while True:
+        state, stored = claim(db, owner, key, fingerprint)
+        if state is Claim.DONE:
+            return replay(stored)
+        if state is Claim.OWNED:
+            break
+        if time.monotonic() > deadline:
+            raise _busy()
+        time.sleep(POLL_INTERVAL)
+
+    try:
+        body = jsonable_encoder(operation(db))
+        complete(db, owner, key, status_code, body)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        release(db, owner, key)
+        raise
+    return body
+
+
+async def run_idempotent_async(db, key, owner: str, fingerprint: str, operation, status_code: int = 200):
+    """``run_idempotent`` for an AsyncSession; waiting does not block the loop."""
+    if key is None:
+        try:
+            body = await db.run_sync(operation)
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            raise
+        return body
+
+    deadline = time.monotonic() + settings.idempotency_wait_timeout
+    while True:
+        state, stored = await db.run_sync(claim, owner, key, fingerprint)
+        if state is Claim.DONE:
+            return replay(stored)
+        if state is Claim.OWNED:
+            break
+        if time.monotonic() > deadline:
+            raise _busy()
+        await asyncio.sleep(POLL_INTERVAL)
+
+    try:
+        body = jsonable_encoder(await db.run_sync(operation))
+        await db.run_sync(complete, owner, key, status_code, body)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        await db.run_sync(release, owner, key)
+        raise
+    return body
+
+
+# -------------------------------------------------
+# TTL sweeper
+# -------------------------------------------------
+def sweep_expired(db: Session) -> int:
+    """Delete expired keys (range scan on ix_idempotency_keys_expires_at)."""
+    result = db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount
+
+
+async def sweep_forever(session_factory, interval: float) -> None:
+    def sweep_once():
+        with session_factory() as db:
+            return sweep_expired(db)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(sweep_once)
+        except Exception:  # keep sweeping after a transient DB error
+            log.exception("idempotency sweep failed")
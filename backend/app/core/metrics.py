@@ -0,0 +1,234 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+WAIT_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# -------------------------------------------------
+# Metric types
+# -------------------------------------------------
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name, self.help, self.label_names = name, help, labels
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, _labels(self.label_names, labels), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Labels = (), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.label_names = name, help, labels
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[slot] += 1
+            series[-1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), series[:-1]):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket", _labels(self.label_names, labels, le), cumulative
+            yield f"{self.name}_sum", _labels(self.label_names, labels), series[-1]
+            yield f"{self.name}_count", _labels(self.label_names, labels), cumulative
+
+
+class Registry:
+    """Metrics rendered in the Prometheus text exposition format (0.0.4)."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], list]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], list]):
+        """Register ``fn() -> [(name, kind, help, [(labels_dict, value)])]``,
+        read at scrape time (for stats that already live elsewhere)."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {_number(value)}" for name, labels, value in metric.samples())
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+ROUTE_LABELS = ("method", "tag", "route")
+
+requests_total = registry.register(Counter(
+    "http_requests_total", "Requests handled.", ROUTE_LABELS + ("status",),
+))
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time from request start to last response byte.", ROUTE_LABELS,
+))
+request_size = registry.register(Histogram(
+    "http_request_size_bytes", "Request body size (Content-Length).", ROUTE_LABELS, SIZE_BUCKETS,
+))
+response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size.", ROUTE_LABELS, SIZE_BUCKETS,
+))
+in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled.",
+))
+db_statements_total = registry.register(Counter(
+    "db_statements_total", "SQL statements executed while handling requests.", ROUTE_LABELS,
+))
+db_statements_per_request = registry.register(Histogram(
+    "db_statements_per_request", "SQL statements executed by one request.", ROUTE_LABELS, STATEMENT_BUCKETS,
+))
+pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",), WAIT_BUCKETS,
+))
+
+
+# -------------------------------------------------
+# Per-request SQL statement counting
+# -------------------------------------------------
+# A one-element list per request; sync handlers run on a copy of the
+# request's context, so they share the same list.
+_statements: ContextVar[Optional[list]] = ContextVar("request_statements", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def route_labels(scope) -> Labels:
+    route = scope.get("route")
+    if route is None:
+        return scope["method"], "", UNMATCHED_ROUTE
+    tags = getattr(route, "tags", None)
+    return scope["method"], str(tags[0]) if tags else "", route.path
+
+
+# -------------------------------------------------
+# Middleware
+# -------------------------------------------------
+class MetricsMiddleware:
+    """Pure ASGI middleware: no extra task or body buffering per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        counter = [0]
+        token = _statements.set(counter)
+        in_flight.inc()
+        status = [500]
+        sent = [0]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                sent[0] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            _statements.reset(token)
+
+            labels = route_labels(scope)
+            requests_total.inc(labels + (str(status[0]),))
+            request_duration.observe(elapsed, labels)
+            response_size.observe(sent[0], labels)
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    request_size.observe(int(value), labels)
+                    break
+            db_statements_total.inc(labels, counter[0])
+            db_statements_per_request.observe(counter[0], labels)
@@ -0,0 +1,45 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+# -------------------------------------------------
+# Query params shared by every paginated endpoint
+# -------------------------------------------------
+LimitParam = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size")
+CursorParam = Query(None, description="Opaque `next_cursor` from the previous page")
+
+
+# -------------------------------------------------
+# Opaque keyset cursors
+# -------------------------------------------------
+def encode_cursor(*values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode a cursor made by ``encode_cursor`` back into typed key values."""
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        )
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(400, "Invalid cursor")
+
+
+def paginate(rows, limit: int, key):
+    """Split ``limit + 1`` fetched rows into the page and the cursor for the next one."""
+    items = rows[:limit]
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return items, next_cursor
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.employee import Employee
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of an Employee: safe to share across sessions/threads."""
+    id: int
+    email: str
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_employee(cls, employee: Employee) -> "Principal":
+        return cls(
+            id=employee.id,
+            email=employee.email,
+            role=employee.role,
+            is_active=bool(employee.is_active),
+        )
+
+
+class PrincipalCache:
+    """TTL + LRU cache of staff principals keyed by the token ``sub`` (email)."""
+
+    def __init__(self, ttl: float, maxsize: int, clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.principal_cache_ttl,
+    maxsize=settings.principal_cache_size,
+)
+
+
+# -------------------------------------------------
+# Invalidation: any write to an Employee row
+# -------------------------------------------------
+def _employee_keys(target: Employee):
+    keys = {target.email}
+    keys.update(inspect(target).attrs.email.history.deleted or ())
+    return {k for k in keys if k}
+
+
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+def _invalidate_on_flush(mapper, connection, target):
+    session = Session.object_session(target)
+    keys = _employee_keys(target)
+    for key in keys:
+        principal_cache.invalidate(key)
+    # A request may re-read the old row before this commits; drop it again then
+    if session is not None:
+        session.info.setdefault("principal_keys", set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("principal_clear", False):
+        principal_cache.clear()
+    for key in session.info.pop("principal_keys", ()):
+        principal_cache.invalidate(key)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(state):
+    # update(Employee) / delete(Employee) statements bypass the mapper events
+    if (state.is_update or state.is_delete) and any(m.class_ is Employee for m in state.all_mappers):
+        principal_cache.clear()
+        state.session.info["principal_clear"] = True
@@ -0,0 +1,182 @@
+import contextlib
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.config import settings
+
+log = logging.getLogger("app.sql")
+
+# -------------------------------------------------
+# Statement fingerprints
+# -------------------------------------------------
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_REPEATED_LISTS = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise a statement so every execution of the same query shape
+    maps to one string: literals and bound parameters become ``?`` and
+    expanded ``IN (...)`` / multi-row ``VALUES`` lists collapse."""
+    text = _STRING.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _PARAM_LIST.sub("(?...)", text)
+    text = _REPEATED_LISTS.sub("(?...)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+@dataclass
+class QueryProfile:
+    statements: int = 0
+    db_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    queries: List[Tuple[str, float]] = field(default_factory=list)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        fp = fingerprint(statement)
+        self.statements += 1
+        self.db_time += elapsed
+        self.fingerprints[fp] += 1
+        self.queries.append((fp, elapsed))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run at least ``threshold`` times (likely N+1)."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.statements} statements, {self.db_time * 1000:.1f} ms in the database"]
+        lines += [f"  {n:>4} x {fp}" for fp, n in self.fingerprints.most_common()]
+        return "\n".join(lines)
+
+
+# -------------------------------------------------
+# Capture everything an engine runs (tests, benchmarks)
+# -------------------------------------------------
+@contextlib.contextmanager
+def capture(engine):
+    """Record every statement ``engine`` executes inside the block."""
+    profile = QueryProfile()
+    started = []
+
+    def start(conn, cursor, statement, parameters, context, executemany):
+        started.append(time.perf_counter())
+
+    def finish(conn, cursor, statement, parameters, context, executemany):
+        if started:
+            profile.record(statement, time.perf_counter() - started.pop())
+
+    event.listen(engine, "before_cursor_execute", start)
+    event.listen(engine, "after_cursor_execute", finish)
+    try:
+        yield profile
+    finally:
+        event.remove(engine, "after_cursor_execute", finish)
+        event.remove(engine, "before_cursor_execute", start)
+
+
+@contextlib.contextmanager
+def assert_max_queries(engine, limit: int):
+    """Fail if the block runs more than ``limit`` SQL statements."""
+    with capture(engine) as profile:
+        yield profile
+    assert profile.statements <= limit, (
+        f"expected at most {limit} SQL statements, ran {profile.report()}"
+    )
+
+
+# -------------------------------------------------
+# Per-request profiling (settings.sql_profiler)
+# -------------------------------------------------
+_request_profile: ContextVar[Optional[QueryProfile]] = ContextVar("request_profile", default=None)
+
+
+def _start(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+
+def _explain(conn, statement, parameters) -> str:
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    conn.info["profiler_explaining"] = True
+    try:
+        if dialect == "sqlite":
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+            return "\n".join(str(row[-1]) for row in rows)
+        # a failed EXPLAIN must not abort the caller's transaction
+        with conn.begin_nested():
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        return "\n".join(str(row[0]) for row in rows)
+    except Exception as exc:
+        return f"EXPLAIN failed: {exc!r}"
+    finally:
+        conn.info["profiler_explaining"] = False
+
+
+def _finish_request_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("profiler_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if conn.info.get("profiler_explaining"):
+        return
+    profile = _request_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.sql_slow_query_ms:
+        plan = ""
+        if not executemany and statement.lstrip()[:6].upper().startswith(EXPLAINABLE):
+            plan = "\n" + _explain(conn, statement, parameters)
+        log.warning("slow query (%.1f ms): %s%s", elapsed * 1000, statement, plan)
+
+
+def install_profiler(engine) -> None:
+    """Time every statement on ``engine`` and attribute it to the current request."""
+    if getattr(engine, "_profiler_installed", False):
+        return
+    event.listen(engine, "before_cursor_execute", _start)
+    event.listen(engine, "after_cursor_execute", _finish_request_statement)
+    engine._profiler_installed = True
+
+
+class SQLProfilerMiddleware:
+    """Collects a QueryProfile per request, reports it in ``Server-Timing``
+    and logs request-level N+1 patterns."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = QueryProfile()
+        token = _request_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={profile.db_time * 1000:.2f};desc="{profile.statements} queries"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_profile.reset(token)
+            route = scope.get("route")
+            path = route.path if route is not None else scope["path"]
+            for fp, n in profile.repeated(settings.sql_n_plus_one_threshold):
+                log.warning("possible N+1 in %s %s: ran %d times: %s", scope["method"], path, n, fp)
+            log.debug("%s %s: %s", scope["method"], path, profile.report())
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from app.config import settings
+from app.core.metrics import Counter, registry
+from app.core.token_cache import token_digest
+
+# Set on responses to writes; the value is the write's Unix time
+LAST_WRITE_COOKIE = "last_write"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+read_routing_total = registry.register(Counter(
+    "db_read_routing_total", "Read-only requests by the database that served them.", ("target",),
+))
+
+
+def _client_key(headers) -> Optional[bytes]:
+    for name, value in headers:
+        if name == b"authorization":
+            return token_digest(value.decode("latin-1"))
+    return None
+
+
+def _cookie(headers, name: str) -> Optional[str]:
+    for header, value in headers:
+        if header == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(name)
+            if morsel is not None:
+                return morsel.value
+    return None
+
+
+class ReadYourWrites:
+    """Remembers which clients wrote within the last ``window`` seconds.
+
+    Their reads go to the primary so they never see a replica that has not
+    caught up with their own write. Two markers are checked: the caller's
+    bearer token (kept in this process) and the ``last_write`` cookie set
+    on the write's response, which also works when the next request lands
+    on another worker.
+    """
+
+    def __init__(self, window: float, maxsize: int = 100_000, clock=time.time):
+        self.window = window
+        self.maxsize = maxsize
+        self._clock = clock
+        self._writes: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, headers) -> float:
+        now = self._clock()
+        key = _client_key(headers)
+        if key is not None:
+            with self._lock:
+                self._writes[key] = now
+                self._writes.move_to_end(key)
+                while len(self._writes) > self.maxsize:
+                    self._writes.popitem(last=False)
+        return now
+
+    def wrote_recently(self, headers) -> bool:
+        since = self._clock() - self.window
+        key = _client_key(headers)
+        if key is not None:
+            with self._lock:
+                written = self._writes.get(key)
+            if written is not None and written > since:
+                return True
+        cookie = _cookie(headers, LAST_WRITE_COOKIE)
+        try:
+            return cookie is not None and float(cookie) > since
+        except ValueError:
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+
+
+read_your_writes = ReadYourWrites(window=settings.read_your_writes_window)
+
+
+def use_replica(scope) -> bool:
+    """Whether a request may read from the replica (and count the decision)."""
+    replica = scope["method"] in SAFE_METHODS and not read_your_writes.wrote_recently(scope["headers"])
+    read_routing_total.inc(("replica" if replica else "primary",))
+    return replica
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients whose unsafe request succeeded as recent writers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                written = read_your_writes.mark(scope["headers"])
+                cookie = f"{LAST_WRITE_COOKIE}={written:.3f}; Max-Age={int(read_your_writes.window) + 1}; Path=/; HttpOnly"
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
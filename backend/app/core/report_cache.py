@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from app.config import settings
+
+log = logging.getLogger("app.reports")
+
+# Distinct report/parameter combinations kept
+REPORT_CACHE_SIZE = 256
+
+
+class ReportCache:
+    """Stale-while-revalidate cache of report results, keyed by report and parameters.
+
+    A result younger than ``ttl`` is served as is. An older one is still
+    served for up to ``ttl + stale`` seconds while a background thread
+    recomputes it (one refresh per key at a time), so a dashboard refresh
+    never waits on a table scan once the report is warm. Only a cold or
+    expired key makes the caller compute, and concurrent callers for that
+    key wait for the one computation instead of each running it.
+    """
+
+    def __init__(self, ttl: float, stale: float, maxsize: int, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale = stale
+        self.maxsize = maxsize
+        self._clock = clock
+        # key -> (computed at, value)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._computing: dict = {}  # key -> Lock held while computing it; dropped once computed
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], object]):
+        """The cached value for ``key``; ``compute`` (which must open its own
+        session) fills or refreshes it."""
+        if self.ttl <= 0:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = self._clock() - entry[0] if entry is not None else None
+            if age is not None and age < self.ttl + self.stale:
+                self._entries.move_to_end(key)
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry[1]
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, compute), daemon=True).start()
+                return entry[1]
+            self.misses += 1
+            computing = self._computing.setdefault(key, threading.Lock())
+
+        with computing:
+            # another caller may have filled it while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._clock() - entry[0] < self.ttl:
+                    return entry[1]
+            try:
+                value = compute()
+                self._put(key, value)
+            finally:
+                # waiters still holding this lock find the entry; later misses make a new one
+                with self._lock:
+                    if self._computing.get(key) is computing:
+                        del self._computing[key]
+            return value
+
+    def _refresh(self, key: Hashable, compute: Callable[[], object]) -> None:
+        try:
+            self._put(key, compute())
+        except Exception:  # keep serving the stale value; the next read retries
+            log.exception("report refresh failed")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+            }
+
+
+report_cache = ReportCache(
+    ttl=settings.report_cache_ttl,
+    stale=settings.report_cache_stale,
+    maxsize=REPORT_CACHE_SIZE,
+)
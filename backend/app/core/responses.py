@@ -0,0 +1,39 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # optional: several times faster than the stdlib encoder
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(value):
+    # Decimals keep their exact digits as strings, as pydantic serialises them
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for plain dicts / lists built from column rows.
+
+    Returning it from a route skips ``response_model`` validation and
+    ``jsonable_encoder``, so only use it for payloads that already have the
+    documented shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,7 +1,9 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
+import uuid
 import jwt
 from app.config import settings
+from app.core.token_cache import TokenCache, token_digest
 
 # ------------------------------
 # Hashing Context
@@ -33,11 +35,34 @@ def verify_pin(pin: str, hashed_pin: str):
 # ------------------------------
 def create_access_token(data: dict, expires_minutes=settings.access_token_expire_minutes):
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
-    data.update({"exp": expire})
+    # jti keeps tokens unique, so revoking one never hits a later login's token
+    data.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(data, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
-def decode_token(token: str):
+# Verified payloads, so repeat requests with the same token skip the HMAC check
+token_cache = TokenCache(maxsize=settings.token_cache_size)
+
+
+def _verify_token(token: str):
     try:
         return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
     except:
         return None
+
+def decode_token(token: str):
+    digest = token_digest(token)
+    if token_cache.is_revoked(digest):
+        return None
+
+    data = token_cache.get(digest)
+    if data is None:
+        data = _verify_token(token)
+        if data:
+            token_cache.put(digest, data)
+    return data
+
+def revoke_token(token: str):
+    """Reject this token from now until it expires (in this process)."""
+    data = _verify_token(token)
+    if data and "exp" in data:
+        token_cache.revoke(token_digest(token), data["exp"])
@@ -0,0 +1,104 @@
+import hashlib
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """Bounded LRU of verified JWT payloads, keyed by the token's SHA-256.
+
+    An entry lives until the earlier of LRU eviction and the token's own
+    ``exp``; expired entries are never returned and are purged as new ones
+    arrive. Revoked digests are remembered until their ``exp`` so a revoked
+    token can't be re-admitted by a later decode.
+    """
+
+    def __init__(self, maxsize: int, clock=time.time):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._expiry_heap: list = []
+        self._revoked: dict = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, digest: bytes, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not self.maxsize or not isinstance(exp, (int, float)):
+            return
+        now = self._clock()
+        with self._lock:
+            if exp <= now or digest in self._revoked:
+                return
+            self._purge_expired(now)
+            self._entries[digest] = (exp, dict(payload))
+            self._entries.move_to_end(digest)
+            heapq.heappush(self._expiry_heap, (exp, digest))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            if len(self._expiry_heap) > 4 * self.maxsize:
+                self._rebuild_heap()
+
+    def revoke(self, digest: bytes, exp: float) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+            self._revoked[digest] = exp
+            heapq.heappush(self._expiry_heap, (exp, digest))
+
+    def is_revoked(self, digest: bytes) -> bool:
+        exp = self._revoked.get(digest)
+        return exp is not None and exp > self._clock()
+
+    def _purge_expired(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            exp, digest = heapq.heappop(heap)
+            entry = self._entries.get(digest)
+            if entry is not None and entry[0] <= now:
+                del self._entries[digest]
+            if self._revoked.get(digest, now + 1) <= now:
+                del self._revoked[digest]
+
+    def _rebuild_heap(self) -> None:
+        # drop heap slots left behind by LRU evictions and re-puts
+        self._expiry_heap = [(exp, d) for d, (exp, _) in self._entries.items()]
+        self._expiry_heap += [(exp, d) for d, exp in self._revoked.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self._revoked.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "revoked": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
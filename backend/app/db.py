@@ -1,10 +1,159 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.core.metrics import pool_checkout_wait
+from app.core.profiler import install_profiler
+from app.core.replica import use_replica
 
 DATABASE_URL = settings.database_url
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+
+# ---------------------------------------
+# Engine profile (pool sizing, timeouts, SQLite pragmas)
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """create_engine / create_async_engine kwargs for a database URL."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    if backend == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if _is_memory_sqlite(url):
+            # single shared connection; pool sizing does not apply
+            return options
+    elif url.get_driver_name() == "asyncpg":
+        options = {"connect_args": {}}
+        if settings.db_statement_timeout_ms:
+            options["connect_args"]["server_settings"] = {
+                "statement_timeout": str(settings.db_statement_timeout_ms)
+            }
+    else:
+        options = {"connect_args": {}}
+        if settings.db_statement_timeout_ms and backend == "postgresql":
+            options["connect_args"]["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+    }
+
+
+def install_sqlite_tuning(sync_engine) -> None:
+    """Apply the tuned PRAGMA profile to every new SQLite connection."""
+    if sync_engine.dialect.name != "sqlite" or not settings.sqlite_tuning:
+        return
+    pragmas = sqlite_pragmas()
+    if _is_memory_sqlite(sync_engine.url):
+        pragmas.pop("journal_mode")  # WAL needs a file
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class _TimedGet:
+    # No pool event fires before a checkout blocks, so time the getter and
+    # hand the wait to the "checkout" listener on the connection record.
+    def _do_get(self):
+        started = time.perf_counter()
+        record = super()._do_get()
+        record.info["checkout_wait"] = time.perf_counter() - started
+        return record
+
+
+class TimedQueuePool(_TimedGet, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGet, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolStats:
+    """Live checkout counters for an engine's connection pool."""
+
+    def __init__(self, sync_engine, name: str = "sync"):
+        self.engine = sync_engine
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        event.listen(sync_engine, "connect", self._on("connects"))
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on("checkins"))
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+        wait = connection_record.info.pop("checkout_wait", None)
+        if wait is not None:
+            pool_checkout_wait.observe(wait, (self.name,))
+
+    def _on(self, counter):
+        def bump(*_):
+            with self._lock:
+                setattr(self, counter, getattr(self, counter) + 1)
+        return bump
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        stats = {
+            "pool": type(pool).__name__,
+            "connects_total": self.connects,
+            "checkouts_total": self.checkouts,
+            "checkins_total": self.checkins,
+        }
+        # QueuePool-style pools expose live sizing
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+        return stats
+
+
+def create_app_engine(url: str):
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = TimedQueuePool
+    engine = create_engine(url, **options)
+    install_sqlite_tuning(engine)
+    if settings.sql_profiler:
+        install_profiler(engine)
+    return engine
+
+
+engine = create_app_engine(DATABASE_URL)
+pool_stats = PoolStats(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -17,3 +166,107 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------
+# Read replica (settings.database_read_url)
+
+read_engine = create_app_engine(settings.database_read_url) if settings.database_read_url else None
+read_pool_stats = PoolStats(read_engine, "read") if read_engine is not None else None
+# info["replica"] keeps replica reads out of the primary-only caches
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"replica": True})
+    if read_engine is not None
+    else None
+)
+
+
+def get_read_db(request: Request, primary=Depends(get_db)):
+    """Session for read-only handlers: the replica when one is configured,
+    unless the caller wrote recently (read-your-writes), else the primary.
+
+    ``primary`` is only connected if it is used."""
+    if ReadSessionLocal is None or not use_replica(request.scope):
+        yield primary
+        return
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_sessions():
+    """Session factory for reads that may outlive the request (a report
+    refreshed in the background): the replica's when one is configured."""
+    return ReadSessionLocal or SessionLocal
+
+
+# ---------------------------------------
+# Async engine (settings.db_async)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync DATABASE_URL for its asyncio counterpart."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{scheme}' URLs")
+    return f"{ASYNC_DRIVERS[backend]}{sep}{rest}"
+
+
+def create_app_async_engine(url: str):
+    async_url = to_async_url(url)
+    options = engine_options(async_url)
+    if "pool_size" in options:
+        options["poolclass"] = TimedAsyncAdaptedQueuePool
+    async_engine = create_async_engine(async_url, **options)
+    install_sqlite_tuning(async_engine.sync_engine)
+    if settings.sql_profiler:
+        install_profiler(async_engine.sync_engine)
+    return async_engine
+
+
+# Only built when async mode is on, so the sync deployment does not need
+# aiosqlite / asyncpg installed.
+async_engine = create_app_async_engine(DATABASE_URL) if settings.db_async else None
+async_pool_stats = PoolStats(async_engine.sync_engine, "async") if async_engine is not None else None
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled; set DB_ASYNC=1")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async_read_engine = (
+    create_app_async_engine(settings.database_read_url)
+    if settings.db_async and settings.database_read_url
+    else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False, info={"replica": True})
+    if async_read_engine is not None
+    else None
+)
+
+
+async def get_async_read_db(request: Request, primary=Depends(get_async_db)):
+    """``get_read_db`` for the async handlers."""
+    if AsyncReadSessionLocal is None or not use_replica(request.scope):
+        yield primary
+        return
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,14 +1,25 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 from fastapi.openapi.utils import get_openapi
 
-from app.db import Base, engine, SessionLocal
-from app.models.employee import Employee
-from app.core.security import hash_password
-from app.models.customer import Customer
-from app.routers import auth, customers, accounts, transfers, customer_auth
+from app.db import Base, engine, SessionLocal, async_engine, async_pool_stats, async_read_engine, pool_stats, read_pool_stats
+from app.routers import auth, customers, customer_auth, reports
 from app.config import settings
+from app.core.idempotency import sweep_forever
+from app.core.admission import read_limiter, write_limiter
+from app.core.hashing import hash_pool
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiler import SQLProfilerMiddleware
+from app.core.replica import ReadYourWritesMiddleware
+from app.core.principal_cache import principal_cache
+from app.core.balance_cache import balance_cache
+from app.core.report_cache import report_cache
+from app.core.security import token_cache
+from app.services.seed import seed_admin_employee, seed_initial_customers
+from app.services.stripes import fold_forever
+from app.services.group_commit import transfer_pipeline
 
 # ---------------------------------------
 
@@ -44,49 +55,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.sql_profiler:
+    app.add_middleware(SQLProfilerMiddleware)
 
-# ---------------------------------------
-# DB
-Base.metadata.create_all(bind=engine)
+if settings.database_read_url:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Outermost, so timings include CORS handling
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 
 # ---------------------------------------
-# Seed admin + sample customers
+# DB schema + seed admin / sample customers
+# FAST_START leaves both to `alembic upgrade head` and `python -m app.cli seed`
 
-@app.on_event("startup")
-def seed_admin_employee():
-    db: Session = SessionLocal()
-    try:
-        if db.query(Employee).count() == 0:
-            admin = Employee(
-                email="admin@bank.com",
-                hashed_password=hash_password("Admin123!"),
-                role="admin",
-                is_active=True
-            )
-            db.add(admin)
-            db.commit()
-            print("\n✔ Admin User Created Automatically\n")
-    finally:
-        db.close()
+if not settings.fast_start:
+    Base.metadata.create_all(bind=engine)
+
+    @app.on_event("startup")
+    def seed_demo_data():
+        with SessionLocal() as db:
+            if seed_admin_employee(db):
+                print("\n✔ Admin User Created Automatically\n")
+            if seed_initial_customers(db):
+                print("✔ Sample customers added.\n")
 
 
 @app.on_event("startup")
-def seed_initial_customers():
-    db: Session = SessionLocal()
-    try:
-        if db.query(Customer).count() == 0:
-            for c in [
-                {"id": 1, "name": "Arisha Barron"},
-                {"id": 2, "name": "Branden Gibson"},
-                {"id": 3, "name": "Rhonda Church"},
-                {"id": 4, "name": "Georgina Hazel"},
-            ]:
-                db.add(Customer(**c))
-            db.commit()
-            print("✔ Sample customers added.\n")
-    finally:
-        db.close()
+async def start_idempotency_sweeper():
+    app.state.idempotency_sweeper = asyncio.create_task(
+        sweep_forever(SessionLocal, settings.idempotency_sweep_interval)
+    )
+
+
+@app.on_event("shutdown")
+async def stop_idempotency_sweeper():
+    sweeper = getattr(app.state, "idempotency_sweeper", None)
+    if sweeper is not None:
+        sweeper.cancel()
+
+
+if settings.stripe_fold_interval > 0:
+    @app.on_event("startup")
+    async def start_stripe_folder():
+        app.state.stripe_folder = asyncio.create_task(
+            fold_forever(SessionLocal, settings.stripe_fold_interval)
+        )
+
+    @app.on_event("shutdown")
+    async def stop_stripe_folder():
+        app.state.stripe_folder.cancel()
+
+
+@app.on_event("shutdown")
+def drain_transfer_queue():
+    # transfers already answered with 202 are committed before exit
+    transfer_pipeline.stop()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    # aiosqlite keeps a worker thread per pooled connection
+    for pooled in (async_engine, async_read_engine):
+        if pooled is not None:
+            await pooled.dispose()
 
 
 # ---------------------------------------
@@ -94,8 +127,18 @@ def seed_initial_customers():
 app.include_router(auth.router)
 app.include_router(customer_auth.router)
 app.include_router(customers.router)
-app.include_router(accounts.router)
-app.include_router(transfers.router)
+app.include_router(reports.router)
+# only the handler set in use is imported
+if settings.db_async:
+    from app.routers import async_accounts, async_transfers
+
+    app.include_router(async_accounts.router)
+    app.include_router(async_transfers.router)
+else:
+    from app.routers import accounts, transfers
+
+    app.include_router(accounts.router)
+    app.include_router(transfers.router)
 
 
 # ---------------------------------------
@@ -105,10 +148,64 @@ def root():
     return {"status": "running", "message": "Banking API live"}
 
 
+@app.get("/health/db")
+def db_health():
+    """Live connection pool checkout statistics."""
+    stats = {"sync": pool_stats.snapshot()}
+    for extra in (async_pool_stats, read_pool_stats):
+        if extra is not None:
+            stats[extra.name] = extra.snapshot()
+    return stats
+
+
+# ---------------------------------------
+# Metrics
+
+@registry.collector
+def runtime_metrics():
+    pools = [p for p in (pool_stats, async_pool_stats, read_pool_stats) if p is not None]
+    snapshots = [({"engine": p.name}, p.snapshot()) for p in pools]
+    hashing = hash_pool.stats()
+    balances = balance_cache.stats()
+    report_results = report_cache.stats()
+    admission = [({"class": lim.name}, lim.stats()) for lim in (write_limiter, read_limiter)]
+
+    def per_pool(key):
+        return [(labels, snap[key]) for labels, snap in snapshots if key in snap]
+
+    return [
+        ("db_pool_checkouts_total", "counter", "Connections checked out of the pool.", per_pool("checkouts_total")),
+        ("db_pool_connects_total", "counter", "New DBAPI connections opened.", per_pool("connects_total")),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out.", per_pool("checkedout")),
+        ("db_pool_size", "gauge", "Configured persistent pool size.", per_pool("size")),
+        ("db_pool_overflow", "gauge", "Connections open beyond pool_size.", per_pool("overflow")),
+        ("hash_pool_queue_depth", "gauge", "bcrypt hashes waiting for a worker.", [({}, hashing["queue_depth"])]),
+        ("hash_pool_rejected_total", "counter", "Hashes refused with 503.", [({}, hashing["rejected"])]),
+        ("admission_limit", "gauge", "Current adaptive concurrency limit.", [(c, a["limit"]) for c, a in admission]),
+        ("admission_in_flight", "gauge", "Requests holding an admission slot.", [(c, a["in_flight"]) for c, a in admission]),
+        ("admission_rejected_total", "counter", "Requests shed with 503.", [(c, a["rejected"]) for c, a in admission]),
+        ("transfer_queue_depth", "gauge", "Queued transfers waiting for a group commit.", [({}, transfer_pipeline.depth())]),
+        ("token_cache_hits_total", "counter", "JWT verifications served from cache.", [({}, token_cache.hits)]),
+        ("principal_cache_hits_total", "counter", "Staff lookups served from cache.", [({}, principal_cache.hits)]),
+        ("balance_cache_hits_total", "counter", "Balance reads served from cache.", [({}, balances["hits"])]),
+        ("balance_cache_misses_total", "counter", "Balance reads that went to the database.", [({}, balances["misses"])]),
+        ("balance_cache_hit_ratio", "gauge", "Share of balance reads served from cache.", [({}, balances["hit_rate"])]),
+        ("balance_cache_entries", "gauge", "Balances held in the cache.", [({}, balances["size"])]),
+        ("report_cache_hits_total", "counter", "Report requests served from cache.", [({"state": "fresh"}, report_results["hits"]), ({"state": "stale"}, report_results["stale_hits"])]),
+        ("report_cache_misses_total", "counter", "Report requests that computed the report.", [({}, report_results["misses"])]),
+    ]
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ---------------------------------------
 # Custom OpenAPI to show 🔒 lock only for protected routes
 
-protected_tags = ["💳 Accounts", "🔁 Transfers", "👨‍💼 Customer Management"]
+protected_tags = ["💳 Accounts", "🔁 Transfers", "👨‍💼 Customer Management", "📈 Reports"]
  # must match router tags exactly
 
 def custom_openapi():
@@ -1,4 +1,6 @@
 from .customer import Customer
-from .account import Account
+from .account import Account, AccountStripe
 from .transfer import Transfer
 from .employee import Employee
+from .ledger import LedgerEntry, BalanceCheckpoint, DailyAccountRollup
+from .idempotency import IdempotencyKey
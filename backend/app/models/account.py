@@ -5,9 +5,29 @@ from app.db import Base
 
 class Account(Base):
     __tablename__ = "accounts"
+    # SQLite would otherwise hand a deleted account's id to the next new one,
+    # which would inherit the ledger entries the deleted account leaves behind
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False, index=True)
+    # For a striped account, the balance is this plus its AccountStripe rows
     balance = Column(Numeric(12, 2), nullable=False, default=0)
+    # Ledger entries posted so far; drives balance checkpoints
+    ledger_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # > 0: transfer credits go to this many stripe rows (app.services.stripes)
+    stripe_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     customer = relationship("Customer", backref="accounts")
+
+
+class AccountStripe(Base):
+    """One slice of a striped account's incoming credits, folded back into
+    ``accounts.balance`` periodically."""
+    __tablename__ = "account_stripes"
+
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    stripe = Column(Integer, primary_key=True)
+    balance = Column(Numeric(12, 2), nullable=False, default=0)
+    # Ledger entries credited here since the last fold
+    ledger_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime, timezone
+from app.db import Base
+
+
+class IdempotencyKey(Base):
+    """A client's Idempotency-Key and the response it produced."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # TTL sweeper range scan
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    owner = Column(String(128), primary_key=True)  # "<role>:<sub>" of the caller
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # method + path + parameters
+    status_code = Column(Integer, nullable=True)  # NULL while the first request runs
+    response_body = Column(Text, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Date, Integer, Numeric, String, ForeignKey, DateTime, Index
+from datetime import datetime, timezone
+from app.db import Base
+
+
+class LedgerEntry(Base):
+    """One posted balance change. Rows are only ever appended; ``id`` is the
+    ledger sequence number. Entries outlive a deleted account, so
+    ``account_id`` is not a foreign key."""
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        # Point-in-time replay: one account, a (created_at, id) window
+        Index("ix_ledger_entries_account_time", "account_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    account_id = Column(Integer, nullable=False)
+    amount = Column(Numeric(12, 2), nullable=False)  # signed: credits > 0, debits < 0
+    kind = Column(String(16), nullable=False)
+    transfer_id = Column(Integer, ForeignKey("transfers.id"), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class BalanceCheckpoint(Base):
+    """An account's balance right after ledger entry ``seq``."""
+    __tablename__ = "balance_checkpoints"
+    __table_args__ = (
+        Index("ix_balance_checkpoints_account_time", "account_id", "created_at"),
+    )
+
+    account_id = Column(Integer, primary_key=True)  # kept with the ledger, like LedgerEntry.account_id
+    seq = Column(Integer, ForeignKey("ledger_entries.id", ondelete="CASCADE"), primary_key=True)
+    balance = Column(Numeric(12, 2), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class DailyAccountRollup(Base):
+    """Per-account totals of the ledger entries posted on one UTC day.
+
+    Kept current in the transaction that appends the entries. Credits to a
+    striped account spread over several ``slot`` rows per day, so readers
+    sum over the slots.
+    """
+    __tablename__ = "daily_account_rollups"
+
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    slot = Column(Integer, primary_key=True, default=0)
+    money_in = Column(Numeric(16, 2), nullable=False, default=0)
+    money_out = Column(Numeric(16, 2), nullable=False, default=0)  # positive
+    transfers_in = Column(Integer, nullable=False, default=0)
+    transfers_out = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.db import Base
@@ -6,6 +6,27 @@ from app.db import Base
 
 class Transfer(Base):
     __tablename__ = "transfers"
+    __table_args__ = (
+        # Per-account history: equality on the account, then (created_at, id)
+        # in keyset order. On Postgres the remaining columns ride along so the
+        # history query is answered from the index alone.
+        Index(
+            "ix_transfers_from_account_history",
+            "from_account_id", "created_at", "id",
+            postgresql_include=["to_account_id", "amount"],
+        ),
+        Index(
+            "ix_transfers_to_account_history",
+            "to_account_id", "created_at", "id",
+            postgresql_include=["from_account_id", "amount"],
+        ),
+        # Bank-wide time ranges: the volume reports and the GET /transfers/ keyset
+        Index(
+            "ix_transfers_created_at",
+            "created_at", "id",
+            postgresql_include=["from_account_id", "to_account_id", "amount"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
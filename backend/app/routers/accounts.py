@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.orm import Session, aliased
+from typing import List, Literal, Optional
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
 
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.schemas.account import (
     AccountCreate,
     Account,
     BalanceResponse,
     AccountUpdate,
+    StripeConfig,
+    AccountSummary,
 )
 from app.models.account import Account as AccountModel
 from app.models.customer import Customer as CustomerModel
@@ -19,8 +23,20 @@ from app.routers.auth import get_current_user
 from app.config import settings
 from app.core.permissions import require_role, require_owner_or_staff
 from app.schemas.account import AccountOut
+from app.schemas.pagination import Page
 from app.core.token_utils import get_token_payload
 from app.core.security import decode_token
+from app.core.pagination import CursorParam, LimitParam, decode_cursor, paginate
+from app.core.admission import AdmitRead, AdmitWrite
+from app.core.responses import FastJSONResponse
+from app.core.balance_cache import CachedBalance, balance_cache
+from app.services.ledger import as_utc, balance_as_of, post
+from app.services.transfer_engine import lock_accounts
+from app.services.stripes import fold, set_stripes, total_balance
+from app.services.statements import MEDIA_TYPES, stream_statement
+from app.services.rollups import day_range, summarize
+from app.core.idempotency import IdempotencyKeyHeader, owner_of, request_fingerprint, run_idempotent
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/token")
@@ -29,6 +45,120 @@ router = APIRouter(
     tags=["💳 Accounts"],
 )
 
+
+# ---------------- Helpers (shared with async_accounts) ---------------- #
+def accounts_page_stmt(customer_id: Optional[int], cursor: Optional[str], limit: int):
+    # Only the AccountOut columns, as plain rows (no ORM identity map)
+    stmt = select(AccountModel.id, total_balance()).order_by(AccountModel.id).limit(limit + 1)
+    if customer_id is not None:
+        stmt = stmt.where(AccountModel.customer_id == customer_id)
+    if cursor:
+        (after_id,) = decode_cursor(cursor, int)
+        stmt = stmt.where(AccountModel.id > after_id)
+    return stmt
+
+
+def account_transfers_stmt(account_id: int, cursor: Optional[str], limit: int):
+    """Newest-first history page for one account.
+
+    Written as UNION ALL of the outgoing and incoming sides so each side is a
+    single range scan on its (account, created_at, id) index; both sides are
+    already in keyset order, so the outer ORDER BY only merges 2 * limit rows.
+    """
+    after = decode_cursor(cursor, datetime, int) if cursor else None
+
+    def side(account_column):
+        stmt = select(TransferModel).where(account_column == account_id)
+        if after:
+            stmt = stmt.where(tuple_(TransferModel.created_at, TransferModel.id) < after)
+        return (
+            stmt.order_by(TransferModel.created_at.desc(), TransferModel.id.desc())
+            .limit(limit + 1)
+            .subquery()
+        )
+
+    outgoing = side(TransferModel.from_account_id)
+    incoming = side(TransferModel.to_account_id)
+    history = aliased(TransferModel, union_all(select(outgoing), select(incoming)).subquery())
+
+    return (
+        select(history.id, history.from_account_id, history.to_account_id, history.amount, history.created_at)
+        .order_by(history.created_at.desc(), history.id.desc())
+        .limit(limit + 1)
+    )
+
+
+def accounts_page(rows, limit: int) -> FastJSONResponse:
+    items, next_cursor = paginate(rows, limit, lambda a: (a.id,))
+    return FastJSONResponse({
+        "items": [{"id": id, "balance": balance} for id, balance in items],
+        "next_cursor": next_cursor,
+    })
+
+
+def transfer_history_page(rows, account_id: int, limit: int) -> FastJSONResponse:
+    items, next_cursor = paginate(rows, limit, lambda t: (t.created_at, t.id))
+    return FastJSONResponse({
+        "items": [
+            {
+                "id": id,
+                "from_account_id": from_id,
+                "to_account_id": to_id,
+                "amount": float(amount),
+                "direction": "outgoing" if from_id == account_id else "incoming",
+                "created_at": created_at,
+            }
+            for id, from_id, to_id, amount, created_at in items
+        ],
+        "next_cursor": next_cursor,
+    })
+
+
+def fetch_balance(db: Session, account_id: int) -> Optional[CachedBalance]:
+    """Owner and balance from the database, cached unless read from a replica."""
+    epoch = balance_cache.epoch()
+    row = db.execute(
+        select(AccountModel.customer_id, total_balance()).where(AccountModel.id == account_id)
+    ).first()
+    if row is None:
+        return None
+    account = CachedBalance(row.customer_id, row.balance)
+    if not db.info.get("replica"):
+        balance_cache.fill(account_id, epoch, account)
+    return account
+
+
+def apply_deposit(db: Session, account_id: int, amount: Decimal) -> dict:
+    acc = db.get(AccountModel, account_id)
+    if not acc:
+        raise HTTPException(404, "Account not found")
+    if acc.stripe_count:
+        fold(db, acc.id)
+
+    balance = post(db, acc.id, amount, "deposit")
+    return {"balance": float(balance)}
+
+
+def apply_withdrawal(db: Session, account_id: int, amount: Decimal) -> dict:
+    acc = db.get(AccountModel, account_id)
+    if not acc:
+        raise HTTPException(404, "Account not found")
+
+    if amount <= 0:
+        raise HTTPException(400, "Amount must be positive")
+    if acc.stripe_count:
+        fold(db, acc.id)
+
+    balance = post(db, acc.id, -amount, "withdrawal", guard=True)
+    if balance is None:
+        raise HTTPException(400, "Insufficient funds")
+
+    return {
+        "account_id": account_id,
+        "new_balance": float(balance),
+    }
+
+
 # ---------------- CREATE ACCOUNT ---------------- #
 @router.post("/",summary="Create Account (👨‍💼Staff only)", response_model=Account, status_code=201)
 def create_account(
@@ -55,10 +185,12 @@ def create_account(
 
 
 # ---------------- TRANSFER HISTORY ---------------- #
-@router.get("/{account_id}/transfers", summary="👁️ View transfers by account (👨‍💼 Staff / 👤 Customer)")
+@router.get("/{account_id}/transfers", summary="👁️ View transfers by account (👨‍💼 Staff / 👤 Customer)", dependencies=[AdmitRead])
 def account_transfers(
     account_id: int,
-    db: Session = Depends(get_db),
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: Session = Depends(get_read_db),
     token: str = Depends(oauth2),
 ):
     data = decode_token(token)
@@ -83,28 +215,108 @@ def account_transfers(
     else:
         raise HTTPException(403, "Not allowed")
 
-    transfers = (
-        db.query(TransferModel)
-        .filter(
-            (TransferModel.from_account_id == account_id) |
-            (TransferModel.to_account_id == account_id)
-        )
-        .order_by(TransferModel.created_at.desc())
-        .all()
-    )
+    rows = db.execute(account_transfers_stmt(account_id, cursor, limit)).all()
 
     # ✅ THIS solves your requirement
-    return [
-        {
-            "id": t.id,
-            "from_account_id": t.from_account_id,
-            "to_account_id": t.to_account_id,
-            "amount": float(t.amount),
-            "direction": "outgoing" if t.from_account_id == account_id else "incoming",
-            "created_at": t.created_at.isoformat(),
-        }
-        for t in transfers
-    ]
+    return transfer_history_page(rows, account_id, limit)
+
+
+# ---------------- STATEMENT ---------------- #
+@router.get(
+    "/{account_id}/statement",
+    summary="🧾 Account statement with running balance (👨‍💼 Staff / 👤 Customer)",
+    response_class=StreamingResponse,
+)
+def account_statement(
+    account_id: int,
+    from_: Optional[datetime] = Query(None, alias="from", description="Exclusive start (opening balance is as of this instant)"),
+    to: Optional[datetime] = Query(None, description="Inclusive end"),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid token")
+
+    acc = db.query(AccountModel).filter_by(id=account_id).first()
+    if not acc:
+        raise HTTPException(404, "Account not found")
+
+    role = data["role"]
+
+    # STAFF → full access
+    if role in ("admin", "employee"):
+        pass
+
+    # CUSTOMER → only own account
+    elif role == "customer":
+        if acc.customer_id != int(data["sub"]):
+            raise HTTPException(403, "Access denied")
+
+    else:
+        raise HTTPException(403, "Not allowed")
+
+    if from_ is not None and to is not None and as_utc(to) < as_utc(from_):
+        raise HTTPException(422, "'to' must not be before 'from'")
+
+    opening = balance_as_of(db, account_id, from_) if from_ is not None else Decimal(0)
+    headers = {"X-Opening-Balance": f"{opening:.2f}"}
+    if format == "csv":
+        headers["Content-Disposition"] = f'attachment; filename="statement-{account_id}.csv"'
+
+    return StreamingResponse(
+        stream_statement(db, account_id, opening, from_, to, format),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+# ---------------- SUMMARY ---------------- #
+@router.get(
+    "/{account_id}/summary",
+    summary="📊 Money in / out per day or month (👨‍💼 Staff / 👤 Customer)",
+    response_model=AccountSummary,
+    dependencies=[AdmitRead],
+)
+def account_summary(
+    account_id: int,
+    from_: Optional[date] = Query(None, alias="from", description="First day (UTC); default 29 days before 'to'"),
+    to: Optional[date] = Query(None, description="Last day (UTC), inclusive; default today"),
+    granularity: Literal["day", "month"] = Query("day"),
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid token")
+
+    acc = db.query(AccountModel).filter_by(id=account_id).first()
+    if not acc:
+        raise HTTPException(404, "Account not found")
+
+    role = data["role"]
+
+    # STAFF → full access
+    if role in ("admin", "employee"):
+        pass
+
+    # CUSTOMER → only own account
+    elif role == "customer":
+        if acc.customer_id != int(data["sub"]):
+            raise HTTPException(403, "Access denied")
+
+    else:
+        raise HTTPException(403, "Not allowed")
+
+    from_, to = day_range(from_, to)
+    return {
+        "account_id": account_id,
+        "granularity": granularity,
+        "from": from_,
+        "to": to,
+        "periods": summarize(db, account_id, from_, to, granularity),
+    }
 
 
 # ---------------- UPDATE ACCOUNT ---------------- #
@@ -123,7 +335,11 @@ def update_account(
         require_owner_or_staff(user, acc.customer_id)
 
     if payload.balance is not None:
-        acc.balance = payload.balance
+        # Locked re-read so the adjustment entry is the exact difference
+        acc = lock_accounts(db, [account_id])[account_id]
+        balance = fold(db, acc.id)[0] if acc.stripe_count else acc.balance
+        if payload.balance != balance:
+            post(db, acc.id, payload.balance - balance, "adjustment")
 
     db.commit()
     db.refresh(acc)
@@ -150,26 +366,44 @@ def delete_account(
     return None
 
 
+# ---------------- STRIPING ---------------- #
+@router.put("/{account_id}/stripes", summary="🔀 Stripe a hot account's credits (👨‍💼 Staff only)")
+def configure_stripes(
+    account_id: int,
+    payload: StripeConfig,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    if settings.env == "prod":
+        require_role(user, "admin", "employee")
+
+    position = set_stripes(db, account_id, payload.stripes)
+    if position is None:
+        raise HTTPException(404, "Account not found")
+    db.commit()
+
+    return {"account_id": account_id, "stripes": payload.stripes, "balance": float(position[0])}
+
+
 # ---------------- DEPOSIT ---------------- #
-@router.post("/{account_id}/deposit", summary="💰 Deposit in Account (👨‍💼 Staff only)")
+@router.post("/{account_id}/deposit", summary="💰 Deposit in Account (👨‍💼 Staff only)", dependencies=[AdmitWrite])
 def deposit(
     account_id: int,
     amount: Decimal,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     if settings.env == "prod" and user.role not in ("admin", "employee"):
         raise HTTPException(403, "Staff only")
 
-    acc = db.query(AccountModel).filter_by(id=account_id).first()
-    if not acc:
-        raise HTTPException(404, "Account not found")
-
-    acc.balance += amount
-    db.commit()
-    db.refresh(acc)
-
-    return {"balance": float(acc.balance)}
+    return run_idempotent(
+        db,
+        idempotency_key,
+        owner_of(user.role, user.email),
+        request_fingerprint("POST", f"/accounts/{account_id}/deposit", amount=amount),
+        lambda db: apply_deposit(db, account_id, amount),
+    )
 
 
 # ---------------- WITHDRAW ---------------- #
@@ -177,43 +411,38 @@ def deposit(
     "/{account_id}/withdraw",
     status_code=status.HTTP_200_OK,
     summary="💸 Withdraw money (👨‍💼Staff only)",
+    dependencies=[AdmitWrite],
 )
 def withdraw(
     account_id: int,
     amount: Decimal,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     if settings.env == "prod" and user.role not in ("admin", "employee"):
         raise HTTPException(403, "Staff only")
 
-    acc = db.query(AccountModel).filter_by(id=account_id).first()
-    if not acc:
-        raise HTTPException(404, "Account not found")
-
-    if amount <= 0:
-        raise HTTPException(400, "Amount must be positive")
-
-    if acc.balance < amount:
-        raise HTTPException(400, "Insufficient funds")
-
-    acc.balance -= amount
-    db.commit()
-    db.refresh(acc)
-
-    return {
-        "account_id": acc.id,
-        "new_balance": float(acc.balance),
-    }
+    return run_idempotent(
+        db,
+        idempotency_key,
+        owner_of(user.role, user.email),
+        request_fingerprint("POST", f"/accounts/{account_id}/withdraw", amount=amount),
+        lambda db: apply_withdrawal(db, account_id, amount),
+    )
 
 # --------------------Listing accounts-----------
 @router.get(
     "/",
     summary="🧾 Accounts List (👨‍💼Staff/👤Customer)",
-    response_model=List[AccountOut],
+    response_model=Page[AccountOut],
+    response_class=FastJSONResponse,
+    dependencies=[AdmitRead],
 )
 def list_accounts(
-    db: Session = Depends(get_db),
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: Session = Depends(get_read_db),
     token: str = Depends(oauth2),
 ):
     data = decode_token(token)
@@ -224,38 +453,32 @@ def list_accounts(
 
     # STAFF → all accounts
     if role in ("admin", "employee"):
-        return (
-            db.query(AccountModel)
-            .order_by(AccountModel.id)
-            .all()
-        )
+        customer_id = None
 
     # CUSTOMER → only own accounts
-    if role == "customer":
+    elif role == "customer":
         customer_id = int(data["sub"])
-        return (
-            db.query(AccountModel)
-            .filter(AccountModel.customer_id == customer_id)
-            .order_by(AccountModel.id)
-            .all()
-        )
 
-    raise HTTPException(403, "Not allowed")
+    else:
+        raise HTTPException(403, "Not allowed")
+
+    return accounts_page(db.execute(accounts_page_stmt(customer_id, cursor, limit)).all(), limit)
 
 
 # ---------------- Balance HISTORY ---------------- #
 
-@router.get("/{account_id}/balance",summary="👁️View Balance (👨‍💼Staff/👤Customer)", response_model=BalanceResponse)
+@router.get("/{account_id}/balance",summary="👁️View Balance (👨‍💼Staff/👤Customer)", response_model=BalanceResponse, dependencies=[AdmitRead])
 def get_balance(
     account_id: int,
-    db: Session = Depends(get_db),
+    as_of: Optional[datetime] = Query(None, description="Balance at this instant (ISO 8601, UTC if no offset)"),
+    db: Session = Depends(get_read_db),
     token: str = Depends(oauth2),
 ):
     data = decode_token(token)
     if not data:
         raise HTTPException(401, "Invalid token")
 
-    acc = db.query(AccountModel).filter_by(id=account_id).first()
+    acc = balance_cache.get(account_id) or fetch_balance(db, account_id)
     if not acc:
         raise HTTPException(404, "Account not found")
 
@@ -273,7 +496,14 @@ def get_balance(
     else:
         raise HTTPException(403)
 
+    if as_of is not None:
+        return BalanceResponse(
+            account_id=account_id,
+            balance=balance_as_of(db, account_id, as_of),
+            as_of=as_of,
+        )
+
     return BalanceResponse(
-        account_id=acc.id,
+        account_id=account_id,
         balance=acc.balance,
     )
\ No newline at end of file
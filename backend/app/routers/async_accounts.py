@@ -0,0 +1,206 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+
+from app.db import get_async_db, get_async_read_db
+from app.schemas.account import AccountOut, BalanceResponse
+from app.schemas.pagination import Page
+from app.models.account import Account as AccountModel
+from app.routers import accounts as sync_accounts
+from app.routers.accounts import (
+    accounts_page,
+    accounts_page_stmt,
+    account_transfers_stmt,
+    apply_deposit,
+    apply_withdrawal,
+    fetch_balance,
+    transfer_history_page,
+)
+from app.routers.auth import get_current_user_async
+from app.config import settings
+from app.core.security import decode_token
+from app.core.pagination import CursorParam, LimitParam
+from app.core.admission import AdmitRead, AdmitWrite
+from app.core.responses import FastJSONResponse
+from app.core.balance_cache import balance_cache
+from app.services.ledger import balance_as_of
+from app.core.idempotency import IdempotencyKeyHeader, owner_of, request_fingerprint, run_idempotent_async
+
+# Async variants of the hot account endpoints (settings.db_async).
+# Every other /accounts route is reused from the sync router below.
+oauth2 = sync_accounts.oauth2
+router = APIRouter(
+    prefix="/accounts",
+    tags=["💳 Accounts"],
+)
+
+
+# ---------------- TRANSFER HISTORY ---------------- #
+@router.get("/{account_id}/transfers", summary="👁️ View transfers by account (👨‍💼 Staff / 👤 Customer)", dependencies=[AdmitRead])
+async def account_transfers(
+    account_id: int,
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: AsyncSession = Depends(get_async_read_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid token")
+
+    acc = await db.get(AccountModel, account_id)
+    if not acc:
+        raise HTTPException(404, "Account not found")
+
+    role = data["role"]
+
+    # STAFF → full access
+    if role in ("admin", "employee"):
+        pass
+
+    # CUSTOMER → only own account
+    elif role == "customer":
+        if acc.customer_id != int(data["sub"]):
+            raise HTTPException(403, "Access denied")
+
+    else:
+        raise HTTPException(403, "Not allowed")
+
+    result = await db.execute(account_transfers_stmt(account_id, cursor, limit))
+    return transfer_history_page(result.all(), account_id, limit)
+
+
+# ---------------- DEPOSIT ---------------- #
+@router.post("/{account_id}/deposit", summary="💰 Deposit in Account (👨‍💼 Staff only)", dependencies=[AdmitWrite])
+async def deposit(
+    account_id: int,
+    amount: Decimal,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
+):
+    if settings.env == "prod" and user.role not in ("admin", "employee"):
+        raise HTTPException(403, "Staff only")
+
+    return await run_idempotent_async(
+        db,
+        idempotency_key,
+        owner_of(user.role, user.email),
+        request_fingerprint("POST", f"/accounts/{account_id}/deposit", amount=amount),
+        lambda db: apply_deposit(db, account_id, amount),
+    )
+
+
+# ---------------- WITHDRAW ---------------- #
+@router.post(
+    "/{account_id}/withdraw",
+    status_code=status.HTTP_200_OK,
+    summary="💸 Withdraw money (👨‍💼Staff only)",
+    dependencies=[AdmitWrite],
+)
+async def withdraw(
+    account_id: int,
+    amount: Decimal,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_async),
+):
+    if settings.env == "prod" and user.role not in ("admin", "employee"):
+        raise HTTPException(403, "Staff only")
+
+    return await run_idempotent_async(
+        db,
+        idempotency_key,
+        owner_of(user.role, user.email),
+        request_fingerprint("POST", f"/accounts/{account_id}/withdraw", amount=amount),
+        lambda db: apply_withdrawal(db, account_id, amount),
+    )
+
+
+# --------------------Listing accounts-----------
+@router.get(
+    "/",
+    summary="🧾 Accounts List (👨‍💼Staff/👤Customer)",
+    response_model=Page[AccountOut],
+    response_class=FastJSONResponse,
+    dependencies=[AdmitRead],
+)
+async def list_accounts(
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: AsyncSession = Depends(get_async_read_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid token")
+
+    role = data["role"]
+
+    # STAFF → all accounts
+    if role in ("admin", "employee"):
+        customer_id = None
+
+    # CUSTOMER → only own accounts
+    elif role == "customer":
+        customer_id = int(data["sub"])
+
+    else:
+        raise HTTPException(403, "Not allowed")
+
+    result = await db.execute(accounts_page_stmt(customer_id, cursor, limit))
+    return accounts_page(result.all(), limit)
+
+
+# ---------------- Balance HISTORY ---------------- #
+
+@router.get("/{account_id}/balance",summary="👁️View Balance (👨‍💼Staff/👤Customer)", response_model=BalanceResponse, dependencies=[AdmitRead])
+async def get_balance(
+    account_id: int,
+    as_of: Optional[datetime] = Query(None, description="Balance at this instant (ISO 8601, UTC if no offset)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid token")
+
+    acc = balance_cache.get(account_id) or await db.run_sync(fetch_balance, account_id)
+    if not acc:
+        raise HTTPException(404, "Account not found")
+
+    role = data["role"]
+
+    # STAFF: allow
+    if role in ("admin", "employee"):
+        pass
+
+    # CUSTOMER: must own account
+    elif role == "customer":
+        if acc.customer_id != int(data["sub"]):
+            raise HTTPException(403, "Access denied")
+
+    else:
+        raise HTTPException(403)
+
+    if as_of is not None:
+        return BalanceResponse(
+            account_id=account_id,
+            balance=await db.run_sync(balance_as_of, account_id, as_of),
+            as_of=as_of,
+        )
+
+    return BalanceResponse(
+        account_id=account_id,
+        balance=acc.balance,
+    )
+
+
+# ---------------- Sync fallbacks ---------------- #
+_overridden = {(r.path, m) for r in router.routes for m in r.methods}
+router.routes.extend(
+    r for r in sync_accounts.router.routes
+    if not any((r.path, m) in _overridden for m in r.methods)
+)
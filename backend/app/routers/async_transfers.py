@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.db import get_async_db
+from app.schemas.transfer import TransferCreate, Transfer
+from app.routers import transfers as sync_transfers
+from app.core.admission import AdmitWrite
+from app.core.security import decode_token
+from app.services.transfer_engine import execute_transfer
+from app.core.idempotency import IdempotencyKeyHeader, owner_of, request_fingerprint, run_idempotent_async
+
+# Async variant of transfer creation (settings.db_async).
+# Every other /transfers route is reused from the sync router below.
+oauth2 = sync_transfers.oauth2
+router = APIRouter(
+    prefix="/transfers",
+    tags=["🔁 Transfers"],
+)
+
+
+# -------------------------------------------------
+# Create transfer
+# -------------------------------------------------
+@router.post(
+    "/",
+    summary="💱 Create Transfer (👨‍💼 Staff / 👤 Customer)",
+    response_model=Transfer,
+    status_code=201,
+    dependencies=[AdmitWrite],
+)
+async def create_transfer(
+    payload: TransferCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid or expired token")
+
+    role = data["role"]
+
+    if role not in ("admin", "employee", "customer"):
+        raise HTTPException(403, "Not allowed")
+
+    # 👤 CUSTOMER: can only transfer from OWN account
+    customer_id = int(data["sub"]) if role == "customer" else None
+
+    # Same engine as the sync route, driven through the async connection
+    return await run_idempotent_async(
+        db,
+        idempotency_key,
+        owner_of(role, data["sub"]),
+        request_fingerprint("POST", "/transfers/", **payload.model_dump()),
+        lambda db: Transfer.model_validate(execute_transfer(
+            db,
+            payload.from_account_id,
+            payload.to_account_id,
+            payload.amount,
+            customer_id=customer_id,
+            commit=False,
+        )),
+        status_code=201,
+    )
+
+
+# ---------------- Sync fallbacks ---------------- #
+_overridden = {(r.path, m) for r in router.routes for m in r.methods}
+router.routes.extend(
+    r for r in sync_transfers.router.routes
+    if not any((r.path, m) in _overridden for m in r.methods)
+)
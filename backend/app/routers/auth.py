@@ -1,18 +1,25 @@
 # app/routers/auth.py
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.responses import JSONResponse
 
-from app.db import get_db
+from app.db import get_db, get_async_db
 from app.models.employee import Employee
 from app.core.security import (
     hash_password,
     verify_password,
     create_access_token,
     decode_token,
+    revoke_token,
 )
+from app.core.hashing import hash_pool
+from app.core.principal_cache import Principal, principal_cache
 
 router = APIRouter(
     prefix="/auth",
@@ -20,6 +27,7 @@ router = APIRouter(
 )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
 
 
 # =========================================================
@@ -41,7 +49,7 @@ def register_staff(
 
     user = Employee(
         email=email,
-        hashed_password=hash_password(password),
+        hashed_password=hash_pool.run(hash_password, password),
         role=role,
     )
     db.add(user)
@@ -59,7 +67,7 @@ def login(
     db: Session = Depends(get_db),
 ):
     user = db.query(Employee).filter(Employee.email == form.username).first()
-    if not user or not verify_password(form.password, user.hashed_password):
+    if not user or not hash_pool.run(verify_password, form.password, user.hashed_password):
         raise HTTPException(401, "Invalid credentials")
 
     token = create_access_token(
@@ -79,6 +87,15 @@ def login(
 # =========================================================
 # Shared dependency → authenticated user (REAL JWT ONLY)
 # =========================================================
+def _check_principal(principal: Principal, data: dict) -> Principal:
+    # a re-created employee with the same email must not inherit old tokens
+    if "uid" in data and principal.id != data["uid"]:
+        raise HTTPException(401, "User not found")
+    if not principal.is_active:
+        raise HTTPException(401, "Inactive user")
+    return principal
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
@@ -87,11 +104,35 @@ def get_current_user(
     if not data:
         raise HTTPException(401, "Invalid or expired token")
 
-    user = db.query(Employee).filter(Employee.email == data["sub"]).first()
-    if not user:
-        raise HTTPException(401, "User not found")
+    principal = principal_cache.get(data["sub"])
+    if principal is None:
+        user = db.query(Employee).filter(Employee.email == data["sub"]).first()
+        if not user:
+            raise HTTPException(401, "User not found")
+        principal = Principal.from_employee(user)
+        principal_cache.put(data["sub"], principal)
 
-    return user
+    return _check_principal(principal, data)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid or expired token")
+
+    principal = principal_cache.get(data["sub"])
+    if principal is None:
+        result = await db.execute(select(Employee).where(Employee.email == data["sub"]))
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(401, "User not found")
+        principal = Principal.from_employee(user)
+        principal_cache.put(data["sub"], principal)
+
+    return _check_principal(principal, data)
 
 
 # =========================================================
@@ -104,7 +145,9 @@ def get_current_employee(user=Depends(get_current_user)):
 
 
 @router.post("/logout")
-def logout():
+def logout(token: Optional[str] = Depends(optional_oauth2)):
+    if token:
+        revoke_token(token)
     return JSONResponse(
         {"message": "Logged out. Please remove token on client."}
     )
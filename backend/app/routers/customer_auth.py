@@ -5,6 +5,7 @@ from app.db import get_db
 from app.models.customer import Customer
 from app.schemas.customer import CustomerCreate, CustomerOut, CustomerLogin
 from app.core.security import hash_pin, verify_pin, create_access_token
+from app.core.hashing import hash_pool
 
 router = APIRouter(
     prefix="/customer/auth",
@@ -28,7 +29,7 @@ def customer_register(
     customer = Customer(
         name=data.name,
         phone_number=data.phone_number,
-        pin_hash=hash_pin(data.pin),
+        pin_hash=hash_pool.run(hash_pin, data.pin),
     )
 
     db.add(customer)
@@ -49,7 +50,7 @@ def customer_login(
         .filter(Customer.phone_number == data.phone_number)
         .first()
     )
-    if not user or not verify_pin(data.pin, user.pin_hash):
+    if not user or not hash_pool.run(verify_pin, data.pin, user.pin_hash):
         raise HTTPException(401, "Invalid phone or PIN")
 
     # sub MUST be string (JWT best practice)
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models.customer import Customer
-from app.schemas.customer import CustomerCreate, CustomerOut
+from app.schemas.customer import CustomerCreate, CustomerImportResult, CustomerOut
+from app.schemas.pagination import Page
+from app.core.admission import AdmitRead
 from app.core.security import hash_pin
-from app.routers.auth import get_current_user
+from app.core.hashing import hash_pool
+from app.core.pagination import CursorParam, LimitParam, decode_cursor, paginate
+from app.routers.auth import get_current_employee, get_current_user
+from app.services.customer_import import FORMATS, CustomerImport, read_records
 from app.config import settings
 
 router = APIRouter(
@@ -43,7 +51,7 @@ def create_customer(
     customer = Customer(
         name=payload.name,
         phone_number=payload.phone_number,
-        pin_hash=hash_pin(payload.pin),
+        pin_hash=hash_pool.run(hash_pin, payload.pin),
     )
 
     db.add(customer)
@@ -52,12 +60,42 @@ def create_customer(
 
     return customer
 
+# Bulk onboarding: streamed CSV (name,phone_number,pin header) or NDJSON
+@router.post(
+    "/bulk",
+    summary="📥 Bulk-create Customers from CSV / NDJSON (👨‍💼Staff only)",
+    response_model=CustomerImportResult,
+)
+async def bulk_create_customers(
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_employee),
+):
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = FORMATS.get(media_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send one of: {', '.join(FORMATS)}",
+        )
+
+    # rows are parsed as the body arrives; each full batch is written off the event loop
+    job = CustomerImport(db, settings.customer_import_batch_size)
+    async for record in read_records(request.stream(), fmt):
+        if job.add(record):
+            await run_in_threadpool(job.flush)
+    await run_in_threadpool(job.flush)
+
+    return job.result()
+
 # Listing of customers 
 from typing import List
 
-@router.get("/",summary="🧾 List all Customers (👨‍💼Staff only)", response_model=List[CustomerOut])
+@router.get("/",summary="🧾 List all Customers (👨‍💼Staff only)", response_model=Page[CustomerOut], dependencies=[AdmitRead])
 def list_customers(
-    db: Session = Depends(get_db),
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     # ---- RBAC: staff only in prod ----
@@ -67,4 +105,11 @@ def list_customers(
             detail="Only staff can view customers",
         )
 
-    return db.query(Customer).order_by(Customer.id).all()
+    stmt = select(Customer).order_by(Customer.id).limit(limit + 1)
+    if cursor:
+        (after_id,) = decode_cursor(cursor, int)
+        stmt = stmt.where(Customer.id > after_id)
+
+    rows = db.execute(stmt).scalars().all()
+    items, next_cursor = paginate(rows, limit, lambda c: (c.id,))
+    return {"items": items, "next_cursor": next_cursor}
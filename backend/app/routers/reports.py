@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.admission import AdmitRead
+from app.core.report_cache import report_cache
+from app.db import get_read_sessions
+from app.routers.auth import get_current_employee
+from app.schemas.report import BalanceHistogramReport, DepositsReport, TopAccountsReport, TransferVolumeReport
+from app.services import reports
+from app.services.rollups import day_range
+
+# Served from report_cache: handlers only open a session (in reports.compute)
+# when a result is missing or expired, or in the background refresh, which
+# is why they take a session factory rather than a request session.
+router = APIRouter(
+    prefix="/reports",
+    tags=["📈 Reports"],
+    dependencies=[AdmitRead],
+)
+
+MAX_HISTOGRAM_EDGES = 50
+
+
+@router.get("/deposits", summary="🏦 Total deposits under management (👨‍💼 Staff only)", response_model=DepositsReport)
+def deposits_report(sessions=Depends(get_read_sessions), user=Depends(get_current_employee)):
+    return report_cache.get(("deposits",), partial(reports.compute, sessions, reports.deposits))
+
+
+@router.get(
+    "/transfer-volume",
+    summary="📈 Transfer count and amount per day or month (👨‍💼 Staff only)",
+    response_model=TransferVolumeReport,
+)
+def transfer_volume_report(
+    from_: Optional[date] = Query(None, alias="from", description="First day (UTC); default 29 days before 'to'"),
+    to: Optional[date] = Query(None, description="Last day (UTC), inclusive; default today"),
+    granularity: Literal["day", "month"] = Query("day"),
+    sessions=Depends(get_read_sessions),
+    user=Depends(get_current_employee),
+):
+    from_, to = day_range(from_, to)
+    return report_cache.get(
+        ("transfer_volume", from_, to, granularity),
+        partial(reports.compute, sessions, reports.transfer_volume, from_, to, granularity),
+    )
+
+
+@router.get(
+    "/top-accounts",
+    summary="🏆 Top accounts by balance or transfer volume (👨‍💼 Staff only)",
+    response_model=TopAccountsReport,
+)
+def top_accounts_report(
+    by: Literal["balance", "volume"] = Query("balance"),
+    limit: int = Query(10, ge=1, le=100),
+    from_: Optional[date] = Query(None, alias="from", description="Volume only: first day (UTC)"),
+    to: Optional[date] = Query(None, description="Volume only: last day (UTC), inclusive; default today"),
+    sessions=Depends(get_read_sessions),
+    user=Depends(get_current_employee),
+):
+    if by == "balance":
+        return report_cache.get(
+            ("top_balance", limit), partial(reports.compute, sessions, reports.top_by_balance, limit),
+        )
+
+    from_, to = day_range(from_, to)
+    return report_cache.get(
+        ("top_volume", limit, from_, to),
+        partial(reports.compute, sessions, reports.top_by_volume, limit, from_, to),
+    )
+
+
+@router.get(
+    "/balance-histogram",
+    summary="📊 Accounts per balance bucket (👨‍💼 Staff only)",
+    response_model=BalanceHistogramReport,
+)
+def balance_histogram_report(
+    edges: Optional[List[Decimal]] = Query(None, description="Ascending bucket boundaries, e.g. ?edges=100&edges=1000"),
+    sessions=Depends(get_read_sessions),
+    user=Depends(get_current_employee),
+):
+    edges = tuple(edges) if edges else reports.DEFAULT_BALANCE_EDGES
+    if len(edges) > MAX_HISTOGRAM_EDGES:
+        raise HTTPException(422, f"At most {MAX_HISTOGRAM_EDGES} edges")
+    if any(low >= high for low, high in zip(edges, edges[1:])):
+        raise HTTPException(422, "Edges must be strictly ascending")
+
+    return report_cache.get(
+        ("balance_histogram", edges), partial(reports.compute, sessions, reports.balance_histogram, edges),
+    )
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from decimal import Decimal
 
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models.account import Account as AccountModel
 from app.models.transfer import Transfer as TransferModel
-from app.schemas.transfer import TransferCreate, Transfer
+from app.schemas.transfer import TransferCreate, Transfer, TransferBatchCreate, TransferBatchResult, TransferTicket
+from app.schemas.pagination import Page
+from app.core.pagination import CursorParam, LimitParam, decode_cursor, paginate
+from app.core.admission import AdmitRead, AdmitWrite
+from app.core.responses import FastJSONResponse
 from app.routers.auth import get_current_user
 from app.config import settings
 from sqlalchemy import or_
 from fastapi.security import OAuth2PasswordBearer
 from app.core.security import decode_token
+from app.services.transfer_engine import execute_transfer, execute_batch, precheck_transfer
+from app.services.group_commit import transfer_pipeline
+from app.core.idempotency import IdempotencyKeyHeader, owner_of, request_fingerprint, run_idempotent
 oauth2 = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 router = APIRouter(
@@ -22,6 +31,16 @@ router = APIRouter(
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
+# Columns of the Transfer schema, selected as plain rows for list pages
+TRANSFER_COLUMNS = (
+    TransferModel.id,
+    TransferModel.from_account_id,
+    TransferModel.to_account_id,
+    TransferModel.amount,
+    TransferModel.created_at,
+)
+
+
 def get_account(db: Session, acc_id: int) -> AccountModel:
     acc = db.query(AccountModel).filter_by(id=acc_id).first()
     if not acc:
@@ -37,9 +56,11 @@ def get_account(db: Session, acc_id: int) -> AccountModel:
     summary="💱 Create Transfer (👨‍💼 Staff / 👤 Customer)",
     response_model=Transfer,
     status_code=201,
+    dependencies=[AdmitWrite],
 )
 def create_transfer(
     payload: TransferCreate,
+    idempotency_key: Optional[str] = IdempotencyKeyHeader,
     db: Session = Depends(get_db),
     token: str = Depends(oauth2),
 ):
@@ -52,47 +73,140 @@ def create_transfer(
     if role not in ("admin", "employee", "customer"):
         raise HTTPException(403, "Not allowed")
 
-    from_acc = get_account(db, payload.from_account_id)
-    to_acc = get_account(db, payload.to_account_id)
-
     # 👤 CUSTOMER: can only transfer from OWN account
-    if role == "customer":
-        customer_id = int(data["sub"])
-        if from_acc.customer_id != customer_id:
-            raise HTTPException(
-                status_code=403,
-                detail="Customers can only transfer from their own accounts",
-            )
+    customer_id = int(data["sub"]) if role == "customer" else None
+
+    return run_idempotent(
+        db,
+        idempotency_key,
+        owner_of(role, data["sub"]),
+        request_fingerprint("POST", "/transfers/", **payload.model_dump()),
+        lambda db: Transfer.model_validate(execute_transfer(
+            db,
+            payload.from_account_id,
+            payload.to_account_id,
+            payload.amount,
+            customer_id=customer_id,
+            commit=False,
+        )),
+        status_code=201,
+    )
+
+
+# -------------------------------------------------
+# Batch transfers (payroll / settlement runs)
+# -------------------------------------------------
+@router.post(
+    "/batch",
+    summary="📦 Batch Transfers (👨‍💼 Staff / 👤 Customer)",
+    response_model=TransferBatchResult,
+)
+def create_transfer_batch(
+    payload: TransferBatchCreate,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid or expired token")
+
+    role = data["role"]
 
-    if payload.from_account_id == payload.to_account_id:
-        raise HTTPException(422, "Cannot transfer to same account")
+    if role not in ("admin", "employee", "customer"):
+        raise HTTPException(403, "Not allowed")
 
-    if from_acc.balance < payload.amount:
-        raise HTTPException(400, "Insufficient funds")
+    if len(payload.items) > settings.transfer_batch_max_items:
+        raise HTTPException(413, f"Batch exceeds {settings.transfer_batch_max_items} items")
 
-    from_acc.balance -= payload.amount
-    to_acc.balance += payload.amount
+    # 👤 CUSTOMER: every item must debit one of their OWN accounts
+    customer_id = int(data["sub"]) if role == "customer" else None
 
-    transfer = TransferModel(
-        from_account_id=payload.from_account_id,
-        to_account_id=payload.to_account_id,
-        amount=payload.amount,
+    results = execute_batch(
+        db,
+        payload.items,
+        customer_id=customer_id,
+        atomic=payload.mode == "atomic",
+        chunk_size=settings.transfer_batch_chunk_size,
     )
+    committed = sum(1 for r in results if r["status"] == "committed")
+
+    return {
+        "mode": payload.mode,
+        "committed": committed,
+        "rejected": sum(1 for r in results if r["status"] == "rejected"),
+        "results": results,
+    }
+
+
+# -------------------------------------------------
+# Queued transfers (group commit)
+# -------------------------------------------------
+@router.post(
+    "/tickets",
+    summary="🎫 Queue a Transfer (👨‍💼 Staff / 👤 Customer)",
+    response_model=TransferTicket,
+    status_code=202,
+)
+def queue_transfer(
+    payload: TransferCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid or expired token")
+
+    role = data["role"]
+
+    if role not in ("admin", "employee", "customer"):
+        raise HTTPException(403, "Not allowed")
+
+    # 👤 CUSTOMER: can only transfer from OWN account; funds are checked when the group is applied
+    customer_id = int(data["sub"]) if role == "customer" else None
+    precheck_transfer(db, payload.from_account_id, payload.to_account_id, customer_id=customer_id)
+    ticket = transfer_pipeline.submit(payload, customer_id=customer_id, owner=owner_of(role, data["sub"]))
+
+    response.headers["Location"] = f"/transfers/tickets/{ticket.id}"
+    return ticket.public()
+
 
-    db.add(transfer)
-    db.commit()
-    db.refresh(transfer)
+@router.get(
+    "/tickets/{ticket_id}",
+    summary="🎫 Queued Transfer status (👨‍💼 Staff / 👤 Customer)",
+    response_model=TransferTicket,
+)
+async def get_transfer_ticket(
+    ticket_id: str,
+    token: str = Depends(oauth2),
+):
+    data = decode_token(token)
+    if not data:
+        raise HTTPException(401, "Invalid or expired token")
+
+    ticket = transfer_pipeline.get(ticket_id)
+    # 👤 CUSTOMER: only their own tickets
+    if ticket is None or (data["role"] not in ("admin", "employee") and ticket.owner != owner_of(data["role"], data["sub"])):
+        raise HTTPException(404, "Ticket not found")
 
-    return transfer
+    return ticket.public()
 
 
 # -------------------------------------------------
 # List all transfers (staff only in prod)
 # -------------------------------------------------
-@router.get("/", summary=" 🧾 List all transfers (👨‍💼Staff only)",response_model=List[Transfer])
+@router.get(
+    "/",
+    summary=" 🧾 List all transfers (👨‍💼Staff only)",
+    response_model=Page[Transfer],
+    response_class=FastJSONResponse,
+    dependencies=[AdmitRead],
+)
 def list_transfers(
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
     user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     if user.role == "customer":
         raise HTTPException(
@@ -100,11 +214,18 @@ def list_transfers(
             detail="Customers cannot view all transfers",
         )
 
-    return (
-        db.query(TransferModel)
-        .order_by(TransferModel.created_at.desc())
-        .all()
+    stmt = (
+        select(*TRANSFER_COLUMNS)
+        .order_by(TransferModel.created_at.desc(), TransferModel.id.desc())
+        .limit(limit + 1)
     )
+    if cursor:
+        created_at, transfer_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(tuple_(TransferModel.created_at, TransferModel.id) < (created_at, transfer_id))
+
+    rows = db.execute(stmt).all()
+    items, next_cursor = paginate(rows, limit, lambda t: (t.created_at, t.id))
+    return FastJSONResponse({"items": [row._asdict() for row in items], "next_cursor": next_cursor})
 
 
 # Listing of transfers by accounts
@@ -1,3 +1,7 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel, ConfigDict, Field, PositiveInt, condecimal
 
 
@@ -30,9 +34,32 @@ class AccountOut(BaseModel):
 class BalanceResponse(BaseModel):
     account_id: PositiveInt
     balance: condecimal(max_digits=12, decimal_places=2, ge=0)
+    as_of: Optional[datetime] = None  # set for point-in-time lookups
 
 class AccountUpdate(BaseModel):
     balance: condecimal(gt=0, max_digits=12, decimal_places=2) | None = None
     customer_id: PositiveInt | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Striping of a hot account's credits (0 turns it off)
+class StripeConfig(BaseModel):
+    stripes: int = Field(..., ge=0, le=64, description="Stripe rows taking transfer credits")
+
+
+# Money in / out per day or month, from the daily rollups
+class PeriodSummary(BaseModel):
+    period: date  # first day of the day or month
+    money_in: Decimal
+    money_out: Decimal
+    transfers_in: int
+    transfers_out: int
+
+
+class AccountSummary(BaseModel):
+    account_id: PositiveInt
+    granularity: Literal["day", "month"]
+    from_: date = Field(..., alias="from")
+    to: date
+    periods: List[PeriodSummary]
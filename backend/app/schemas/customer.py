@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel
 
 # -----------------------------------------
@@ -27,3 +29,17 @@ class CustomerOut(BaseModel):
 class CustomerLogin(BaseModel):
     phone_number: str
     pin: str
+
+
+# -----------------------------------------
+# Bulk import result (POST /customers/bulk)
+# -----------------------------------------
+class CustomerImportError(BaseModel):
+    row: int  # data row, from 1, not counting a CSV header
+    detail: str
+
+
+class CustomerImportResult(BaseModel):
+    created: int
+    rejected: int
+    errors: List[CustomerImportError]
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+# -----------------------------------------
+# Bank-wide staff reports
+# -----------------------------------------
+class DepositsReport(BaseModel):
+    accounts: int
+    customers: int
+    total_balance: Decimal
+    generated_at: datetime  # results are cached; this is when they were computed
+
+
+class VolumePeriod(BaseModel):
+    period: date  # first day of the day or month
+    transfers: int
+    amount: Decimal
+
+
+class TransferVolumeReport(BaseModel):
+    granularity: Literal["day", "month"]
+    from_: date = Field(..., alias="from")
+    to: date
+    periods: List[VolumePeriod]
+    generated_at: datetime
+
+
+class TopAccount(BaseModel):
+    account_id: int
+    customer_id: int
+    value: Decimal  # balance or transfer volume, as ranked
+    transfers: Optional[int] = None  # volume ranking only
+
+
+class TopAccountsReport(BaseModel):
+    by: Literal["balance", "volume"]
+    from_: Optional[date] = Field(None, alias="from")  # volume ranking only
+    to: Optional[date] = None
+    items: List[TopAccount]
+    generated_at: datetime
+
+
+class BalanceBucket(BaseModel):
+    min: Optional[Decimal] = None  # inclusive; None for the lowest bucket
+    max: Optional[Decimal] = None  # exclusive; None for the highest bucket
+    accounts: int
+    total_balance: Decimal
+
+
+class BalanceHistogramReport(BaseModel):
+    buckets: List[BalanceBucket]
+    generated_at: datetime
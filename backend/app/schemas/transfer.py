@@ -2,6 +2,7 @@ from pydantic import BaseModel, ConfigDict, Field, PositiveInt, condecimal, mode
 from datetime import datetime
 from pydantic import BaseModel, field_validator
 from decimal import Decimal
+from typing import List, Literal, Optional
 
 class TransferCreate(BaseModel):
     from_account_id: int
@@ -22,3 +23,39 @@ class Transfer(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# -----------------------------------------
+# Batch submission
+# -----------------------------------------
+class TransferBatchCreate(BaseModel):
+    items: List[TransferCreate] = Field(..., min_length=1)
+    # atomic: all items commit or none do; best_effort: commit every valid item
+    mode: Literal["atomic", "best_effort"] = "atomic"
+
+
+class TransferBatchItemResult(BaseModel):
+    index: int
+    status: Literal["committed", "rejected", "skipped"]
+    transfer_id: Optional[int] = None
+    status_code: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class TransferBatchResult(BaseModel):
+    mode: Literal["atomic", "best_effort"]
+    committed: int
+    rejected: int
+    results: List[TransferBatchItemResult]
+
+
+# -----------------------------------------
+# Queued submission (group commit)
+# -----------------------------------------
+class TransferTicket(BaseModel):
+    id: str
+    status: Literal["pending", "committed", "rejected"]
+    transfer_id: Optional[int] = None
+    status_code: Optional[int] = None  # why a rejected transfer was refused
+    detail: Optional[str] = None
+    submitted_at: datetime
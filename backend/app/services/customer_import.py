@@ -0,0 +1,183 @@
+import csv
+import json
+from typing import AsyncIterator, List, Tuple, Union
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.hashing import hash_many
+from app.core.security import hash_pin
+from app.models.customer import Customer
+from app.schemas.customer import CustomerCreate
+
+CSV_COLUMNS = ("name", "phone_number", "pin")
+# Content-Type of an upload -> its format
+FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/ndjson": "ndjson"}
+
+# (row number, fields) or (row number, why the row could not be read)
+Record = Tuple[int, Union[dict, str]]
+
+
+# -------------------------------------------------
+# Reading the upload
+# -------------------------------------------------
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            yield line.decode("utf-8-sig", errors="replace").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig", errors="replace").rstrip("\r")
+
+
+async def _csv_lines(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    # joins the lines of a quoted field that spans several: an odd number of
+    # quotes so far (escaped quotes come in pairs) means the field is still open
+    pending = None
+    async for line in lines:
+        pending = line if pending is None else f"{pending}\n{line}"
+        if pending.count('"') % 2 == 0:
+            yield pending
+            pending = None
+    if pending is not None:
+        yield pending  # unterminated: csv.reader takes the rest as the field
+
+
+async def read_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    """Rows of a CSV (with a header line) or NDJSON upload, as they arrive.
+
+    Rows are numbered from 1, not counting the CSV header; blank lines are
+    skipped but still counted. A CSV row whose quoted field holds line
+    breaks is one row.
+    """
+    lines = _lines(chunks)
+    if fmt == "csv":
+        lines = _csv_lines(lines)
+    columns = None
+    row = 0
+    async for line in lines:
+        if fmt == "csv" and columns is None:
+            columns = next(csv.reader([line]), [])
+            missing = [c for c in CSV_COLUMNS if c not in columns]
+            if missing:
+                raise HTTPException(422, f"CSV header is missing {', '.join(missing)}")
+            continue
+        row += 1
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if len(values) != len(columns):
+                yield row, f"Expected {len(columns)} columns, got {len(values)}"
+            else:
+                yield row, dict(zip(columns, values))
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            yield row, "Invalid JSON"
+            continue
+        yield row, fields if isinstance(fields, dict) else "Expected a JSON object"
+
+
+# -------------------------------------------------
+# Creating customers
+# -------------------------------------------------
+class CustomerImport:
+    """Creates customers from ``add``-ed rows, ``batch_size`` at a time.
+
+    Each batch costs one ``IN`` lookup of its phone numbers (on the unique
+    phone_number index), PIN hashes spread over the bulk hashing threads,
+    one executemany INSERT and one commit. Rows that fail validation or
+    whose phone is already taken (in the database or earlier in the same
+    upload) are reported in ``errors`` and do not stop the import.
+    """
+
+    def __init__(self, db: Session, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.created = 0
+        self.errors: List[dict] = []
+        self._phones = set()  # every phone seen in this upload
+        self._batch: List[Tuple[int, CustomerCreate]] = []
+
+    def add(self, record: Record) -> bool:
+        """Queue one row; True once a batch is ready to ``flush``."""
+        row, fields = record
+        if isinstance(fields, str):
+            self._reject(row, fields)
+            return False
+        try:
+            customer = CustomerCreate.model_validate(fields)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            self._reject(row, f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+            return False
+        if customer.phone_number in self._phones:
+            self._reject(row, "Duplicate phone number in upload")
+            return False
+        self._phones.add(customer.phone_number)
+        self._batch.append((row, customer))
+        return len(self._batch) >= self.batch_size
+
+    def flush(self) -> None:
+        """Create the queued rows. Runs in a worker thread."""
+        batch, self._batch = self._batch, []
+        batch = self._unregistered(batch)
+        if not batch:
+            return
+        hashes = hash_many(hash_pin, [customer.pin for _, customer in batch])
+        rows = [
+            (row, {"name": c.name, "phone_number": c.phone_number, "pin_hash": pin_hash})
+            for (row, c), pin_hash in zip(batch, hashes)
+        ]
+        while rows:
+            try:
+                self._insert(rows)
+                return
+            except IntegrityError:
+                # a phone was registered concurrently, after the lookup
+                self.db.rollback()
+            taken = self._taken([values["phone_number"] for _, values in rows])
+            if not taken:
+                # not a phone conflict: report the rows rather than fail the upload
+                for row, _ in rows:
+                    self._reject(row, "Could not be created")
+                return
+            for row, values in rows:
+                if values["phone_number"] in taken:
+                    self._reject(row, "Phone already registered")
+            rows = [(row, values) for row, values in rows if values["phone_number"] not in taken]
+
+    def result(self) -> dict:
+        return {
+            "created": self.created,
+            "rejected": len(self.errors),
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+        }
+
+    def _unregistered(self, batch):
+        taken = self._taken([customer.phone_number for _, customer in batch])
+        for row, customer in batch:
+            if customer.phone_number in taken:
+                self._reject(row, "Phone already registered")
+        return [(row, customer) for row, customer in batch if customer.phone_number not in taken]
+
+    def _taken(self, phones) -> set:
+        if not phones:
+            return set()
+        return set(self.db.execute(select(Customer.phone_number).where(Customer.phone_number.in_(phones))).scalars())
+
+    def _insert(self, rows) -> None:
+        if rows:
+            self.db.execute(insert(Customer), [values for _, values in rows])
+        self.db.commit()
+        self.created += len(rows)
+
+    def _reject(self, row: int, detail: str) -> None:
+        self.errors.append({"row": row, "detail": detail})
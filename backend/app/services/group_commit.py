@@ -0,0 +1,222 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core.metrics import LATENCY_BUCKETS, Counter, Histogram, registry
+from app.db import SessionLocal
+from app.services.transfer_engine import execute_batch
+
+log = logging.getLogger("app.group_commit")
+
+GROUP_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+# Seconds a client is told to wait when the queue is full
+RETRY_AFTER = 1
+# Groups whose guard tripped (a concurrent writer moved a balance) are re-run this often
+CONFLICT_RETRIES = 1
+
+group_size = registry.register(Histogram(
+    "transfer_group_size", "Queued transfers applied per group commit.", buckets=GROUP_SIZE_BUCKETS,
+))
+group_commit_seconds = registry.register(Histogram(
+    "transfer_group_commit_seconds", "Time to apply and commit one group of queued transfers.",
+))
+ticket_latency = registry.register(Histogram(
+    "transfer_ticket_seconds", "Time from 202 Accepted to a queued transfer's outcome.", buckets=LATENCY_BUCKETS,
+))
+tickets_total = registry.register(Counter(
+    "transfer_tickets_total", "Queued transfers by outcome.", ("status",),
+))
+
+
+@dataclass
+class Ticket:
+    id: str
+    owner: str
+    item: object  # TransferCreate
+    customer_id: Optional[int]
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    submitted: float = field(default_factory=time.perf_counter)
+    status: str = "pending"  # pending | committed | rejected
+    transfer_id: Optional[int] = None
+    status_code: Optional[int] = None
+    detail: Optional[str] = None
+
+    def public(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "transfer_id": self.transfer_id,
+            "status_code": self.status_code,
+            "detail": self.detail,
+            "submitted_at": self.submitted_at,
+        }
+
+
+class TransferPipeline:
+    """In-process queue of transfers applied in groups, one commit per group.
+
+    ``submit`` only enqueues, so the caller gets a ticket without waiting
+    for a commit (or its fsync). A single worker thread takes the first
+    queued transfer, gathers more for up to ``max_wait`` seconds or until
+    ``group_size``, and runs them through ``execute_batch`` in best-effort
+    mode: invalid items are rejected on their own, the rest commit together.
+
+    Queue and tickets live in this process: a ticket is only visible on the
+    worker that issued it, and transfers still queued when the process dies
+    are lost (never committed). ``stop`` drains the queue first.
+    """
+
+    def __init__(self, session_factory, queue_size: int, group_size: int, max_wait: float, tickets_kept: int):
+        self.session_factory = session_factory
+        self.group_size = group_size
+        self.max_wait = max_wait
+        self.tickets_kept = tickets_kept
+        self._queue: "queue.Queue[Optional[Ticket]]" = queue.Queue(maxsize=queue_size)
+        self._tickets: "OrderedDict[str, Ticket]" = OrderedDict()
+        self._settled: "OrderedDict[str, None]" = OrderedDict()  # ids in settle order, oldest first
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    # ---------------- submitting ---------------- #
+    def submit(self, item, customer_id: Optional[int], owner: str) -> Ticket:
+        ticket = Ticket(id=uuid.uuid4().hex, owner=owner, item=item, customer_id=customer_id)
+        with self._lock:
+            # only settled tickets are dropped: a client holding a 202 can always look theirs up
+            while len(self._tickets) >= self.tickets_kept and self._settled:
+                self._tickets.pop(self._settled.popitem(last=False)[0], None)
+            if len(self._tickets) >= self.tickets_kept:
+                self._shed("Too many transfers in flight, please retry")
+            self._tickets[ticket.id] = ticket
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="transfer-group-commit", daemon=True)
+                self._worker.start()
+        try:
+            self._queue.put_nowait(ticket)
+        except queue.Full:
+            with self._lock:
+                self._tickets.pop(ticket.id, None)
+            self._shed("Transfer queue is full, please retry")
+        return ticket
+
+    def _shed(self, detail: str) -> None:
+        tickets_total.inc(("shed",))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(RETRY_AFTER)},
+        )
+
+    def get(self, ticket_id: str) -> Optional[Ticket]:
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every transfer queued so far has its outcome."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Apply what is queued, then end the worker."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+
+    # ---------------- applying ---------------- #
+    def _next_group(self) -> Optional[List[Ticket]]:
+        first = self._queue.get()
+        if first is None:
+            self._queue.task_done()
+            return None
+        group = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(group) < self.group_size:
+            try:
+                ticket = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if ticket is None:
+                # keep the stop marker for the next round, after this group
+                self._queue.task_done()
+                self._queue.put(None)
+                break
+            group.append(ticket)
+        return group
+
+    def _run(self) -> None:
+        while True:
+            group = self._next_group()
+            if group is None:
+                return
+            try:
+                self.apply(group)
+            except Exception:  # the worker must outlive a failed group
+                failed = {"status": "rejected", "status_code": 500, "detail": "Transfer failed"}
+                for ticket in group:
+                    if ticket.status == "pending":
+                        self._settle(ticket, failed)
+                log.exception("transfer group commit failed")
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+
+    def apply(self, group: List[Ticket]) -> None:
+        """Run ``group`` as one best-effort batch and settle its tickets."""
+        pending = group
+        for attempt in range(CONFLICT_RETRIES + 1):
+            started = time.perf_counter()
+            with self.session_factory() as db:
+                results = execute_batch(
+                    db,
+                    [t.item for t in pending],
+                    owners=[t.customer_id for t in pending],
+                    atomic=False,
+                    chunk_size=len(pending),
+                )
+            group_commit_seconds.observe(time.perf_counter() - started)
+            group_size.observe(len(pending))
+
+            retry = attempt < CONFLICT_RETRIES
+            conflicted = []
+            for ticket, result in zip(pending, results):
+                if retry and result.get("status_code") == 409:
+                    conflicted.append(ticket)
+                else:
+                    self._settle(ticket, result)
+            if not conflicted:
+                return
+            pending = conflicted
+
+    def _settle(self, ticket: Ticket, result: dict) -> None:
+        ticket.transfer_id = result.get("transfer_id")
+        ticket.status_code = result.get("status_code")
+        ticket.detail = result.get("detail")
+        ticket.item = None
+        # last, so a reader that sees the outcome sees its details too
+        ticket.status = "committed" if result["status"] == "committed" else "rejected"
+        with self._lock:
+            if ticket.id in self._tickets:
+                self._settled[ticket.id] = None
+        tickets_total.inc((ticket.status,))
+        ticket_latency.observe(time.perf_counter() - ticket.submitted)
+
+
+transfer_pipeline = TransferPipeline(
+    SessionLocal,
+    queue_size=settings.transfer_queue_size,
+    group_size=settings.transfer_group_size,
+    max_wait=settings.transfer_group_wait_ms / 1000,
+    tickets_kept=settings.transfer_tickets_kept,
+)
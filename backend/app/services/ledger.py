@@ -0,0 +1,206 @@
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.balance_cache import CachedBalance, balance_cache
+from app.models.account import Account as AccountModel
+from app.models.ledger import BalanceCheckpoint, LedgerEntry
+from app.services.rollups import roll_up
+
+# (balance, ledger_count) of an account right after its postings
+Position = Tuple[Decimal, int]
+
+# First entry of an account that predates the ledger (migration 0003): its
+# balance is known from that moment on, its history before it is not
+CARRIED_OVER = "carried_over"
+
+
+class Posting(NamedTuple):
+    account_id: int
+    amount: Decimal  # signed
+    kind: str  # opening | carried_over | deposit | withdrawal | adjustment | transfer_out | transfer_in
+    transfer_id: Optional[int] = None
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+def change_balance(db: Session, account_id: int, amount: Decimal, guard: bool = False) -> Optional[Position]:
+    """``balance += amount`` and count one more ledger entry for the account.
+
+    With ``guard`` the update only applies if the balance stays non-negative.
+    Returns the account's position after the update, or None when the
+    account does not exist or the guard refused it. The new balance is
+    staged in the balance cache for when the transaction ends.
+    """
+    stmt = update(AccountModel).where(AccountModel.id == account_id)
+    if guard:
+        stmt = stmt.where(AccountModel.balance + amount >= 0)
+    stmt = stmt.values(
+        balance=AccountModel.balance + amount,
+        ledger_count=AccountModel.ledger_count + 1,
+    ).returning(AccountModel.balance, AccountModel.ledger_count, AccountModel.customer_id)
+    row = db.execute(stmt).first()
+    if row is None:
+        return None
+    balance_cache.stage(db, account_id, CachedBalance(row.customer_id, row.balance))
+    return row.balance, row.ledger_count
+
+
+def _append(conn, postings, positions: Dict[int, Position]) -> None:
+    # ``conn`` is a Session or a Connection; both run Core statements alike
+    now = datetime.now(timezone.utc)
+    ids = conn.execute(
+        insert(LedgerEntry).returning(LedgerEntry.id, sort_by_parameter_order=True),
+        [
+            {
+                "account_id": p.account_id,
+                "amount": p.amount,
+                "kind": p.kind,
+                "transfer_id": p.transfer_id,
+                "created_at": now,
+            }
+            for p in postings
+        ],
+    ).scalars().all()
+
+    last_seq, posted = {}, Counter()
+    for p, seq in zip(postings, ids):
+        last_seq[p.account_id] = seq
+        posted[p.account_id] += 1
+
+    # Checkpoint an account whenever its entry count crosses a multiple of the interval
+    interval = settings.ledger_checkpoint_interval
+    checkpoints = [
+        {"account_id": acc_id, "seq": seq, "balance": positions[acc_id][0], "created_at": now}
+        for acc_id, seq in last_seq.items()
+        if acc_id in positions
+        and positions[acc_id][1] // interval > (positions[acc_id][1] - posted[acc_id]) // interval
+    ]
+    if checkpoints:
+        conn.execute(insert(BalanceCheckpoint), checkpoints)
+    roll_up(conn, postings, positions, now.date())
+
+
+def record(db: Session, postings: Iterable[Posting], positions: Dict[int, Position]) -> None:
+    """Append ledger entries for balance changes already applied in this transaction.
+
+    ``positions`` holds each touched account's position after all of
+    ``postings``; accounts that cross a checkpoint boundary get a
+    checkpoint at their last new entry. Accounts without a position
+    (credits to a stripe) are checkpointed when their stripes are folded.
+    Each account's daily rollup is updated too.
+    """
+    postings = list(postings)
+    if postings:
+        _append(db, postings, positions)
+
+
+def post(db: Session, account_id: int, amount: Decimal, kind: str, guard: bool = False) -> Optional[Decimal]:
+    """Apply one balance change with its ledger entry; returns the new balance.
+
+    None when the account is missing or ``guard`` refused an overdraft.
+    Does not commit.
+    """
+    position = change_balance(db, account_id, amount, guard=guard)
+    if position is None:
+        return None
+    record(db, [Posting(account_id, amount, kind)], {account_id: position})
+    return position[0]
+
+
+# New accounts start their ledger with an opening entry for the initial balance
+@event.listens_for(AccountModel, "before_insert")
+def _count_opening_entry(mapper, connection, target):
+    target.ledger_count = 1
+
+
+@event.listens_for(AccountModel, "after_insert")
+def _post_opening_entry(mapper, connection, target):
+    balance = target.balance or Decimal(0)
+    _append(connection, [Posting(target.id, balance, "opening")], {target.id: (balance, 1)})
+    # the first read fills the cache with the stored value
+    balance_cache.stage(Session.object_session(target), target.id, None)
+
+
+@event.listens_for(AccountModel, "after_update")
+def _restage_balance(mapper, connection, target):
+    # ORM attribute writes (acc.balance = ...) bypass change_balance
+    if inspect(target).attrs.balance.history.has_changes() or inspect(target).attrs.customer_id.history.has_changes():
+        balance_cache.stage(Session.object_session(target), target.id, None)
+
+
+@event.listens_for(AccountModel, "before_delete")
+def _forget_balance(mapper, connection, target):
+    # the ledger itself is kept: account ids are never reused (AUTOINCREMENT on SQLite)
+    balance_cache.stage(Session.object_session(target), target.id, None)
+
+
+# -------------------------------------------------
+# Point-in-time balances
+# -------------------------------------------------
+def as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def checkpoint_stmt(account_id: int, as_of: datetime):
+    """Newest checkpoint of the account taken at or before ``as_of``."""
+    return (
+        select(BalanceCheckpoint.seq, BalanceCheckpoint.balance, BalanceCheckpoint.created_at)
+        .where(BalanceCheckpoint.account_id == account_id, BalanceCheckpoint.created_at <= as_utc(as_of))
+        .order_by(BalanceCheckpoint.created_at.desc(), BalanceCheckpoint.seq.desc())
+        .limit(1)
+    )
+
+
+def replay_stmt(account_id: int, as_of: datetime, checkpoint=None):
+    """Sum of the account's entries after ``checkpoint`` up to ``as_of``.
+
+    Bounded on both sides of ix_ledger_entries_account_time, so it reads at
+    most the entries between two consecutive checkpoints.
+    """
+    stmt = select(func.coalesce(func.sum(LedgerEntry.amount), 0)).where(
+        LedgerEntry.account_id == account_id,
+        LedgerEntry.created_at <= as_utc(as_of),
+    )
+    if checkpoint is not None:
+        stmt = stmt.where(
+            LedgerEntry.created_at >= checkpoint.created_at,
+            LedgerEntry.id > checkpoint.seq,
+        )
+    return stmt
+
+
+def ledger_start_stmt(account_id: int):
+    """The account's first ledger entry."""
+    return (
+        select(LedgerEntry.kind, LedgerEntry.created_at)
+        .where(LedgerEntry.account_id == account_id)
+        .order_by(LedgerEntry.created_at, LedgerEntry.id)
+        .limit(1)
+    )
+
+
+def balance_as_of(db: Session, account_id: int, as_of: datetime) -> Decimal:
+    """Balance of an account at ``as_of``: the newest checkpoint at or before
+    it plus the entries posted since, so the cost does not grow with the
+    account's history.
+
+    Raises 422 for a moment before the ledger of an account that predates
+    it, rather than answering 0.
+    """
+    checkpoint = db.execute(checkpoint_stmt(account_id, as_of)).first()
+    if checkpoint is None:
+        start = db.execute(ledger_start_stmt(account_id)).first()
+        if start is not None and start.kind == CARRIED_OVER and as_utc(as_of) < as_utc(start.created_at):
+            raise HTTPException(422, f"Account history starts at {as_utc(start.created_at).isoformat()}")
+    base = checkpoint.balance if checkpoint is not None else Decimal(0)
+    return base + Decimal(db.execute(replay_stmt(account_id, as_of, checkpoint)).scalar_one())
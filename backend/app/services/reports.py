@@ -0,0 +1,142 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import List, Sequence
+
+from sqlalchemy import case, func, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from app.models.account import Account as AccountModel, AccountStripe
+from app.models.transfer import Transfer as TransferModel
+from app.services.rollups import Granularity, ZERO, period_of, periods, utc_day
+from app.services.stripes import total_balance
+
+# Bank-wide reports for staff dashboards. Each is one aggregate statement;
+# the router serves them through report_cache, so the tables are scanned
+# once per refresh rather than once per dashboard view.
+
+DEFAULT_BALANCE_EDGES = (Decimal(100), Decimal(1000), Decimal(10_000), Decimal(100_000), Decimal(1_000_000))
+
+
+def compute(sessions, report, *args) -> dict:
+    """Run ``report(db, *args)`` on a session from ``sessions`` and stamp the result.
+
+    Reports tolerate replica lag; they are already up to REPORT_CACHE_TTL old.
+    """
+    with sessions() as db:
+        result = report(db, *args)
+    result["generated_at"] = datetime.now(timezone.utc)
+    return result
+
+
+def _money(value) -> Decimal:
+    return Decimal(value or 0).quantize(ZERO)
+
+
+def _created_between(start: date, end: date):
+    # whole UTC days, ``end`` inclusive
+    since = datetime.combine(start, time.min, tzinfo=timezone.utc)
+    until = datetime.combine(end + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    return TransferModel.created_at >= since, TransferModel.created_at < until
+
+
+# -------------------------------------------------
+# Reports
+# -------------------------------------------------
+def deposits(db: Session) -> dict:
+    """Money held across all accounts, stripes included."""
+    stripes = select(func.coalesce(func.sum(AccountStripe.balance), 0)).scalar_subquery()
+    accounts, customers, total = db.execute(
+        select(
+            func.count(AccountModel.id),
+            func.count(func.distinct(AccountModel.customer_id)),
+            type_coerce(func.coalesce(func.sum(AccountModel.balance), 0) + stripes, AccountModel.balance.type),
+        )
+    ).one()
+    return {"accounts": accounts, "customers": customers, "total_balance": _money(total)}
+
+
+def transfer_volume_stmt(db: Session, start: date, end: date):
+    """Transfers per UTC day in the range; a range scan of ix_transfers_created_at."""
+    day = utc_day(TransferModel.created_at, db)
+    return (
+        select(day, func.count(TransferModel.id), func.sum(TransferModel.amount))
+        .where(*_created_between(start, end))
+        .group_by(day)
+    )
+
+
+def transfer_volume(db: Session, start: date, end: date, granularity: Granularity) -> dict:
+    """Transfer count and amount per day or month, empty periods included."""
+    rows = db.execute(transfer_volume_stmt(db, start, end)).all()
+
+    volume = {period: {"period": period, "transfers": 0, "amount": ZERO} for period in periods(start, end, granularity)}
+    for day, count, amount in rows:
+        totals = volume[period_of(day, granularity)]
+        totals["transfers"] += count
+        totals["amount"] += _money(amount)
+    return {"granularity": granularity, "from": start, "to": end, "periods": list(volume.values())}
+
+
+def top_by_balance(db: Session, limit: int) -> dict:
+    balance = total_balance()
+    rows = db.execute(
+        select(AccountModel.id, AccountModel.customer_id, balance)
+        .order_by(balance.desc(), AccountModel.id)
+        .limit(limit)
+    ).all()
+    return {
+        "by": "balance",
+        "items": [{"account_id": a, "customer_id": c, "value": _money(v)} for a, c, v in rows],
+    }
+
+
+def top_by_volume_stmt(limit: int, start: date, end: date):
+    """Both legs of the range's transfers, each read off ix_transfers_created_at."""
+    window = _created_between(start, end)
+    legs = union_all(
+        select(TransferModel.from_account_id.label("account_id"), TransferModel.amount).where(*window),
+        select(TransferModel.to_account_id.label("account_id"), TransferModel.amount).where(*window),
+    ).subquery()
+    volume = type_coerce(func.sum(legs.c.amount), TransferModel.amount.type).label("volume")
+    return (
+        select(legs.c.account_id, AccountModel.customer_id, volume, func.count())
+        .join(AccountModel, AccountModel.id == legs.c.account_id)
+        .group_by(legs.c.account_id, AccountModel.customer_id)
+        .order_by(volume.desc(), legs.c.account_id)
+        .limit(limit)
+    )
+
+
+def top_by_volume(db: Session, limit: int, start: date, end: date) -> dict:
+    """Accounts moving the most money in transfers, either side, within the range."""
+    rows = db.execute(top_by_volume_stmt(limit, start, end)).all()
+    return {
+        "by": "volume",
+        "from": start,
+        "to": end,
+        "items": [
+            {"account_id": a, "customer_id": c, "value": _money(v), "transfers": n} for a, c, v, n in rows
+        ],
+    }
+
+
+def balance_histogram(db: Session, edges: Sequence[Decimal]) -> dict:
+    """Accounts per balance bucket; bucket n holds ``edges[n-1] <= balance < edges[n]``."""
+    balances = select(total_balance()).subquery()
+    bucket = case(
+        *((balances.c.balance < edge, n) for n, edge in enumerate(edges)), else_=len(edges)
+    ).label("bucket")
+    rows = db.execute(select(bucket, func.count(), func.sum(balances.c.balance)).group_by(bucket)).all()
+    counted = {n: (count, total) for n, count, total in rows}
+
+    bounds: List = [None, *edges, None]
+    buckets = []
+    for n in range(len(edges) + 1):
+        count, total = counted.get(n, (0, 0))
+        buckets.append({
+            "min": bounds[n],
+            "max": bounds[n + 1],
+            "accounts": count,
+            "total_balance": _money(total),
+        })
+    return {"buckets": buckets}
@@ -0,0 +1,171 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Date, case, cast, delete, event, func, insert, literal, select, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.account import Account as AccountModel
+from app.models.ledger import DailyAccountRollup, LedgerEntry
+
+# Credits to a striped account land on one of these slots at random, so
+# concurrent credits to a hot account do not all queue on one rollup row.
+ROLLUP_SLOTS = 16
+
+# Longest range a summary or report may cover (ten years of days)
+MAX_SUMMARY_DAYS = 3660
+
+TOTALS = ("money_in", "money_out", "transfers_in", "transfers_out")
+
+Granularity = Literal["day", "month"]
+
+ZERO = Decimal("0.00")
+
+
+def _dialect(conn) -> str:
+    # ``conn`` is a Session or a Connection
+    bind = conn.get_bind() if isinstance(conn, Session) else conn
+    return bind.dialect.name
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+def roll_up(conn, postings: Iterable, positions: Dict, day: date) -> None:
+    """Add ``postings``, all posted on ``day`` (UTC), to their accounts' rollups.
+
+    Called by the ledger in the transaction that appends the entries. Each
+    account gets one upsert, on slot 0 unless it is a striped credit
+    (an account without a position).
+    """
+    rows = {}
+    for p in postings:
+        row = rows.get(p.account_id)
+        if row is None:
+            slot = 0 if p.account_id in positions else random.randint(1, ROLLUP_SLOTS)
+            row = rows[p.account_id] = {
+                "account_id": p.account_id, "day": day, "slot": slot,
+                "money_in": Decimal(0), "money_out": Decimal(0), "transfers_in": 0, "transfers_out": 0,
+            }
+        if p.amount >= 0:
+            row["money_in"] += p.amount
+        else:
+            row["money_out"] -= p.amount
+        if p.kind == "transfer_in":
+            row["transfers_in"] += 1
+        elif p.kind == "transfer_out":
+            row["transfers_out"] += 1
+
+    upsert = (postgresql.insert if _dialect(conn) == "postgresql" else sqlite.insert)(DailyAccountRollup)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["account_id", "day", "slot"],
+        set_={name: getattr(DailyAccountRollup, name) + getattr(upsert.excluded, name) for name in TOTALS},
+    )
+    # in account order, like the row locks, so concurrent writers cannot deadlock
+    conn.execute(upsert, [rows[acc_id] for acc_id in sorted(rows)])
+
+
+@event.listens_for(AccountModel, "before_delete")
+def _drop_rollups(mapper, connection, target):
+    # ON DELETE CASCADE is not enforced on SQLite
+    connection.execute(delete(DailyAccountRollup).where(DailyAccountRollup.account_id == target.id))
+
+
+def utc_day(column, conn):
+    """SQL expression for the UTC calendar day of a timestamp ``column``."""
+    if _dialect(conn) == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return type_coerce(func.date(column), Date)  # SQLite stores the UTC wall time
+
+
+def rebuild(db: Session, account_id: Optional[int] = None) -> int:
+    """Recompute rollups from the ledger, for every account or just one.
+
+    Replaces the existing rows with one aggregate INSERT ... SELECT and
+    returns how many rows it wrote. Does not commit.
+    """
+    day = utc_day(LedgerEntry.created_at, db)
+    totals = (
+        select(
+            LedgerEntry.account_id,
+            day,
+            literal(0),
+            func.sum(case((LedgerEntry.amount > 0, LedgerEntry.amount), else_=0)),
+            func.sum(case((LedgerEntry.amount < 0, -LedgerEntry.amount), else_=0)),
+            func.sum(case((LedgerEntry.kind == "transfer_in", 1), else_=0)),
+            func.sum(case((LedgerEntry.kind == "transfer_out", 1), else_=0)),
+        )
+        .where(LedgerEntry.account_id.in_(select(AccountModel.id)))  # not deleted accounts' entries
+        .group_by(LedgerEntry.account_id, day)
+    )
+    clear = delete(DailyAccountRollup)
+    if account_id is not None:
+        totals = totals.where(LedgerEntry.account_id == account_id)
+        clear = clear.where(DailyAccountRollup.account_id == account_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(DailyAccountRollup).from_select(["account_id", "day", "slot", *TOTALS], totals)
+    )
+    return result.rowcount
+
+
+# -------------------------------------------------
+# Reading
+# -------------------------------------------------
+def day_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """Resolve optional ``from`` / ``to`` query dates: ``end`` defaults to
+    today (UTC) and ``start`` to 29 days before it. 422 on a bad range."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if end < start:
+        raise HTTPException(422, "'to' must not be before 'from'")
+    if (end - start).days >= MAX_SUMMARY_DAYS:
+        raise HTTPException(422, f"A range covers at most {MAX_SUMMARY_DAYS} days")
+    return start, end
+
+
+def period_of(day: date, granularity: Granularity) -> date:
+    return day if granularity == "day" else day.replace(day=1)
+
+
+def periods(start: date, end: date, granularity: Granularity) -> List[date]:
+    """First day of every period from the one holding ``start`` to ``end``."""
+    out, current = [], period_of(start, granularity)
+    while current <= end:
+        out.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        else:
+            current = (current + timedelta(days=32)).replace(day=1)
+    return out
+
+
+def summarize(db: Session, account_id: int, start: date, end: date, granularity: Granularity) -> List[dict]:
+    """Totals per day or month for ``start``..``end`` (inclusive), oldest first.
+
+    Reads at most one aggregated row per day of the range, however many
+    transfers those days hold; periods without activity come back as zeros.
+    """
+    rows = db.execute(
+        select(DailyAccountRollup.day, *(func.sum(getattr(DailyAccountRollup, name)) for name in TOTALS))
+        .where(
+            DailyAccountRollup.account_id == account_id,
+            DailyAccountRollup.day >= start,
+            DailyAccountRollup.day <= end,
+        )
+        .group_by(DailyAccountRollup.day)
+    ).all()
+
+    summary = {
+        period: {"period": period, "money_in": ZERO, "money_out": ZERO, "transfers_in": 0, "transfers_out": 0}
+        for period in periods(start, end, granularity)
+    }
+    for day, *values in rows:
+        totals = summary[period_of(day, granularity)]
+        for name, value in zip(TOTALS, values):
+            totals[name] += value
+    return list(summary.values())
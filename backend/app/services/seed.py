@@ -0,0 +1,34 @@
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+from app.models.customer import Customer
+from app.models.employee import Employee
+
+DEFAULT_ADMIN_EMAIL = "admin@bank.com"
+DEFAULT_ADMIN_PASSWORD = "Admin123!"
+
+SAMPLE_CUSTOMERS = [
+    {"id": 1, "name": "Arisha Barron"},
+    {"id": 2, "name": "Branden Gibson"},
+    {"id": 3, "name": "Rhonda Church"},
+    {"id": 4, "name": "Georgina Hazel"},
+]
+
+
+def seed_admin_employee(db: Session, email: str = DEFAULT_ADMIN_EMAIL, password: str = DEFAULT_ADMIN_PASSWORD) -> bool:
+    """Create the first admin if there are no employees yet. Returns True if it did."""
+    if db.scalar(select(exists().select_from(Employee))):
+        return False
+    db.add(Employee(email=email, hashed_password=hash_password(password), role="admin", is_active=True))
+    db.commit()
+    return True
+
+
+def seed_initial_customers(db: Session) -> bool:
+    """Add the sample customers to an empty customers table. Returns True if it did."""
+    if db.scalar(select(exists().select_from(Customer))):
+        return False
+    db.add_all(Customer(**c) for c in SAMPLE_CUSTOMERS)
+    db.commit()
+    return True
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from sqlalchemy import Numeric, bindparam, case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.ledger import LedgerEntry
+from app.models.transfer import Transfer as TransferModel
+from app.services.ledger import as_utc
+
+# Rows fetched per round trip (server-side cursor on Postgres)
+STATEMENT_BATCH_SIZE = 1000
+
+STATEMENT_COLUMNS = ("seq", "created_at", "kind", "amount", "balance", "transfer_id", "counterparty_account_id")
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def statement_stmt(account_id: int, opening: Decimal, start: Optional[datetime], end: Optional[datetime]):
+    """Ledger lines of one account in (start, end], oldest first.
+
+    The running balance is ``opening`` plus a cumulative SUM window over the
+    same (created_at, id) order the ix_ledger_entries_account_time index
+    returns, so the database does it in one pass without sorting.
+    """
+    running = func.sum(LedgerEntry.amount).over(
+        order_by=(LedgerEntry.created_at, LedgerEntry.id),
+        rows=(None, 0),
+    )
+    counterparty = case(
+        (TransferModel.from_account_id == account_id, TransferModel.to_account_id),
+        else_=TransferModel.from_account_id,
+    )
+    stmt = (
+        select(
+            LedgerEntry.id.label("seq"),
+            LedgerEntry.created_at,
+            LedgerEntry.kind,
+            LedgerEntry.amount,
+            (bindparam("opening", opening, type_=Numeric(12, 2)) + running).label("balance"),
+            LedgerEntry.transfer_id,
+            counterparty.label("counterparty_account_id"),
+        )
+        .outerjoin(TransferModel, TransferModel.id == LedgerEntry.transfer_id)
+        .where(LedgerEntry.account_id == account_id)
+        .order_by(LedgerEntry.created_at, LedgerEntry.id)
+    )
+    if start is not None:
+        stmt = stmt.where(LedgerEntry.created_at > as_utc(start))
+    if end is not None:
+        stmt = stmt.where(LedgerEntry.created_at <= as_utc(end))
+    return stmt
+
+
+def _values(row):
+    return (
+        row.seq,
+        row.created_at.isoformat(),
+        row.kind,
+        f"{row.amount:.2f}",
+        f"{Decimal(row.balance):.2f}",
+        row.transfer_id,
+        row.counterparty_account_id,
+    )
+
+
+def _csv_lines(partitions) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(STATEMENT_COLUMNS)
+    yield buffer.getvalue()
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_values(row) for row in rows)
+        yield buffer.getvalue()
+
+
+def _ndjson_lines(partitions) -> Iterator[str]:
+    for rows in partitions:
+        yield "".join(json.dumps(dict(zip(STATEMENT_COLUMNS, _values(row)))) + "\n" for row in rows)
+
+
+def stream_statement(
+    db: Session,
+    account_id: int,
+    opening: Decimal,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    fmt: str,
+) -> Iterator[str]:
+    """Yield the statement as CSV or NDJSON, one chunk per fetched batch.
+
+    Rows are never materialised as a whole: ``yield_per`` streams them from
+    the cursor, so memory stays flat however long the statement is.
+    """
+    result = db.execute(
+        statement_stmt(account_id, opening, start, end).execution_options(yield_per=STATEMENT_BATCH_SIZE)
+    )
+    try:
+        lines = _csv_lines if fmt == "csv" else _ndjson_lines
+        yield from lines(result.partitions())
+    finally:
+        result.close()
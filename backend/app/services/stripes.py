@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import random
+from decimal import Decimal
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, event, func, insert, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.balance_cache import CachedBalance, balance_cache
+from app.models.account import Account as AccountModel, AccountStripe
+from app.models.ledger import BalanceCheckpoint, LedgerEntry
+from app.services.ledger import Position
+
+log = logging.getLogger("app.stripes")
+
+# Striped accounts spread incoming transfer credits over ``stripe_count``
+# AccountStripe rows so concurrent credits do not all wait on the accounts
+# row. Every other change to a striped account folds the stripes back into
+# ``accounts.balance`` first, in the same transaction, so guards, returned
+# balances and ledger checkpoints always see the whole balance.
+#
+# Lock order, on databases with row locks: the accounts row, then stripes.
+# A credit holds the row FOR KEY SHARE (see lock_accounts) and updates one
+# stripe; a fold takes the row FOR UPDATE, so it waits for in-flight credits
+# and no new one starts until it commits.
+
+
+# -------------------------------------------------
+# Reading
+# -------------------------------------------------
+def total_balance():
+    """``accounts.balance`` plus any stripes, labelled ``balance``.
+
+    The stripe sum is a correlated subquery evaluated for striped accounts
+    only, so unstriped rows cost what a plain column read does.
+    """
+    stripes = (
+        select(func.coalesce(func.sum(AccountStripe.balance), 0))
+        .where(AccountStripe.account_id == AccountModel.id)
+        .scalar_subquery()
+    )
+    total = case((AccountModel.stripe_count > 0, AccountModel.balance + stripes), else_=AccountModel.balance)
+    return type_coerce(total, AccountModel.balance.type).label("balance")
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+def credit(db: Session, account_id: int, stripe_count: int, amount: Decimal) -> None:
+    """``amount`` onto a random stripe of a striped account.
+
+    There is no position to return: the account's total is not read, and
+    its ledger checkpoint is left to the next fold.
+    """
+    db.execute(
+        update(AccountStripe)
+        .where(AccountStripe.account_id == account_id, AccountStripe.stripe == random.randrange(stripe_count))
+        .values(balance=AccountStripe.balance + amount, ledger_count=AccountStripe.ledger_count + 1)
+    )
+    balance_cache.stage(db, account_id, None)
+
+
+def fold(db: Session, account_id: int) -> Optional[Position]:
+    """Move an account's stripes into its accounts row; returns the position
+    afterwards, or None if the account does not exist. Does not commit.
+
+    The accounts row is updated first (on SQLite that write takes the
+    database lock, so no credit lands between the sum and the reset).
+    """
+    db.execute(select(AccountModel.id).where(AccountModel.id == account_id).with_for_update())
+
+    def pending(column):
+        return select(func.coalesce(func.sum(column), 0)).where(AccountStripe.account_id == account_id)
+
+    row = db.execute(
+        update(AccountModel)
+        .where(AccountModel.id == account_id)
+        .values(
+            balance=AccountModel.balance + pending(AccountStripe.balance).scalar_subquery(),
+            ledger_count=AccountModel.ledger_count + pending(AccountStripe.ledger_count).scalar_subquery(),
+        )
+        .returning(AccountModel.balance, AccountModel.ledger_count, AccountModel.customer_id)
+    ).first()
+    if row is None:
+        return None
+    folded = db.execute(pending(AccountStripe.ledger_count)).scalar_one()
+    if folded:
+        db.execute(
+            update(AccountStripe).where(AccountStripe.account_id == account_id).values(balance=0, ledger_count=0)
+        )
+        _checkpoint(db, account_id, row.balance, row.ledger_count, folded)
+    balance_cache.stage(db, account_id, CachedBalance(row.customer_id, row.balance))
+    return row.balance, row.ledger_count
+
+
+def _checkpoint(db: Session, account_id: int, balance: Decimal, ledger_count: int, folded: int) -> None:
+    # Striped credits skip checkpoints; take the one they crossed, at the newest entry
+    interval = settings.ledger_checkpoint_interval
+    if ledger_count // interval == (ledger_count - folded) // interval:
+        return
+    last = db.execute(
+        select(LedgerEntry.id, LedgerEntry.created_at)
+        .where(LedgerEntry.account_id == account_id)
+        .order_by(LedgerEntry.id.desc())
+        .limit(1)
+    ).first()
+    db.execute(
+        insert(BalanceCheckpoint),
+        [{"account_id": account_id, "seq": last.id, "balance": balance, "created_at": last.created_at}],
+    )
+
+
+def set_stripes(db: Session, account_id: int, stripes: int) -> Optional[Position]:
+    """Stripe an account's credits over ``stripes`` rows (0 turns it off).
+
+    Folds first, so the balance carries over unchanged. Returns the
+    account's position, or None if it does not exist. Does not commit.
+    """
+    position = fold(db, account_id)
+    if position is None:
+        return None
+    db.execute(delete(AccountStripe).where(AccountStripe.account_id == account_id))
+    if stripes:
+        db.execute(
+            insert(AccountStripe),
+            [{"account_id": account_id, "stripe": n, "balance": 0, "ledger_count": 0} for n in range(stripes)],
+        )
+    db.execute(update(AccountModel).where(AccountModel.id == account_id).values(stripe_count=stripes))
+    return position
+
+
+@event.listens_for(AccountModel, "before_delete")
+def _drop_stripes(mapper, connection, target):
+    # ON DELETE CASCADE is not enforced on SQLite
+    connection.execute(delete(AccountStripe).where(AccountStripe.account_id == target.id))
+
+
+# -------------------------------------------------
+# Background folding
+# -------------------------------------------------
+def fold_pending(db: Session) -> int:
+    """Fold every account with credits on its stripes, one transaction each.
+
+    Returns how many accounts were folded.
+    """
+    account_ids = db.execute(
+        select(AccountStripe.account_id).where(AccountStripe.ledger_count > 0).distinct()
+    ).scalars().all()
+    for account_id in account_ids:
+        fold(db, account_id)
+        db.commit()
+    return len(account_ids)
+
+
+async def fold_forever(session_factory, interval: float) -> None:
+    def fold_once():
+        with session_factory() as db:
+            return fold_pending(db)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(fold_once)
+        except Exception:  # keep folding after a transient DB error
+            log.exception("stripe fold failed")
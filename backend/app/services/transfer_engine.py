@@ -0,0 +1,298 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.account import Account as AccountModel
+from app.models.transfer import Transfer as TransferModel
+from app.core.balance_cache import CachedBalance, balance_cache
+from app.services.ledger import Posting, change_balance, record
+from app.services.stripes import credit, fold
+
+
+# -------------------------------------------------
+# Locking
+# -------------------------------------------------
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+LOCK_CHUNK_SIZE = 5000
+
+
+def lock_accounts(db: Session, account_ids: Iterable[int], shared: Iterable[int] = ()) -> Dict[int, AccountModel]:
+    """Row-lock accounts in ascending id order and return them by id.
+
+    Every writer takes its locks in the same order, so two transfers between
+    the same pair of accounts can never wait on each other in a cycle.
+    Accounts in ``shared`` are only credited, and are locked FOR KEY SHARE:
+    enough to keep them from being deleted or folded, while concurrent
+    credits to a striped account proceed in parallel on its stripe rows.
+    SQLite has no row locks (FOR UPDATE is dropped); there the guarded
+    UPDATE in ``change_balance`` is what keeps balances consistent.
+    """
+    ids = sorted(set(account_ids))
+    shared = set(shared).intersection(ids)
+    # one statement per run of ids with the same lock mode
+    if shared and db.get_bind().dialect.name != "sqlite":
+        runs = [(key_share, list(run)) for key_share, run in groupby(ids, key=shared.__contains__)]
+    else:
+        runs = [(False, ids)]
+    accounts = {}
+    for key_share, run in runs:
+        for start in range(0, len(run), LOCK_CHUNK_SIZE):
+            stmt = (
+                select(AccountModel)
+                .where(AccountModel.id.in_(run[start:start + LOCK_CHUNK_SIZE]))
+                .order_by(AccountModel.id)
+                .with_for_update(read=key_share, key_share=key_share)
+                .execution_options(populate_existing=True)
+            )
+            accounts.update((acc.id, acc) for acc in db.execute(stmt).scalars())
+    return accounts
+
+
+# -------------------------------------------------
+# Transfer
+# -------------------------------------------------
+def precheck_transfer(db: Session, from_account_id: int, to_account_id: int, customer_id: Optional[int] = None) -> None:
+    """The 404/403/422 checks of ``execute_transfer``, without locks or writes.
+
+    For transfers applied later (the group commit queue); funds are only
+    known once the transfer runs.
+    """
+    owners = dict(db.execute(
+        select(AccountModel.id, AccountModel.customer_id)
+        .where(AccountModel.id.in_((from_account_id, to_account_id)))
+    ).all())
+    for acc_id in (from_account_id, to_account_id):
+        if acc_id not in owners:
+            raise HTTPException(status_code=404, detail=f"Account {acc_id} not found")
+
+    if customer_id is not None and owners[from_account_id] != customer_id:
+        raise HTTPException(
+            status_code=403,
+            detail="Customers can only transfer from their own accounts",
+        )
+
+    if from_account_id == to_account_id:
+        raise HTTPException(422, "Cannot transfer to same account")
+
+
+def execute_transfer(
+    db: Session,
+    from_account_id: int,
+    to_account_id: int,
+    amount: Decimal,
+    customer_id: Optional[int] = None,
+    commit: bool = True,
+) -> TransferModel:
+    """Move ``amount`` between two accounts in one transaction.
+
+    ``customer_id`` restricts the source account to that customer's own
+    accounts. Raises HTTPException (404/403/422/400) without side effects.
+    """
+    accounts = lock_accounts(db, (from_account_id, to_account_id), shared=(to_account_id,))
+    for acc_id in (from_account_id, to_account_id):
+        if acc_id not in accounts:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=f"Account {acc_id} not found")
+
+    if customer_id is not None and accounts[from_account_id].customer_id != customer_id:
+        db.rollback()
+        raise HTTPException(
+            status_code=403,
+            detail="Customers can only transfer from their own accounts",
+        )
+
+    if from_account_id == to_account_id:
+        db.rollback()
+        raise HTTPException(422, "Cannot transfer to same account")
+
+    if accounts[from_account_id].stripe_count:
+        fold(db, from_account_id)
+    positions = {from_account_id: change_balance(db, from_account_id, -amount, guard=True)}
+    if positions[from_account_id] is None:
+        db.rollback()
+        raise HTTPException(400, "Insufficient funds")
+    stripes = accounts[to_account_id].stripe_count
+    if stripes:
+        credit(db, to_account_id, stripes, amount)
+    else:
+        positions[to_account_id] = change_balance(db, to_account_id, amount)
+
+    # RETURNING hands back the stored row (amount at column scale, created_at
+    # as the database keeps it), so the response matches later reads
+    transfer = db.scalars(
+        insert(TransferModel)
+        .values(from_account_id=from_account_id, to_account_id=to_account_id, amount=amount)
+        .returning(TransferModel)
+    ).one()
+    record(
+        db,
+        [
+            Posting(from_account_id, -amount, "transfer_out", transfer.id),
+            Posting(to_account_id, amount, "transfer_in", transfer.id),
+        ],
+        positions,
+    )
+
+    if commit:
+        db.commit()
+
+    return transfer
+
+
+# -------------------------------------------------
+# Batch
+# -------------------------------------------------
+def _apply_chunk(db: Session, chunk) -> list:
+    """Apply validated transfers: net balance deltas, then bulk INSERTs of the
+    transfers and their ledger entries.
+
+    Deltas are written with the same non-negative guard as ``change_balance``
+    (in ascending id order), so a concurrent writer that drained an account
+    since it was read makes the chunk fail instead of overdrawing it.
+    Returns the new transfer ids, or None if a guard tripped.
+    """
+    deltas, entries = defaultdict(Decimal), Counter()
+    for item in chunk:
+        deltas[item.from_account_id] -= item.amount
+        deltas[item.to_account_id] += item.amount
+        entries[item.from_account_id] += 1
+        entries[item.to_account_id] += 1
+
+    accounts = AccountModel.__table__
+    params = [{"acc_id": acc_id, "delta": deltas[acc_id], "entries": n} for acc_id, n in sorted(entries.items())]
+    delta = bindparam("delta", type_=accounts.c.balance.type)
+    result = db.execute(
+        update(accounts)
+        .where(accounts.c.id == bindparam("acc_id"), accounts.c.balance + delta >= 0)
+        .values(
+            balance=accounts.c.balance + delta,
+            ledger_count=accounts.c.ledger_count + bindparam("entries"),
+        ),
+        params,
+    )
+    if db.get_bind().dialect.supports_sane_multi_rowcount and result.rowcount != len(params):
+        return None
+
+    ids = db.execute(
+        insert(TransferModel).returning(TransferModel.id, sort_by_parameter_order=True),
+        [
+            {
+                "from_account_id": item.from_account_id,
+                "to_account_id": item.to_account_id,
+                "amount": item.amount,
+            }
+            for item in chunk
+        ],
+    ).scalars().all()
+
+    touched = sorted(entries)
+    positions = {}
+    for start in range(0, len(touched), LOCK_CHUNK_SIZE):
+        for row in db.execute(
+            select(accounts.c.id, accounts.c.balance, accounts.c.ledger_count, accounts.c.customer_id)
+            .where(accounts.c.id.in_(touched[start:start + LOCK_CHUNK_SIZE]))
+        ):
+            positions[row.id] = (row.balance, row.ledger_count)
+            balance_cache.stage(db, row.id, CachedBalance(row.customer_id, row.balance))
+    record(
+        db,
+        (
+            posting
+            for item, transfer_id in zip(chunk, ids)
+            for posting in (
+                Posting(item.from_account_id, -item.amount, "transfer_out", transfer_id),
+                Posting(item.to_account_id, item.amount, "transfer_in", transfer_id),
+            )
+        ),
+        positions,
+    )
+    return ids
+
+
+def execute_batch(
+    db: Session,
+    items: List,
+    customer_id: Optional[int] = None,
+    atomic: bool = True,
+    chunk_size: int = 1000,
+    owners: Optional[Sequence[Optional[int]]] = None,
+) -> List[dict]:
+    """Run many transfers with one account load and bulk writes.
+
+    Every item is validated in memory against running balances. With
+    ``atomic`` any rejection (or a tripped guard) rolls back the whole batch
+    and nothing is applied; otherwise valid items are committed every
+    ``chunk_size`` items and rejected ones are reported (a chunk whose guard
+    trips is bisected, so only the items that trip it get 409). ``owners`` gives
+    each item its own ``customer_id`` restriction, for batches that mix
+    callers. Returns one result dict per item, in input order.
+    """
+    accounts = lock_accounts(db, {a for i in items for a in (i.from_account_id, i.to_account_id)})
+    balances = {acc_id: acc.balance for acc_id, acc in accounts.items()}
+    # batch writes go to the accounts rows, so striped accounts start folded
+    striped = sorted(acc_id for acc_id, acc in accounts.items() if acc.stripe_count)
+    for acc_id in striped:
+        balances[acc_id] = fold(db, acc_id)[0]
+
+    results = [{"index": n, "status": "rejected"} for n in range(len(items))]
+    accepted = []
+    for n, item in enumerate(items):
+        owner = owners[n] if owners is not None else customer_id
+        missing = next((a for a in (item.from_account_id, item.to_account_id) if a not in accounts), None)
+        if missing is not None:
+            results[n].update(status_code=404, detail=f"Account {missing} not found")
+        elif owner is not None and accounts[item.from_account_id].customer_id != owner:
+            results[n].update(status_code=403, detail="Customers can only transfer from their own accounts")
+        elif item.from_account_id == item.to_account_id:
+            results[n].update(status_code=422, detail="Cannot transfer to same account")
+        elif balances[item.from_account_id] < item.amount:
+            results[n].update(status_code=400, detail="Insufficient funds")
+        else:
+            balances[item.from_account_id] -= item.amount
+            balances[item.to_account_id] += item.amount
+            accepted.append(n)
+
+    def abort(reason):
+        db.rollback()
+        for n in accepted:
+            results[n] = {"index": n, "status": "skipped", "detail": reason}
+        return results
+
+    if atomic and len(accepted) != len(items):
+        return abort("Batch rejected: another item failed validation")
+
+    def apply(chunk, refold):
+        if refold:
+            # earlier chunks committed (or this one rolled back), so credits may have reached the stripes
+            for acc_id in striped:
+                fold(db, acc_id)
+        ids = _apply_chunk(db, [items[n] for n in chunk])
+        if ids is None:
+            if atomic:
+                return False
+            db.rollback()
+            if len(chunk) == 1:
+                results[chunk[0]].update(status_code=409, detail="Balance changed concurrently; retry")
+            else:
+                # bisect, so only the items whose guard trips are rejected
+                middle = len(chunk) // 2
+                apply(chunk[:middle], True)
+                apply(chunk[middle:], True)
+            return True
+        for n, transfer_id in zip(chunk, ids):
+            results[n].update(status="committed", transfer_id=transfer_id)
+        if not atomic:
+            db.commit()
+        return True
+
+    for start in range(0, len(accepted), chunk_size):
+        if not apply(accepted[start:start + chunk_size], bool(start) and not atomic):
+            return abort("Batch rejected: balance changed concurrently")
+
+    db.commit()
+    return results
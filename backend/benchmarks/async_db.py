@@ -0,0 +1,61 @@
+"""Sync vs async (DB_ASYNC) throughput and tail latency.
+
+Starts the API twice against the same seeded SQLite file -- once with the
+sync threadpool handlers and once with the async handlers -- and drives
+balance reads, history reads and transfers at each concurrency level::
+
+    python -m benchmarks.async_db --concurrency 50 200 1000 --duration 10
+"""
+import argparse
+import asyncio
+import json
+
+from benchmarks.common import login, print_table, run_load, seed_database, serve
+
+
+def make_mix(account_ids, write_ratio):
+    def make_request(rng):
+        roll = rng.random()
+        if roll < write_ratio:
+            src, dst = rng.sample(account_ids, 2)
+            return "POST", "/transfers/", {"json": {"from_account_id": src, "to_account_id": dst, "amount": "1.00"}}
+        acc = rng.choice(account_ids)
+        if roll < write_ratio + (1 - write_ratio) / 2:
+            return "GET", f"/accounts/{acc}/balance", {}
+        return "GET", f"/accounts/{acc}/transfers", {}
+    return make_request
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--db", default="sqlite:///./bench_async.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for mode, flag in (("sync", "0"), ("async", "1")):
+        account_ids = seed_database(args.db, accounts=args.accounts)
+        env = {"DATABASE_URL": args.db, "DB_ASYNC": flag, "ENV": "bench"}
+        with serve(env) as base_url:
+            token = login(base_url)
+            for concurrency in args.concurrency:
+                result = asyncio.run(run_load(
+                    base_url, concurrency, args.duration,
+                    make_mix(account_ids, args.write_ratio), token=token,
+                ))
+                rows.append({"mode": mode, **result.summary()})
+                print(f"{mode:5} c={concurrency}: {rows[-1]['rps']} req/s, p99 {rows[-1]['p99_ms']} ms")
+
+    print()
+    print_table(rows, ["mode", "concurrency", "requests", "rps", "p50_ms", "p99_ms", "error_rate"])
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
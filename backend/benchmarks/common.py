@@ -0,0 +1,179 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from ``backend/`` so ``app`` is importable, e.g.::
+
+    python -m benchmarks.async_db --help
+"""
+import asyncio
+import contextlib
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+BENCH_EMAIL = "bench@bank.com"
+BENCH_PASSWORD = "Bench123!"
+
+
+# -------------------------------------------------
+# Stats
+# -------------------------------------------------
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+@dataclass
+class LoadResult:
+    concurrency: int
+    duration: float
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self):
+        return len(self.latencies) + self.errors
+
+    def summary(self):
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "rps": round(self.requests / self.duration, 1) if self.duration else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+# -------------------------------------------------
+# Dataset
+# -------------------------------------------------
+def seed_database(url, accounts=1000, balance=1_000_000, seed=42):
+    """Create a fresh schema with one staff user and ``accounts`` funded accounts."""
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    from app.db import Base
+    from app.models import Account, Customer, Employee, LedgerEntry
+    from app.core.security import hash_password
+
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        db.add(Employee(email=BENCH_EMAIL, hashed_password=hash_password(BENCH_PASSWORD), role="admin"))
+        db.execute(
+            insert(Customer),
+            [{"id": i, "name": f"Bench {i}", "phone_number": f"5{i:09d}"} for i in range(1, accounts + 1)],
+        )
+        db.execute(
+            insert(Account),
+            [
+                {"id": i, "customer_id": rng.randint(1, accounts), "balance": balance, "ledger_count": 1}
+                for i in range(1, accounts + 1)
+            ],
+        )
+        # bulk inserts skip the ORM hook that posts opening entries
+        db.execute(
+            insert(LedgerEntry),
+            [{"account_id": i, "amount": balance, "kind": "opening"} for i in range(1, accounts + 1)],
+        )
+        db.commit()
+    engine.dispose()
+    return list(range(1, accounts + 1))
+
+
+# -------------------------------------------------
+# Server
+# -------------------------------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(env=None, port=None, timeout=30.0):
+    """Run ``app.main:app`` under uvicorn in a subprocess and yield its base URL."""
+    port = port or free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **(env or {})},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if httpx.get(base_url + "/").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("benchmark server failed to start")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def login(base_url):
+    res = httpx.post(base_url + "/auth/token", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+# -------------------------------------------------
+# Load generator
+# -------------------------------------------------
+async def run_load(base_url, concurrency, duration, make_request, token=None, transport=None):
+    """Drive ``concurrency`` closed-loop clients for ``duration`` seconds.
+
+    ``make_request(rng)`` returns ``(method, path, kwargs)`` for the next call.
+    Pass an ``httpx.ASGITransport`` as ``transport`` to call the app in-process.
+    """
+    result = LoadResult(concurrency=concurrency, duration=duration)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, limits=limits, timeout=60.0, transport=transport,
+    ) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker(n):
+            rng = random.Random(n)
+            while time.perf_counter() < stop_at:
+                method, path, kwargs = make_request(rng)
+                started = time.perf_counter()
+                try:
+                    res = await client.request(method, path, **kwargs)
+                    ok = res.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    result.latencies.append(time.perf_counter() - started)
+                else:
+                    result.errors += 1
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return result
+
+
+def print_table(rows, columns):
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,235 @@
+"""Mixed HTTP load test with a stored baseline.
+
+Seeds a SQLite file, drives each scenario against the real ``app.main:app``
+at every concurrency level and reports throughput, p50/p95/p99 latency and
+error rate::
+
+    python -m benchmarks.load --concurrency 10 50 --duration 10 --json results.json
+    python -m benchmarks.load --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load --baseline benchmarks/baseline.json
+
+With ``--baseline`` every (scenario, concurrency) pair is compared with the
+stored run and the script exits 1 if throughput dropped, tail latency grew
+or errors rose beyond ``--tolerance``. ``--transport asgi`` calls the app
+in-process through httpx instead of a uvicorn subprocess.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.common import BENCH_EMAIL, BENCH_PASSWORD, print_table, run_load, seed_database, serve
+
+ASGI_BASE_URL = "http://testserver"
+
+
+# -------------------------------------------------
+# Scenarios: account ids -> make_request(rng)
+# -------------------------------------------------
+def login_scenario(account_ids):
+    form = {"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    return lambda rng: ("POST", "/auth/token", {"data": form})
+
+
+def balance_scenario(account_ids):
+    return lambda rng: ("GET", f"/accounts/{rng.choice(account_ids)}/balance", {})
+
+
+def transfer_scenario(account_ids):
+    def make_request(rng):
+        src, dst = rng.sample(account_ids, 2)
+        return "POST", "/transfers/", {"json": {"from_account_id": src, "to_account_id": dst, "amount": "1.00"}}
+    return make_request
+
+
+def history_scenario(account_ids):
+    return lambda rng: ("GET", f"/accounts/{rng.choice(account_ids)}/transfers", {"params": {"limit": 20}})
+
+
+def list_scenario(account_ids):
+    paths = ("/accounts/", "/transfers/", "/customers/")
+    return lambda rng: ("GET", rng.choice(paths), {"params": {"limit": 50}})
+
+
+def mixed_scenario(account_ids):
+    """Read-heavy traffic: 45% balances, 25% history, 15% transfers, 10% lists, 5% logins."""
+    weighted = [
+        (0.45, balance_scenario(account_ids)),
+        (0.25, history_scenario(account_ids)),
+        (0.15, transfer_scenario(account_ids)),
+        (0.10, list_scenario(account_ids)),
+        (0.05, login_scenario(account_ids)),
+    ]
+
+    def make_request(rng):
+        roll = rng.random()
+        for weight, make in weighted:
+            if roll < weight:
+                return make(rng)
+            roll -= weight
+        return weighted[0][1](rng)
+    return make_request
+
+
+SCENARIOS = {
+    "login": login_scenario,
+    "balance": balance_scenario,
+    "transfer": transfer_scenario,
+    "history": history_scenario,
+    "list": list_scenario,
+    "mixed": mixed_scenario,
+}
+
+
+# -------------------------------------------------
+# Running
+# -------------------------------------------------
+async def _login(base_url, transport=None):
+    async with httpx.AsyncClient(base_url=base_url, transport=transport) as client:
+        res = await client.post("/auth/token", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        res.raise_for_status()
+        return res.json()["access_token"]
+
+
+async def run_suite(base_url, scenarios, levels, duration, warmup, account_ids, transport=None):
+    token = await _login(base_url, transport)
+    results = []
+    for name in scenarios:
+        make_request = SCENARIOS[name](account_ids)
+        if warmup:
+            await run_load(base_url, min(levels), warmup, make_request, token=token, transport=transport)
+        for concurrency in levels:
+            result = await run_load(base_url, concurrency, duration, make_request, token=token, transport=transport)
+            results.append({"scenario": name, **result.summary()})
+            row = results[-1]
+            print(f"{name:8} c={concurrency}: {row['rps']} req/s, p99 {row['p99_ms']} ms, errors {row['error_rate']:.2%}")
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# -------------------------------------------------
+# Baseline comparison
+# -------------------------------------------------
+# (metric, +1 if higher is worse / -1 if lower is worse)
+COMPARED = (("rps", -1), ("p95_ms", 1), ("p99_ms", 1))
+# Error rates are compared in absolute terms
+ERROR_RATE_SLACK = 0.01
+
+
+def compare(results, baseline, tolerance):
+    """Rows of relative changes against ``baseline`` and the regressions found.
+
+    A regression is a compared metric that got worse by more than
+    ``tolerance`` (a fraction), or an error rate more than one percentage
+    point above the baseline's.
+    """
+    stored = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    rows, regressions = [], []
+    for current in results:
+        before = stored.get((current["scenario"], current["concurrency"]))
+        if before is None:
+            continue
+        row = {"scenario": current["scenario"], "concurrency": current["concurrency"]}
+        for metric, worse in COMPARED:
+            change = (current[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            row[metric] = f"{before[metric]} -> {current[metric]} ({change:+.1%})"
+            if change * worse > tolerance:
+                regressions.append(f"{current['scenario']} c={current['concurrency']}: {metric} {change:+.1%}")
+        row["error_rate"] = f"{before['error_rate']} -> {current['error_rate']}"
+        if current["error_rate"] > before["error_rate"] + ERROR_RATE_SLACK:
+            regressions.append(
+                f"{current['scenario']} c={current['concurrency']}: "
+                f"error rate {before['error_rate']:.2%} -> {current['error_rate']:.2%}"
+            )
+        rows.append(row)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario and concurrency level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unrecorded seconds before each scenario")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42, help="dataset seed")
+    parser.add_argument("--transport", choices=("uvicorn", "asgi"), default="uvicorn")
+    parser.add_argument("--db", default="sqlite:///./bench_load.db")
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--baseline", help="compare with this results file; exit 1 on regression")
+    parser.add_argument("--save-baseline", help="write results to this file as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative slowdown (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    env = {"DATABASE_URL": args.db, "ENV": "bench"}
+    if args.transport == "asgi":
+        # settings are read on the first ``app`` import, which seeding does
+        os.environ.update(env)
+    account_ids = seed_database(args.db, accounts=args.accounts, seed=args.seed)
+    suite = dict(
+        scenarios=args.scenarios, levels=args.concurrency, duration=args.duration,
+        warmup=args.warmup, account_ids=account_ids,
+    )
+    if args.transport == "asgi":
+        from app.main import app
+
+        results = asyncio.run(run_suite(ASGI_BASE_URL, transport=httpx.ASGITransport(app=app), **suite))
+    else:
+        with serve(env) as base_url:
+            results = asyncio.run(run_suite(base_url, **suite))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "transport": args.transport,
+            "accounts": args.accounts,
+            "seed": args.seed,
+            "duration": args.duration,
+        },
+        "results": results,
+    }
+
+    print()
+    print_table(results, ["scenario", "concurrency", "requests", "rps", "p50_ms", "p95_ms", "p99_ms", "error_rate"])
+    for path in filter(None, (args.json_path, args.save_baseline)):
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        rows, regressions = compare(results, baseline, args.tolerance)
+        if not rows:
+            print("\nno scenario / concurrency pair in common with the baseline")
+            return 0
+        if baseline["meta"].get("transport") != args.transport:
+            print(f"\nwarning: baseline was run with --transport {baseline['meta'].get('transport')}")
+        print()
+        print(f"vs baseline {baseline['meta'].get('commit') or args.baseline}:")
+        print_table(rows, ["scenario", "concurrency", "rps", "p95_ms", "p99_ms", "error_rate"])
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Cost of the metrics middleware.
+
+First times the middleware alone around a no-op ASGI app (microseconds
+added per request), then serves the API with METRICS_ENABLED=0 and =1 and
+compares throughput and latency on balance reads::
+
+    python -m benchmarks.metrics_overhead --calls 20000 --concurrency 50 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import login, print_table, run_load, seed_database, serve
+
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _time_calls(app, calls):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"content-length", b"0")]}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / calls
+
+
+def middleware_cost(calls):
+    from app.core.metrics import MetricsMiddleware
+
+    bare = asyncio.run(_time_calls(_noop_app, calls))
+    wrapped = asyncio.run(_time_calls(MetricsMiddleware(_noop_app), calls))
+    return {
+        "calls": calls,
+        "bare_us": round(bare * 1e6, 2),
+        "with_metrics_us": round(wrapped * 1e6, 2),
+        "overhead_us": round((wrapped - bare) * 1e6, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="in-process middleware calls")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per HTTP run (0 skips)")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--db", default="sqlite:///./bench_metrics.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    micro = middleware_cost(args.calls)
+    print_table([micro], ["calls", "bare_us", "with_metrics_us", "overhead_us"])
+
+    rows = []
+    if args.duration > 0:
+        account_ids = seed_database(args.db, accounts=args.accounts)
+
+        def make_request(rng):
+            return "GET", f"/accounts/{rng.choice(account_ids)}/balance", {}
+
+        for label, flag in (("off", "0"), ("on", "1")):
+            with serve({"DATABASE_URL": args.db, "METRICS_ENABLED": flag, "ENV": "bench"}) as base_url:
+                token = login(base_url)
+                result = asyncio.run(run_load(base_url, args.concurrency, args.duration, make_request, token=token))
+                rows.append({"metrics": label, **result.summary()})
+        print()
+        print_table(rows, ["metrics", "concurrency", "requests", "rps", "p50_ms", "p99_ms", "error_rate"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"middleware": micro, "http": rows}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
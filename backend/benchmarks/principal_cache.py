@@ -0,0 +1,82 @@
+"""DB statements per staff request with the principal cache on and off.
+
+Runs in-process through TestClient against a seeded SQLite file and counts
+every statement the engine executes::
+
+    python -m benchmarks.principal_cache --requests 500
+"""
+import argparse
+import json
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import BENCH_EMAIL, BENCH_PASSWORD, percentile, print_table, seed_database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--db", default="sqlite:///./bench_principal.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    from app.main import app
+    from app.db import get_db
+    from app.core.principal_cache import principal_cache
+
+    account_ids = seed_database(args.db, accounts=100)
+    engine = create_engine(args.db)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+    app.dependency_overrides[get_db] = _get_db
+    client = TestClient(app)
+    token = client.post("/auth/token", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD}).json()["access_token"]
+    client.headers.update({"Authorization": f"Bearer {token}"})
+
+    # staff endpoints that resolve the caller through get_current_user
+    calls = [
+        ("GET", "/customers/?limit=10", {}),
+        ("GET", "/transfers/?limit=10", {}),
+        ("POST", f"/accounts/{account_ids[0]}/deposit", {"params": {"amount": "1.00"}}),
+    ]
+
+    rows = []
+    for label, ttl in (("off", 0), ("on", 60)):
+        principal_cache.ttl = ttl
+        principal_cache.clear()
+        latencies = []
+        statements.clear()
+        for n in range(args.requests):
+            method, path, kwargs = calls[n % len(calls)]
+            started = time.perf_counter()
+            client.request(method, path, **kwargs).raise_for_status()
+            latencies.append(time.perf_counter() - started)
+        rows.append({
+            "cache": label,
+            "requests": args.requests,
+            "queries_per_request": round(len(statements) / args.requests, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        })
+
+    app.dependency_overrides.clear()
+    print_table(rows, ["cache", "requests", "queries_per_request", "p50_ms", "p99_ms"])
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
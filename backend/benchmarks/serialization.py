@@ -0,0 +1,167 @@
+"""CPU time and peak memory of building large list responses.
+
+Builds 100k-row account, transfer and history payloads from a seeded SQLite
+file two ways -- ORM entities + response_model validation / hand-built
+dicts + stdlib JSON (before), and column rows + FastJSONResponse (after)::
+
+    python -m benchmarks.serialization --rows 100000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from benchmarks.common import print_table
+
+
+def seed(url, rows):
+    from app.db import Base
+    from app.models import Account, Customer, Transfer
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as db:
+        db.execute(insert(Customer), [{"id": 1, "name": "Bench", "phone_number": "5000000001"}])
+        db.execute(
+            insert(Account),
+            [{"id": i, "customer_id": 1, "balance": 1000 + i, "ledger_count": 1} for i in range(1, rows + 1)],
+        )
+        # every transfer touches account 1, so its history is ``rows`` long
+        db.execute(
+            insert(Transfer),
+            [
+                {"from_account_id": 1, "to_account_id": 2 + i % (rows - 1), "amount": "12.34",
+                 "created_at": start + timedelta(seconds=i)}
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+    return engine
+
+
+def cases(rows):
+    from app.models import Account, Transfer
+    from app.routers.accounts import accounts_page, accounts_page_stmt, account_transfers_stmt, transfer_history_page
+    from app.routers.transfers import TRANSFER_COLUMNS
+    from app.core.pagination import paginate
+    from app.core.responses import FastJSONResponse
+    from app.schemas.account import AccountOut
+    from app.schemas.pagination import Page
+    from app.schemas.transfer import Transfer as TransferSchema
+
+    accounts_schema = TypeAdapter(Page[AccountOut])
+    transfers_schema = TypeAdapter(Page[TransferSchema])
+
+    def validated(schema, items, next_cursor):
+        # what FastAPI does with response_model + the default JSONResponse
+        page = schema.validate_python({"items": items, "next_cursor": next_cursor}, from_attributes=True)
+        return JSONResponse(jsonable_encoder(schema.dump_python(page, mode="json"))).body
+
+    def accounts_before(db):
+        entities = db.execute(select(Account).order_by(Account.id).limit(rows + 1)).scalars().all()
+        items, next_cursor = paginate(entities, rows, lambda a: (a.id,))
+        return validated(accounts_schema, items, next_cursor)
+
+    def accounts_after(db):
+        return accounts_page(db.execute(accounts_page_stmt(None, None, rows)).all(), rows).body
+
+    def transfers_before(db):
+        stmt = select(Transfer).order_by(Transfer.created_at.desc(), Transfer.id.desc()).limit(rows + 1)
+        items, next_cursor = paginate(db.execute(stmt).scalars().all(), rows, lambda t: (t.created_at, t.id))
+        return validated(transfers_schema, items, next_cursor)
+
+    def transfers_after(db):
+        stmt = select(*TRANSFER_COLUMNS).order_by(Transfer.created_at.desc(), Transfer.id.desc()).limit(rows + 1)
+        items, next_cursor = paginate(db.execute(stmt).all(), rows, lambda t: (t.created_at, t.id))
+        return FastJSONResponse({"items": [row._asdict() for row in items], "next_cursor": next_cursor}).body
+
+    def history_before(db):
+        # the previous account_transfers_stmt selected the whole entity
+        history = aliased(Transfer, account_transfers_stmt(1, None, rows).get_final_froms()[0])
+        stmt = select(history).order_by(history.created_at.desc(), history.id.desc()).limit(rows + 1)
+        entities, _ = paginate(db.execute(stmt).scalars().all(), rows, lambda t: (t.created_at, t.id))
+        return JSONResponse({
+            "items": [
+                {
+                    "id": t.id,
+                    "from_account_id": t.from_account_id,
+                    "to_account_id": t.to_account_id,
+                    "amount": float(t.amount),
+                    "direction": "outgoing" if t.from_account_id == 1 else "incoming",
+                    "created_at": t.created_at.isoformat(),
+                }
+                for t in entities
+            ],
+            "next_cursor": None,
+        }).body
+
+    def history_after(db):
+        return transfer_history_page(db.execute(account_transfers_stmt(1, None, rows)).all(), 1, rows).body
+
+    return [
+        ("accounts", "before", accounts_before), ("accounts", "after", accounts_after),
+        ("transfers", "before", transfers_before), ("transfers", "after", transfers_after),
+        ("history", "before", history_before), ("history", "after", history_after),
+    ]
+
+
+def measure(engine, build, repeat):
+    cpu = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            gc.collect()
+            started = time.process_time()
+            body = build(db)
+            cpu.append(time.process_time() - started)
+
+    with Session(engine) as db:
+        gc.collect()
+        tracemalloc.start()
+        build(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return min(cpu), peak, len(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="CPU time is the best of this many runs")
+    parser.add_argument("--db", default="sqlite:///./bench_serialization.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    engine = seed(args.db, args.rows)
+    rows = []
+    for endpoint, variant, build in cases(args.rows):
+        cpu, peak, size = measure(engine, build, args.repeat)
+        rows.append({
+            "endpoint": endpoint,
+            "variant": variant,
+            "rows": args.rows,
+            "cpu_ms": round(cpu * 1000, 1),
+            "peak_mib": round(peak / 2**20, 1),
+            "body_mib": round(size / 2**20, 1),
+        })
+        print(f"{endpoint:9} {variant:6}: {rows[-1]['cpu_ms']} ms CPU, peak {rows[-1]['peak_mib']} MiB")
+    engine.dispose()
+
+    print()
+    print_table(rows, ["endpoint", "variant", "rows", "cpu_ms", "peak_mib", "body_mib"])
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
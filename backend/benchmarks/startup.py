@@ -0,0 +1,96 @@
+"""Time from process start to the first served request.
+
+Spawns ``uvicorn app.main:app`` repeatedly and polls ``GET /`` until it
+answers, for the default boot (create_all + seeding, on a fresh and on an
+already initialised database) and for ``FAST_START``::
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import free_port, percentile, print_table, seed_database
+
+POLL_INTERVAL = 0.005
+
+
+def time_to_first_request(env, timeout=60.0):
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            while True:
+                try:
+                    if client.get("/").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None or time.perf_counter() - started > timeout:
+                    raise RuntimeError("server failed to start")
+                time.sleep(POLL_INTERVAL)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def _remove_sqlite(url):
+    path = url.removeprefix("sqlite:///")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--db", default="sqlite:///./bench_startup.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    env = {"DATABASE_URL": args.db, "ENV": "bench"}
+    modes = [
+        # (label, extra env, reset the database before each run)
+        ("default, fresh db", {"FAST_START": "false"}, True),
+        ("default, existing db", {"FAST_START": "false"}, False),
+        ("fast start", {"FAST_START": "true"}, False),
+    ]
+
+    rows = []
+    for label, extra, fresh in modes:
+        timings = []
+        for _ in range(args.runs):
+            if fresh:
+                _remove_sqlite(args.db)
+            elif not timings:
+                seed_database(args.db, accounts=10)
+            timings.append(time_to_first_request({**env, **extra}))
+        rows.append({
+            "mode": label,
+            "runs": args.runs,
+            "p50_ms": round(percentile(timings, 50) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "max_ms": round(max(timings) * 1000, 1),
+        })
+        print(f"{label}: p50 {rows[-1]['p50_ms']} ms")
+    _remove_sqlite(args.db)
+
+    print()
+    print_table(rows, ["mode", "runs", "p50_ms", "min_ms", "max_ms"])
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Transfer throughput into one hot account as its stripe count grows.
+
+Seeds a database, then ``--concurrency`` threads run ``execute_transfer``
+from random accounts into account 1 for ``--duration`` seconds, once per
+stripe count, with the fold job running alongside. After each run the sum
+of all balances is checked against the seeded total::
+
+    python -m benchmarks.stripes --stripes 0 1 4 16 --concurrency 32
+    python -m benchmarks.stripes --db postgresql+psycopg://bench@localhost/bench
+
+Striping removes contention on the hot account's row lock, so the effect
+shows on databases with row locks (PostgreSQL); SQLite serialises every
+writer on its database lock whatever the stripe count.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+
+from benchmarks.common import percentile, print_table, seed_database
+
+HOT_ACCOUNT = 1
+SEED_BALANCE = 1_000_000
+
+
+def run(session_factory, stripes, account_ids, concurrency, duration, fold_interval):
+    from app.services.stripes import fold_pending, set_stripes
+    from app.services.transfer_engine import execute_transfer
+
+    with session_factory() as db:
+        set_stripes(db, HOT_ACCOUNT, stripes)
+        db.commit()
+
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + duration
+    sources = [a for a in account_ids if a != HOT_ACCOUNT]
+
+    def worker(n):
+        rng = random.Random(n)
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            with session_factory() as db:
+                try:
+                    execute_transfer(db, rng.choice(sources), HOT_ACCOUNT, Decimal("1.00"))
+                except Exception:
+                    db.rollback()
+                    errors.append(1)
+                    continue
+            latencies.append(time.perf_counter() - started)
+
+    def folder():
+        while time.perf_counter() < stop_at:
+            time.sleep(fold_interval)
+            with session_factory() as db:
+                fold_pending(db)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    threads.append(threading.Thread(target=folder))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    done = len(latencies)
+    return {
+        "stripes": stripes,
+        "concurrency": concurrency,
+        "transfers": done,
+        "tps": round(done / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "errors": len(errors),
+    }
+
+
+def total_money(session_factory):
+    from sqlalchemy import func, select
+
+    from app.services.stripes import total_balance
+
+    with session_factory() as db:
+        balances = select(total_balance()).subquery()
+        return db.execute(select(func.sum(balances.c.balance))).scalar_one()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stripes", type=int, nargs="+", default=[0, 1, 4, 16])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per stripe count")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--fold-interval", type=float, default=1.0)
+    parser.add_argument("--db", default="sqlite:///./bench_stripes.db")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db import install_sqlite_tuning
+
+    account_ids = seed_database(args.db, accounts=args.accounts, balance=SEED_BALANCE)
+    engine = create_engine(args.db, pool_size=args.concurrency + 1, max_overflow=0)
+    install_sqlite_tuning(engine)
+    session_factory = sessionmaker(bind=engine)
+    seeded = Decimal(SEED_BALANCE) * args.accounts
+
+    rows = []
+    for stripes in args.stripes:
+        rows.append(run(session_factory, stripes, account_ids, args.concurrency, args.duration, args.fold_interval))
+        money = total_money(session_factory)
+        if money != seeded:
+            raise SystemExit(f"stripes={stripes}: balances sum to {money}, expected {seeded}")
+        print(f"stripes={stripes}: {rows[-1]['tps']} transfers/s, p99 {rows[-1]['p99_ms']} ms")
+    engine.dispose()
+
+    print()
+    print_table(rows, ["stripes", "concurrency", "transfers", "tps", "p50_ms", "p99_ms", "errors"])
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.db import Base, get_db
+from app.db import Base, get_db, get_read_sessions
+from app.core.profiler import assert_max_queries
 
 TEST_DB_URL = "sqlite:///./test.db"
 
@@ -23,6 +24,12 @@ def setup_test_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def session_factory():
+    # independent sessions for tests that drive several connections at once
+    return TestingSessionLocal
+
+
 @pytest.fixture
 def db():
     session = TestingSessionLocal()
@@ -32,12 +39,21 @@ def db():
         session.close()
 
 
+@pytest.fixture
+def max_queries(db):
+    """``with max_queries(n): client.get(...)`` fails if more than n SQL statements run."""
+    def check(limit):
+        return assert_max_queries(db.get_bind(), limit)
+    return check
+
+
 # -------------------- OVERRIDE get_db -------------------- #
 @pytest.fixture(autouse=True)
 def override_get_db(db):
     def _get_db():
         yield db
     app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_sessions] = lambda: TestingSessionLocal
     yield
     app.dependency_overrides.clear()
 
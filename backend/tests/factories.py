@@ -1,5 +1,7 @@
 # backend/tests/factories.py
 import random
+from decimal import Decimal
+
 from app.models.customer import Customer
 from app.models.account import Account
 from app.core.security import hash_pin
@@ -22,3 +24,14 @@ def create_account(db, customer_id, balance=1000):
     db.commit()
     db.refresh(acc)
     return acc
+
+
+def balance(client, account_id):
+    res = client.get(f"/accounts/{account_id}/balance")
+    assert res.status_code == 200, res.text
+    return Decimal(res.json()["balance"])
+
+def pay(client, src, dst, amount):
+    res = client.post("/transfers/", json={"from_account_id": src, "to_account_id": dst, "amount": amount})
+    assert res.status_code == 201, res.text
+    return res
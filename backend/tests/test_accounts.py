@@ -50,4 +50,4 @@ def test_transfer_history_empty(admin_client, db):
 
     res = admin_client.get(f"/accounts/{account.id}/transfers")
     assert res.status_code == 200
-    assert res.json() == []
+    assert res.json() == {"items": [], "next_cursor": None}
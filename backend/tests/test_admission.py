@@ -0,0 +1,114 @@
+import pytest
+
+from app.core.admission import AdaptiveLimiter, read_limiter, write_limiter
+from .factories import create_customer, create_account
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def saturate(monkeypatch):
+    """Fill every slot of a limiter as if that many requests were running."""
+    def fill(limiter):
+        limiter.reset()
+        monkeypatch.setattr(limiter, "_in_flight", limiter.limit)
+    yield fill
+    write_limiter.reset()
+    read_limiter.reset()
+
+
+def test_limiter_rejects_beyond_limit():
+    limiter = AdaptiveLimiter("write", max_limit=2, target=0.1)
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release(0.01)
+    assert limiter.try_acquire()
+    assert limiter.stats() | {"max_limit": None} == {
+        "limit": 2, "max_limit": None, "in_flight": 2, "admitted": 3, "rejected": 1,
+    }
+
+
+def test_limiter_backs_off_multiplicatively_and_recovers_additively():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter("write", max_limit=10, target=0.1, min_limit=2, backoff=0.5, clock=clock)
+
+    for _ in range(3):
+        limiter.try_acquire()
+    limiter.release(0.5)                 # slow: 10 -> 5
+    limiter.release(0.5)                 # same window: one cut per congestion signal
+    assert limiter.limit == 5
+
+    clock.now += 0.2
+    limiter.release(0.01, failed=True)   # errors count as congestion: 5 -> 2.5
+    clock.now += 0.2
+    limiter.try_acquire()
+    limiter.release(0.5)                 # never below min_limit
+    assert limiter.limit == 2
+
+    for _ in range(10):                  # fast rounds that fill the limit
+        held = limiter.limit
+        for _ in range(held):
+            assert limiter.try_acquire()
+        for _ in range(held):
+            limiter.release(0.01)
+    assert 5 <= limiter.limit < 10
+
+
+def test_idle_limiter_does_not_grow():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter("read", max_limit=10, target=0.1, backoff=0.5, clock=clock)
+    limiter.try_acquire()
+    limiter.release(1.0)
+    assert limiter.limit == 5
+
+    # one request at a time never uses half of the limit
+    for _ in range(50):
+        limiter.try_acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 5
+
+
+def test_write_overload_is_shed_and_reads_still_served(admin_client, db, saturate):
+    owner = create_customer(db)
+    a_id = create_account(db, owner.id, balance=100).id
+    b_id = create_account(db, owner.id, balance=0).id
+    saturate(write_limiter)
+    rejected = write_limiter.rejected
+
+    for res in (
+        admin_client.post("/transfers/", json={"from_account_id": a_id, "to_account_id": b_id, "amount": 1}),
+        admin_client.post(f"/accounts/{a_id}/deposit", params={"amount": 1}),
+        admin_client.post(f"/accounts/{a_id}/withdraw", params={"amount": 1}),
+    ):
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == str(write_limiter.retry_after)
+    assert write_limiter.rejected == rejected + 3
+
+    res = admin_client.get(f"/accounts/{a_id}/balance")
+    assert res.status_code == 200 and res.json()["balance"] == "100.00"
+
+
+def test_read_overload_does_not_block_writes(admin_client, db, saturate):
+    acc_id = create_account(db, create_customer(db).id, balance=100).id
+    saturate(read_limiter)
+
+    assert admin_client.get(f"/accounts/{acc_id}/balance").status_code == 503
+    assert admin_client.get("/accounts/").status_code == 503
+    assert admin_client.post(f"/accounts/{acc_id}/deposit", params={"amount": 5}).status_code == 200
+
+
+def test_slots_are_released_after_client_errors(admin_client):
+    in_flight = write_limiter.stats()["in_flight"]
+
+    res = admin_client.post("/accounts/999999/deposit", params={"amount": 1})
+
+    assert res.status_code == 404
+    assert write_limiter.stats()["in_flight"] == in_flight
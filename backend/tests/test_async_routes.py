@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db import get_async_db, to_async_url
+from app.models.employee import Employee
+from app.core.security import create_access_token, hash_password
+from app.routers import async_accounts, async_transfers
+from .conftest import TEST_DB_URL
+from .factories import create_customer, create_account
+
+
+@pytest.fixture
+def async_client(db):
+    # NullPool: TestClient may drive each request on a fresh event loop
+    async_engine = create_async_engine(to_async_url(TEST_DB_URL), poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_accounts.router)
+    app.include_router(async_transfers.router)
+    app.dependency_overrides[get_async_db] = _get_async_db
+
+    staff = db.query(Employee).filter_by(email="async@test.com").first()
+    if not staff:
+        staff = Employee(
+            email="async@test.com",
+            hashed_password=hash_password("Async123"),
+            role="employee",
+        )
+        db.add(staff)
+        db.commit()
+
+    token = create_access_token({"sub": staff.email, "role": staff.role, "uid": staff.id})
+    client = TestClient(app)
+    client.headers.update({"Authorization": f"Bearer {token}"})
+    return client
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./bank.db") == "sqlite+aiosqlite:///./bank.db"
+    assert to_async_url("postgresql://u:p@db/bank") == "postgresql+asyncpg://u:p@db/bank"
+    assert to_async_url("postgresql+psycopg2://u:p@db/bank") == "postgresql+asyncpg://u:p@db/bank"
+
+    with pytest.raises(ValueError):
+        to_async_url("mysql://u:p@db/bank")
+
+
+def test_async_transfer_and_balance(async_client, db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=1000)
+    acc2 = create_account(db, receiver.id, balance=200)
+
+    res = async_client.post("/transfers/", json={
+        "from_account_id": acc1.id,
+        "to_account_id": acc2.id,
+        "amount": 300
+    })
+    assert res.status_code == 201
+
+    bal1 = async_client.get(f"/accounts/{acc1.id}/balance").json()["balance"]
+    bal2 = async_client.get(f"/accounts/{acc2.id}/balance").json()["balance"]
+    assert float(bal1) == 700
+    assert float(bal2) == 500
+
+    history = async_client.get(f"/accounts/{acc2.id}/transfers").json()
+    assert len(history["items"]) == 1
+    assert history["items"][0]["direction"] == "incoming"
+
+
+def test_async_insufficient_funds(async_client, db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=100)
+    acc2 = create_account(db, receiver.id, balance=200)
+
+    res = async_client.post("/transfers/", json={
+        "from_account_id": acc1.id,
+        "to_account_id": acc2.id,
+        "amount": 500
+    })
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Insufficient funds"
+
+
+def test_async_deposit_withdraw(async_client, db):
+    customer = create_customer(db)
+    account = create_account(db, customer.id, balance=100)
+    opened = datetime.now(timezone.utc)
+
+    res = async_client.post(f"/accounts/{account.id}/deposit", params={"amount": 50})
+    assert res.status_code == 200
+    assert res.json()["balance"] == 150
+
+    res = async_client.post(f"/accounts/{account.id}/withdraw", params={"amount": 500})
+    assert res.status_code == 400
+
+    res = async_client.post(f"/accounts/{account.id}/withdraw", params={"amount": 20})
+    assert res.status_code == 200
+    assert res.json()["new_balance"] == 130
+
+    res = async_client.get(f"/accounts/{account.id}/balance", params={"as_of": opened.isoformat()})
+    assert float(res.json()["balance"]) == 100
+
+
+def test_async_router_keeps_sync_routes(async_client):
+    paths = {(r.path, m) for r in async_accounts.router.routes for m in r.methods}
+    assert ("/accounts/", "POST") in paths
+    assert ("/accounts/{account_id}", "DELETE") in paths
+
+    res = async_client.get("/accounts/")
+    assert res.status_code == 200
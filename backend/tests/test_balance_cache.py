@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+from app.core.balance_cache import BalanceCache, CachedBalance, LRUBackend, balance_cache
+from app.services.ledger import post
+from .factories import create_customer, create_account, balance
+
+
+def test_balance_reads_filled_then_served_from_cache(admin_client, db, max_queries):
+    acc_id = create_account(db, create_customer(db).id, balance=100).id
+    hits = balance_cache.hits
+
+    assert balance(admin_client, acc_id) == Decimal("100.00")
+    with max_queries(0):
+        assert balance(admin_client, acc_id) == Decimal("100.00")
+    assert balance_cache.hits == hits + 1
+
+    admin_client.post(f"/accounts/{acc_id}/deposit", params={"amount": 1})
+    with max_queries(0):  # written through by the deposit
+        assert balance(admin_client, acc_id) == Decimal("101.00")
+
+
+def test_every_money_movement_updates_the_cache(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    a_id, b_id = a.id, b.id
+
+    admin_client.post(f"/accounts/{a_id}/deposit", params={"amount": 50})
+    assert balance(admin_client, a_id) == Decimal("150.00")
+
+    admin_client.post(f"/accounts/{a_id}/withdraw", params={"amount": 20})
+    assert balance(admin_client, a_id) == Decimal("130.00")
+
+    admin_client.post("/transfers/", json={"from_account_id": a_id, "to_account_id": b_id, "amount": 30})
+    assert (balance(admin_client, a_id), balance(admin_client, b_id)) == (Decimal("100.00"), Decimal("30.00"))
+
+    admin_client.post("/transfers/batch", json={"items": [{"from_account_id": b_id, "to_account_id": a_id, "amount": 5}]})
+    assert (balance(admin_client, a_id), balance(admin_client, b_id)) == (Decimal("105.00"), Decimal("25.00"))
+
+    admin_client.put(f"/accounts/{a_id}", json={"balance": 77})
+    assert balance(admin_client, a_id) == Decimal("77.00")
+
+    assert admin_client.delete(f"/accounts/{a_id}").status_code == 204
+    assert admin_client.get(f"/accounts/{a_id}/balance").status_code == 404
+
+
+def test_open_write_bypasses_cache_and_rollback_invalidates(db):
+    acc = create_account(db, create_customer(db).id, balance=100)
+    post(db, acc.id, Decimal(0), "deposit")
+    db.commit()
+    assert balance_cache.get(acc.id) == (acc.customer_id, Decimal("100.00"))
+
+    post(db, acc.id, Decimal(5), "deposit")
+    assert balance_cache.get(acc.id) is None  # uncommitted: read the database
+    db.rollback()
+    assert balance_cache.get(acc.id) is None  # dropped, not written through
+
+    post(db, acc.id, Decimal(5), "deposit")
+    db.commit()
+    assert balance_cache.get(acc.id).balance == Decimal("105.00")
+
+
+def test_fill_refused_after_a_racing_write():
+    cache = BalanceCache(LRUBackend(10))
+    stale = CachedBalance(1, Decimal(10))
+
+    epoch = cache.epoch()  # reader starts its SELECT
+    cache.begin_write(7)
+    cache.end_write(7, CachedBalance(1, Decimal(20)))
+    assert cache.fill(7, epoch, stale) is False
+    assert cache.get(7).balance == Decimal(20)
+
+    cache.begin_write(7)
+    assert cache.fill(7, cache.epoch(), stale) is False  # never while a write is open
+    cache.end_write(7, None)
+    assert cache.fill(7, cache.epoch(), stale) is True
+
+
+def test_overlapping_writers_invalidate_instead_of_writing_through():
+    cache = BalanceCache(LRUBackend(10))
+    cache.begin_write(1)
+    cache.begin_write(1)
+    cache.end_write(1, CachedBalance(1, Decimal(30)))
+    cache.end_write(1, CachedBalance(1, Decimal(20)))  # ended last, but may not have committed last
+    assert cache.get(1) is None
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1, "hit_rate": 0.0}
+
+
+def test_lru_evicts_least_recently_used():
+    backend = LRUBackend(2)
+    for n in (1, 2):
+        backend.set(n, CachedBalance(1, Decimal(n)))
+    backend.get(1)
+    backend.set(3, CachedBalance(1, Decimal(3)))
+    assert backend.get(2) is None and backend.get(1) is not None and len(backend) == 2
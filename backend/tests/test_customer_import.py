@@ -0,0 +1,135 @@
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.customer import Customer
+from app.services.customer_import import CustomerImport
+
+
+def upload(client, body, media_type):
+    res = client.post("/customers/bulk", content=body.encode(), headers={"Content-Type": media_type})
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def names(db, phones):
+    db.expire_all()
+    rows = db.execute(select(Customer.phone_number, Customer.name).where(Customer.phone_number.in_(phones)))
+    return dict(rows.all())
+
+
+def test_csv_import_reports_bad_rows_and_keeps_going(admin_client, client, db):
+    admin_client.post("/customers/", json={"name": "Existing", "phone_number": "5550000100", "pin": "1111"})
+
+    body = "\n".join([
+        "phone_number,name,pin",
+        "5550000101,Ann,1234",
+        "5550000102,\"Lee, Bo\",2345",
+        "5550000101,Ann again,1234",
+        "5550000100,Taken,1111",
+        "",
+        "5550000103,Too,many,columns",
+        "5550000104,Cy,3456",
+    ])
+    result = upload(admin_client, body, "text/csv; charset=utf-8")
+
+    assert result["created"] == 3
+    assert result["errors"] == [
+        {"row": 3, "detail": "Duplicate phone number in upload"},
+        {"row": 4, "detail": "Phone already registered"},
+        {"row": 6, "detail": "Expected 3 columns, got 4"},
+    ]
+    assert result["rejected"] == 3
+    assert names(db, ["5550000100", "5550000101", "5550000102", "5550000104"]) == {
+        "5550000100": "Existing", "5550000101": "Ann", "5550000102": "Lee, Bo", "5550000104": "Cy",
+    }
+
+    # the PIN was hashed, and logs in
+    res = client.post("/customer/auth/login", json={"phone_number": "5550000102", "pin": "2345"})
+    assert res.status_code == 200
+
+
+def test_ndjson_import_in_batches(admin_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "customer_import_batch_size", 2)
+    body = "\n".join([
+        '{"name": "N1", "phone_number": "5550000201", "pin": "1"}',
+        '{"name": "N2", "phone_number": "5550000202", "pin": "2"}',
+        "not json",
+        '{"name": "N3", "phone_number": "5550000203"}',
+        "[1, 2]",
+        '{"name": "N4", "phone_number": "5550000201", "pin": "4"}',  # seen in an earlier batch
+        '{"name": "N5", "phone_number": "5550000205", "pin": "5"}',
+    ]) + "\n"
+    result = upload(admin_client, body, "application/x-ndjson")
+
+    assert result["created"] == 3
+    assert [(e["row"], e["detail"]) for e in result["errors"]] == [
+        (3, "Invalid JSON"),
+        (4, "pin: Field required"),
+        (5, "Expected a JSON object"),
+        (6, "Duplicate phone number in upload"),
+    ]
+    assert set(names(db, ["5550000201", "5550000202", "5550000205"]).values()) == {"N1", "N2", "N5"}
+
+
+def test_phone_registered_during_the_import(admin_client, db, monkeypatch):
+    # the lookup misses a phone that is taken by the time of the insert
+    lookups = []
+    real_taken = CustomerImport._taken
+
+    def taken_later(self, phones):
+        lookups.append(phones)
+        return set() if len(lookups) == 1 else real_taken(self, phones)
+
+    monkeypatch.setattr(CustomerImport, "_taken", taken_later)
+    admin_client.post("/customers/", json={"name": "First", "phone_number": "5550000301", "pin": "1111"})
+
+    result = upload(admin_client, "name,phone_number,pin\nLate,5550000301,2\nOk,5550000302,3\n", "text/csv")
+    assert (result["created"], result["errors"]) == (1, [{"row": 1, "detail": "Phone already registered"}])
+    assert names(db, ["5550000301", "5550000302"]) == {"5550000301": "First", "5550000302": "Ok"}
+
+
+def test_conflicts_found_one_at_a_time(admin_client, db, monkeypatch):
+    # each recheck reports only one of the phones registered since the lookup
+    lookups = []
+    real_taken = CustomerImport._taken
+
+    def taken_one_by_one(self, phones):
+        lookups.append(phones)
+        return set() if len(lookups) == 1 else set(sorted(real_taken(self, phones))[:1])
+
+    monkeypatch.setattr(CustomerImport, "_taken", taken_one_by_one)
+    for phone in ("5550000401", "5550000402"):
+        admin_client.post("/customers/", json={"name": "First", "phone_number": phone, "pin": "1111"})
+
+    body = "name,phone_number,pin\nA,5550000401,2\nB,5550000402,3\nOk,5550000403,4\n"
+    result = upload(admin_client, body, "text/csv")
+    assert result["created"] == 1
+    assert [(e["row"], e["detail"]) for e in result["errors"]] == [
+        (1, "Phone already registered"), (2, "Phone already registered"),
+    ]
+    assert len(lookups) == 3
+
+    # a conflict the phone lookup cannot explain is reported per row, not as a 500
+    monkeypatch.setattr(CustomerImport, "_taken", lambda self, phones: set())
+    result = upload(admin_client, "name,phone_number,pin\nA,5550000401,2\n", "text/csv")
+    assert (result["created"], result["errors"]) == (0, [{"row": 1, "detail": "Could not be created"}])
+
+
+def test_csv_quoted_field_across_lines(admin_client, db):
+    body = 'name,phone_number,pin\r\n"Ann\r\nSmith",5550000501,1\r\n"Bo ""B""",5550000502,2\r\nCy,5550000503,3\r\n'
+    result = upload(admin_client, body, "text/csv")
+    assert (result["created"], result["errors"]) == (3, [])
+    assert names(db, ["5550000501", "5550000502"]) == {"5550000501": "Ann\nSmith", "5550000502": 'Bo "B"'}
+
+
+def test_rejected_uploads(admin_client):
+    res = admin_client.post("/customers/bulk", content=b"{}", headers={"Content-Type": "application/json"})
+    assert res.status_code == 415
+    res = admin_client.post("/customers/bulk", content=b"name,pin\nA,1\n", headers={"Content-Type": "text/csv"})
+    assert res.status_code == 422
+    assert "phone_number" in res.json()["detail"]
+
+
+def test_staff_only(customer_client):
+    res = customer_client.post("/customers/bulk", content=b"", headers={"Content-Type": "text/csv"})
+    assert res.status_code in (401, 403)
@@ -0,0 +1,62 @@
+from sqlalchemy import text
+
+from app.core.metrics import pool_checkout_wait
+from app.db import PoolStats, create_app_engine, engine_options
+
+
+def test_file_sqlite_gets_pool_sizing():
+    options = engine_options("sqlite:///./some.db")
+    assert options["connect_args"] == {"check_same_thread": False}
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= options.keys()
+
+
+def test_memory_sqlite_skips_pool_sizing():
+    options = engine_options("sqlite://")
+    assert "pool_size" not in options
+
+
+def test_postgres_statement_timeout(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 2500)
+
+    assert engine_options("postgresql://u:p@db/bank")["connect_args"] == {
+        "options": "-c statement_timeout=2500"
+    }
+    assert engine_options("postgresql+asyncpg://u:p@db/bank")["connect_args"] == {
+        "server_settings": {"statement_timeout": "2500"}
+    }
+
+
+def test_sqlite_pragmas_applied(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_counts_checkouts(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    stats = PoolStats(engine, "stats-test")
+    try:
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        snapshot = stats.snapshot()
+        assert snapshot["pool"] == "TimedQueuePool"
+        assert snapshot["connects_total"] == 1
+        assert snapshot["checkouts_total"] == 3
+        assert snapshot["checkedout"] == 0
+        # each checkout's wait for a free connection is timed
+        assert pool_checkout_wait.count(("stats-test",)) == 3
+    finally:
+        engine.dispose()
+
+
+def test_db_health_endpoint(client):
+    res = client.get("/health/db")
+    assert res.status_code == 200
+    assert "checkouts_total" in res.json()["sync"]
@@ -0,0 +1,176 @@
+import threading
+from decimal import Decimal
+
+import pytest
+
+from app.models.customer import Customer
+from app.services import group_commit
+from app.services.group_commit import TransferPipeline
+from .factories import create_customer, create_account, balance
+
+
+def make_pipeline(monkeypatch, session_factory, **kwargs):
+    options = dict(queue_size=100, group_size=50, max_wait=0.01, tickets_kept=1000)
+    options.update(kwargs)
+    pipeline = TransferPipeline(session_factory, **options)
+    monkeypatch.setattr("app.routers.transfers.transfer_pipeline", pipeline)
+    return pipeline
+
+
+@pytest.fixture
+def pipeline(monkeypatch, session_factory):
+    pipeline = make_pipeline(monkeypatch, session_factory)
+    yield pipeline
+    pipeline.stop()
+
+
+def queue(client, src, dst, amount):
+    res = client.post("/transfers/tickets", json={"from_account_id": src, "to_account_id": dst, "amount": amount})
+    assert res.status_code == 202, res.text
+    assert res.json()["status"] == "pending"
+    assert res.headers["Location"] == f"/transfers/tickets/{res.json()['id']}"
+    return res.json()["id"]
+
+
+def test_queued_transfers_commit_and_report_outcomes(admin_client, db, pipeline):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=0).id
+
+    ok = queue(admin_client, a, b, 30)
+    short = queue(admin_client, b, a, 500)
+    pipeline.flush()
+
+    ticket = admin_client.get(f"/transfers/tickets/{ok}").json()
+    assert ticket["status"] == "committed"
+    assert ticket["status_code"] is None
+    assert isinstance(ticket["transfer_id"], int)
+
+    rejected = admin_client.get(f"/transfers/tickets/{short}").json()
+    assert (rejected["status"], rejected["status_code"], rejected["transfer_id"]) == ("rejected", 400, None)
+
+    assert (balance(admin_client, a), balance(admin_client, b)) == (Decimal("70.00"), Decimal("30.00"))
+
+
+def test_waiting_transfers_share_one_commit(admin_client, db, monkeypatch, session_factory):
+    pipeline = make_pipeline(monkeypatch, session_factory, group_size=4, max_wait=5.0)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=100).id
+    groups = group_commit.group_size.count()
+
+    try:
+        tickets = [queue(admin_client, a, b, 1), queue(admin_client, b, a, 2),
+                   queue(admin_client, a, b, 3), queue(admin_client, a, b, 4)]
+        pipeline.flush()
+    finally:
+        pipeline.stop()
+
+    # the fourth transfer filled the group before max_wait ran out
+    assert group_commit.group_size.count() - groups == 1
+    assert {admin_client.get(f"/transfers/tickets/{t}").json()["status"] for t in tickets} == {"committed"}
+    assert (balance(admin_client, a), balance(admin_client, b)) == (Decimal("94.00"), Decimal("106.00"))
+
+
+def test_customers_queue_from_their_own_accounts_only(customer_client, db, pipeline):
+    me = db.query(Customer).filter_by(phone_number="9998887777").first()
+    mine = create_account(db, me.id, balance=50).id
+    theirs = create_account(db, create_customer(db).id, balance=50).id
+
+    own = queue(customer_client, mine, theirs, 5)
+    pipeline.flush()
+
+    assert customer_client.get(f"/transfers/tickets/{own}").json()["status"] == "committed"
+    assert balance(customer_client, mine) == Decimal("45.00")
+
+
+def test_unqueueable_transfers_are_refused_up_front(customer_client, db, pipeline):
+    me = db.query(Customer).filter_by(phone_number="9998887777").first()
+    mine = create_account(db, me.id, balance=50).id
+    theirs = create_account(db, create_customer(db).id, balance=50).id
+
+    def submit(src, dst):
+        body = {"from_account_id": src, "to_account_id": dst, "amount": 5}
+        return customer_client.post("/transfers/tickets", json=body)
+
+    assert submit(mine, 999999).status_code == 404
+    assert submit(theirs, mine).status_code == 403
+    assert submit(mine, mine).status_code == 422
+    assert pipeline.depth() == 0
+
+
+def test_tickets_are_private_to_their_customer(admin_client, client, db, pipeline):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10).id
+    b = create_account(db, owner.id, balance=0).id
+    ticket = queue(admin_client, a, b, 1)
+    pipeline.flush()
+
+    customer = Customer(name="Other", phone_number="9998880000", pin_hash=owner.pin_hash)
+    db.add(customer)
+    db.commit()
+    res = client.post("/customer/auth/login", json={"phone_number": "9998880000", "pin": "1234"})
+    client.headers.update({"Authorization": f"Bearer {res.json()['access_token']}"})
+
+    assert client.get(f"/transfers/tickets/{ticket}").status_code == 404
+    assert client.get("/transfers/tickets/unknown").status_code == 404
+
+
+def test_pending_tickets_are_kept_until_settled(admin_client, db, monkeypatch, session_factory):
+    release = threading.Event()
+
+    def blocked_session():
+        release.wait(10)
+        return session_factory()
+
+    pipeline = make_pipeline(monkeypatch, blocked_session, group_size=1, max_wait=0, tickets_kept=2)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10).id
+    b = create_account(db, owner.id, balance=0).id
+    body = {"from_account_id": a, "to_account_id": b, "amount": 1}
+
+    try:
+        first, second = queue(admin_client, a, b, 1), queue(admin_client, a, b, 1)
+        res = admin_client.post("/transfers/tickets", json=body)  # both kept tickets are pending
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+        assert pipeline.get(first) is not None
+    finally:
+        release.set()
+        pipeline.flush()
+
+    try:
+        third = queue(admin_client, a, b, 1)  # evicts the oldest settled ticket
+        pipeline.flush()
+    finally:
+        pipeline.stop()
+    assert pipeline.get(first) is None
+    assert {pipeline.get(t).status for t in (second, third)} == {"committed"}
+
+
+def test_full_queue_sheds_with_retry_after(admin_client, db, monkeypatch, session_factory):
+    release = threading.Event()
+
+    def blocked_session():
+        release.wait(10)
+        return session_factory()
+
+    pipeline = make_pipeline(monkeypatch, blocked_session, queue_size=1, group_size=1, max_wait=0)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10).id
+    b = create_account(db, owner.id, balance=0).id
+    body = {"from_account_id": a, "to_account_id": b, "amount": 1}
+
+    try:
+        queue(admin_client, a, b, 1)  # taken by the worker, which waits on its session
+        while pipeline.depth():
+            pass
+        queue(admin_client, a, b, 1)  # fills the queue
+        res = admin_client.post("/transfers/tickets", json=body)
+        assert res.status_code == 503
+        assert res.headers["Retry-After"] == "1"
+    finally:
+        release.set()
+        pipeline.stop()
+
+    assert balance(admin_client, b) == Decimal("2.00")
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.hashing import HashPool, hash_pool
+from app.core.security import hash_pin, verify_pin
+from .factories import create_customer
+
+
+def test_pool_hashes_and_records_latency():
+    pool = HashPool(workers=2, queue_size=2)
+
+    hashed = pool.run(hash_pin, "4321")
+    assert pool.run(verify_pin, "4321", hashed)
+
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["rejected"] == 0
+    assert stats["queue_depth"] == 0 and stats["running"] == 0
+    assert stats["latency_max_ms"] > 0
+    assert sum(stats["latency_buckets"].values()) == 2
+
+
+def test_pool_rejects_when_queue_full():
+    pool = HashPool(workers=1, queue_size=1, retry_after=3)
+    release = threading.Event()
+
+    running = pool.submit(release.wait)
+    queued = pool.submit(release.wait)
+    assert pool.stats()["queue_depth"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        pool.submit(release.wait)
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "3"}
+
+    release.set()
+    running.result(), queued.result()
+    assert pool.stats()["rejected"] == 1
+    # slots are handed back once work drains
+    assert pool.run(lambda: "ok") == "ok"
+
+
+def test_login_sheds_load_when_pool_saturated(client, db, monkeypatch):
+    customer = create_customer(db, pin="2468")
+    monkeypatch.setattr(hash_pool, "_slots", threading.BoundedSemaphore(1))
+    hash_pool._slots.acquire()
+
+    res = client.post(
+        "/customer/auth/login",
+        json={"phone_number": customer.phone_number, "pin": "2468"},
+    )
+
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == str(hash_pool.retry_after)
@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select, update
+
+from app.config import settings
+from app.core.idempotency import request_fingerprint, run_idempotent, sweep_expired
+from app.models.idempotency import IdempotencyKey
+from .factories import create_customer, create_account, balance
+
+
+def test_deposit_retry_is_replayed(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=100)
+    headers = {"Idempotency-Key": "dep-1"}
+
+    first = admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "25"}, headers=headers)
+    retry = admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "25"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json() == {"balance": 125.0}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert balance(admin_client, acc.id) == 125
+
+
+def test_transfer_retry_returns_same_transfer(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    payload = {"from_account_id": a.id, "to_account_id": b.id, "amount": 30}
+    headers = {"Idempotency-Key": "tr-1"}
+
+    first = admin_client.post("/transfers/", json=payload, headers=headers)
+    retry = admin_client.post("/transfers/", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert balance(admin_client, a.id) == 70
+
+
+def test_replay_is_one_lookup(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=100)
+    headers = {"Idempotency-Key": "dep-lookup"}
+    url = f"/accounts/{acc.id}/withdraw"
+    admin_client.post(url, params={"amount": "10"}, headers=headers)
+
+    statements = []
+    listener = lambda conn, cursor, sql, *a: statements.append(sql)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        res = admin_client.post(url, params={"amount": "10"}, headers=headers)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert res.json()["new_balance"] == 90
+    assert not any("accounts" in sql for sql in statements), statements
+    assert sum("idempotency_keys" in sql for sql in statements) == 1
+
+
+def test_key_reused_for_other_request(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=100)
+    headers = {"Idempotency-Key": "dep-2"}
+    admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "1"}, headers=headers)
+
+    res = admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "2"}, headers=headers)
+    assert res.status_code == 422
+
+
+def test_failed_request_is_not_stored(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=10)
+    headers = {"Idempotency-Key": "wd-1"}
+
+    res = admin_client.post(f"/accounts/{acc.id}/withdraw", params={"amount": "50"}, headers=headers)
+    assert res.status_code == 400
+
+    admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "40"})
+    res = admin_client.post(f"/accounts/{acc.id}/withdraw", params={"amount": "50"}, headers=headers)
+    assert res.status_code == 200 and res.json()["new_balance"] == 0
+
+
+def test_concurrent_duplicates_wait_for_first(session_factory):
+    fingerprint = request_fingerprint("POST", "/test", n=1)
+    runs, results = [], []
+
+    def operation(db):
+        runs.append(1)
+        time.sleep(0.3)
+        return {"run": len(runs)}
+
+    def call():
+        with session_factory() as db:
+            results.append(run_idempotent(db, "same-key", "admin:race", fingerprint, operation))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(runs) == 1
+    # the first caller gets the body, the others a stored replay
+    bodies = [r if isinstance(r, dict) else json.loads(r.body) for r in results]
+    assert bodies == [{"run": 1}] * 4
+
+
+def test_sweeper_removes_expired_keys(admin_client, db, monkeypatch):
+    acc = create_account(db, create_customer(db).id, balance=100)
+    headers = {"Idempotency-Key": "dep-old"}
+    admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "5"}, headers=headers)
+
+    # an expired key runs again instead of replaying
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == "dep-old")
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    db.commit()
+    res = admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": "5"}, headers=headers)
+    assert "idempotent-replayed" not in res.headers
+    assert balance(admin_client, acc.id) == 110
+
+    db.execute(update(IdempotencyKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    db.commit()
+    assert sweep_expired(db) >= 1
+    assert db.execute(select(IdempotencyKey)).first() is None
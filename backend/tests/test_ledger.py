@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import func, select, update
+
+from app.config import settings
+from app.models.account import Account as AccountModel
+from app.models.ledger import BalanceCheckpoint, LedgerEntry
+from .factories import create_customer, create_account
+from .test_query_plans import query_plan
+from app.services.ledger import CARRIED_OVER, checkpoint_stmt, replay_stmt
+
+
+def entries(db, account_id):
+    db.expire_all()
+    return db.execute(
+        select(LedgerEntry.kind, LedgerEntry.amount)
+        .where(LedgerEntry.account_id == account_id)
+        .order_by(LedgerEntry.id)
+    ).all()
+
+
+def balance_at(client, account_id, moment):
+    res = client.get(f"/accounts/{account_id}/balance", params={"as_of": moment.isoformat()})
+    assert res.status_code == 200
+    return Decimal(str(res.json()["balance"]))
+
+
+def test_every_movement_is_posted(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+
+    admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "50"})
+    admin_client.post(f"/accounts/{a.id}/withdraw", params={"amount": "30"})
+    admin_client.post("/transfers/", json={"from_account_id": a.id, "to_account_id": b.id, "amount": 20})
+    admin_client.post("/transfers/batch", json={"items": [
+        {"from_account_id": b.id, "to_account_id": a.id, "amount": 5},
+    ]})
+    admin_client.put(f"/accounts/{b.id}", json={"balance": 40})
+    admin_client.put(f"/accounts/{b.id}", json={"balance": 40})  # no change: nothing to post
+
+    assert [kind for kind, _ in entries(db, a.id)] == [
+        "opening", "deposit", "withdrawal", "transfer_out", "transfer_in",
+    ]
+    assert [kind for kind, _ in entries(db, b.id)] == [
+        "opening", "transfer_in", "transfer_out", "adjustment",
+    ]
+    for acc in (a, b):
+        db.refresh(acc)
+        assert sum(amount for _, amount in entries(db, acc.id)) == acc.balance
+        assert acc.ledger_count == len(entries(db, acc.id))
+
+
+def test_rejected_withdrawal_posts_nothing(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10)
+
+    res = admin_client.post(f"/accounts/{a.id}/withdraw", params={"amount": "10.01"})
+    assert res.status_code == 400
+    assert [kind for kind, _ in entries(db, a.id)] == ["opening"]
+
+
+def test_checkpoints_every_interval(admin_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ledger_checkpoint_interval", 3)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=0)
+
+    for _ in range(7):
+        admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "1"})
+
+    # 8 entries (opening + 7 deposits): checkpoints after the 3rd and 6th
+    db.expire_all()
+    checkpoints = db.execute(
+        select(BalanceCheckpoint.balance).where(BalanceCheckpoint.account_id == a.id)
+        .order_by(BalanceCheckpoint.seq)
+    ).scalars().all()
+    assert checkpoints == [Decimal("2"), Decimal("5")]
+
+
+def test_balance_as_of(admin_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ledger_checkpoint_interval", 4)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+
+    history = [(datetime.now(timezone.utc), Decimal("100"))]
+    expected = Decimal("100")
+    for n in range(1, 11):
+        if n % 3:
+            admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": str(n)})
+            expected += n
+        else:
+            admin_client.post("/transfers/", json={"from_account_id": a.id, "to_account_id": b.id, "amount": n})
+            expected -= n
+        history.append((datetime.now(timezone.utc), expected))
+
+    for moment, balance in history:
+        assert balance_at(admin_client, a.id, moment) == balance
+
+    before_opening = history[0][0] - timedelta(days=1)
+    assert balance_at(admin_client, a.id, before_opening) == 0
+    # naive timestamps are read as UTC
+    assert balance_at(admin_client, a.id, history[5][0].replace(tzinfo=None)) == history[5][1]
+    assert db.execute(select(func.count()).where(BalanceCheckpoint.account_id == a.id)).scalar() >= 2
+
+
+def test_replay_is_index_range(db):
+    as_of = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    checkpoint = db.execute(checkpoint_stmt(1, as_of)).first()
+    plan = query_plan(db, replay_stmt(1, as_of, checkpoint))
+    assert any("ix_ledger_entries_account_time" in step for step in plan), plan
+
+    plan = query_plan(db, checkpoint_stmt(1, as_of))
+    assert any("ix_balance_checkpoints_account_time" in step for step in plan), plan
+
+
+def test_deleted_account_keeps_its_ledger(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=25).id
+    assert admin_client.delete(f"/accounts/{a}").status_code == 204
+
+    assert entries(db, a) == [("opening", Decimal("25.00"))]
+    # the id is not handed out again, so no new account inherits those entries
+    b = create_account(db, owner.id, balance=0).id
+    assert b > a
+    assert entries(db, b) == [("opening", Decimal("0.00"))]
+
+
+def test_balance_before_a_carried_over_ledger_is_rejected(admin_client, db):
+    # an account that predates the ledger: migration 0003 carried its balance over
+    a = create_account(db, create_customer(db).id, balance=60).id
+    carried_at = datetime.now(timezone.utc) - timedelta(days=1)
+    db.execute(
+        update(LedgerEntry).where(LedgerEntry.account_id == a)
+        .values(kind=CARRIED_OVER, created_at=carried_at)
+    )
+    db.commit()
+
+    assert balance_at(admin_client, a, carried_at + timedelta(hours=1)) == Decimal("60")
+    res = admin_client.get(f"/accounts/{a}/balance", params={"as_of": (carried_at - timedelta(hours=1)).isoformat()})
+    assert res.status_code == 422
+    res = admin_client.get(f"/accounts/{a}/statement", params={"from": (carried_at - timedelta(hours=1)).isoformat()})
+    assert res.status_code == 422
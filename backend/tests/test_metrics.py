@@ -0,0 +1,50 @@
+from app.core.balance_cache import balance_cache
+from app.core.metrics import Histogram, Registry, db_statements_total, in_flight, requests_total
+from .factories import create_customer, create_account
+
+BALANCE = ("GET", "💳 Accounts", "/accounts/{account_id}/balance")
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    hist = registry.register(Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        hist.observe(value, ("/x",))
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/x",le="1.0"} 3' in text
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{route="/x"} 4' in text
+
+
+def test_requests_labelled_by_route_template(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=10)
+    before = requests_total.value(BALANCE + ("200",))
+    statements_before = db_statements_total.value(BALANCE)
+
+    for _ in range(2):
+        balance_cache.clear()  # make each request query the database
+        admin_client.get(f"/accounts/{acc.id}/balance")
+
+    assert requests_total.value(BALANCE + ("200",)) == before + 2
+    # one account lookup per request at least
+    assert db_statements_total.value(BALANCE) >= statements_before + 2
+    assert in_flight.value() == 0
+
+
+def test_metrics_endpoint(admin_client, db):
+    acc = create_account(db, create_customer(db).id, balance=10)
+    admin_client.get(f"/accounts/{acc.id}/balance")
+    admin_client.get("/no/such/path")
+
+    res = admin_client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = res.text
+    assert 'http_request_duration_seconds_bucket{method="GET",tag="💳 Accounts",route="/accounts/{account_id}/balance",le="+Inf"}' in text
+    assert 'route="<unmatched>",status="404"' in text
+    assert "db_statements_per_request_count" in text
+    assert "http_response_size_bytes_sum" in text
+    assert 'db_pool_checkouts_total{engine="sync"}' in text
@@ -0,0 +1,88 @@
+from .factories import create_customer, create_account
+
+
+def collect_pages(client, url, limit):
+    items, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get(url, params=params)
+        assert res.status_code == 200
+        page = res.json()
+        assert len(page["items"]) <= limit
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items
+
+
+def test_account_transfers_pages(admin_client, db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=1000)
+    acc2 = create_account(db, receiver.id, balance=1000)
+
+    for amount in (10, 20, 30, 40, 50):
+        admin_client.post("/transfers/", json={
+            "from_account_id": acc1.id,
+            "to_account_id": acc2.id,
+            "amount": amount
+        })
+    admin_client.post("/transfers/", json={
+        "from_account_id": acc2.id,
+        "to_account_id": acc1.id,
+        "amount": 5
+    })
+
+    items = collect_pages(admin_client, f"/accounts/{acc1.id}/transfers", limit=2)
+
+    assert len(items) == 6
+    assert len({t["id"] for t in items}) == 6
+    # newest first
+    assert items[0]["direction"] == "incoming"
+    assert [t["amount"] for t in items[1:]] == [50, 40, 30, 20, 10]
+
+
+def test_list_accounts_pages(admin_client, db):
+    customer = create_customer(db)
+    created = {create_account(db, customer.id).id for _ in range(3)}
+
+    items = collect_pages(admin_client, "/accounts/", limit=2)
+    ids = [a["id"] for a in items]
+
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids))
+    assert created <= set(ids)
+
+
+def test_list_transfers_and_customers_pages(admin_client, db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=1000)
+    acc2 = create_account(db, receiver.id, balance=1000)
+    admin_client.post("/transfers/", json={
+        "from_account_id": acc1.id,
+        "to_account_id": acc2.id,
+        "amount": 1
+    })
+
+    transfers = collect_pages(admin_client, "/transfers/", limit=3)
+    assert len(transfers) == len({t["id"] for t in transfers})
+    assert transfers[0]["from_account_id"] == acc1.id
+
+    customers = collect_pages(admin_client, "/customers/", limit=3)
+    ids = [c["id"] for c in customers]
+    assert ids == sorted(ids)
+    assert {sender.id, receiver.id} <= set(ids)
+
+
+def test_invalid_cursor(admin_client):
+    res = admin_client.get("/accounts/", params={"cursor": "not-a-cursor"})
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Invalid cursor"
+
+
+def test_limit_bounds(admin_client):
+    assert admin_client.get("/accounts/", params={"limit": 0}).status_code == 422
+    assert admin_client.get("/accounts/", params={"limit": 501}).status_code == 422
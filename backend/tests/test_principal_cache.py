@@ -0,0 +1,77 @@
+import contextlib
+
+from sqlalchemy import event, update
+
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token
+from app.models.employee import Employee
+
+
+@contextlib.contextmanager
+def count_employee_queries(db):
+    seen = []
+
+    def on_execute(conn, cursor, statement, params, context, executemany):
+        if "FROM employees" in statement:
+            seen.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+
+def make_staff(db, email, active=True):
+    staff = Employee(email=email, hashed_password="x", role="employee", is_active=active)
+    db.add(staff)
+    db.commit()
+    token = create_access_token({"sub": staff.email, "role": staff.role, "uid": staff.id})
+    return staff, {"Authorization": f"Bearer {token}"}
+
+
+def test_second_request_skips_employee_lookup(client, db):
+    _, headers = make_staff(db, "principal1@test.com")
+
+    with count_employee_queries(db) as seen:
+        assert client.get("/customers/", headers=headers).status_code == 200
+        assert client.get("/customers/", headers=headers).status_code == 200
+
+    assert len(seen) == 1
+
+
+def test_deactivation_invalidates(client, db):
+    staff, headers = make_staff(db, "principal2@test.com")
+    assert client.get("/customers/", headers=headers).status_code == 200
+    assert principal_cache.get(staff.email) is not None
+
+    staff.is_active = False
+    db.commit()
+
+    assert principal_cache.get(staff.email) is None
+    res = client.get("/customers/", headers=headers)
+    assert res.status_code == 401
+    assert res.json()["detail"] == "Inactive user"
+
+
+def test_bulk_update_invalidates(client, db):
+    staff, headers = make_staff(db, "principal3@test.com")
+    assert client.get("/customers/", headers=headers).status_code == 200
+
+    db.execute(update(Employee).where(Employee.id == staff.id).values(is_active=False))
+    db.commit()
+
+    assert client.get("/customers/", headers=headers).status_code == 401
+
+
+def test_recreated_employee_rejects_old_token(client, db):
+    staff, headers = make_staff(db, "principal4@test.com")
+    assert client.get("/customers/", headers=headers).status_code == 200
+
+    db.delete(staff)
+    db.commit()
+    make_staff(db, "principal4-filler@test.com")  # SQLite would reuse the freed id
+    make_staff(db, "principal4@test.com")
+
+    assert client.get("/customers/", headers=headers).status_code == 401
@@ -0,0 +1,96 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.profiler import SQLProfilerMiddleware, assert_max_queries, capture, fingerprint, install_profiler
+from .factories import create_customer, create_account
+
+
+def test_fingerprint_collapses_literals_and_lists():
+    a = fingerprint("SELECT * FROM accounts WHERE id IN (?, ?, ?) AND name = 'bob'")
+    b = fingerprint("SELECT *  FROM accounts\nWHERE id IN (?) AND name = 'alice'")
+    assert a == b == "SELECT * FROM accounts WHERE id IN (?...) AND name = ?"
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?...)"
+
+
+def test_assert_max_queries_fails_when_exceeded(db):
+    with pytest.raises(AssertionError, match="at most 1 SQL statements"):
+        with assert_max_queries(db.get_bind(), 1):
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
+
+
+def test_hot_endpoints_statement_budget(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    a_id, b_id = a.id, b.id
+
+    def statements(request):
+        with capture(db.get_bind()) as profile:
+            assert request().status_code in (200, 201)
+        return profile.statements
+
+    # locks, two guarded updates, transfer, two ledger entries, rollup upsert
+    assert statements(lambda: admin_client.post(
+        "/transfers/", json={"from_account_id": a_id, "to_account_id": b_id, "amount": 1},
+    )) == 7
+    principal_cache.clear()  # the deposit's principal lookup misses: one SELECT
+    assert statements(lambda: admin_client.post(f"/accounts/{a_id}/deposit", params={"amount": 1})) == 5
+    # principal and balance (written through by the deposit) both come from cache
+    assert statements(lambda: admin_client.get(f"/accounts/{a_id}/balance")) == 0
+    assert statements(lambda: admin_client.get(f"/accounts/{a_id}/transfers")) == 2
+    assert statements(lambda: admin_client.get("/accounts/")) == 1
+
+
+@pytest.fixture
+def profiled_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profiled.db'}")
+    install_profiler(engine)
+    install_profiler(engine)  # idempotent
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')"))
+    yield engine
+    engine.dispose()
+
+
+def test_slow_query_logged_with_plan(profiled_engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "sql_slow_query_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        with profiled_engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items WHERE name = :name"), {"name": "a"}).all()
+
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("slow query")]
+    assert len(slow) == 1  # the EXPLAIN itself is not profiled
+    assert "SCAN items" in slow[0]
+
+
+def test_middleware_reports_timing_and_n_plus_one(profiled_engine, caplog):
+    app = FastAPI()
+    app.add_middleware(SQLProfilerMiddleware)
+
+    @app.get("/items/{n}")
+    def items(n: int):
+        with profiled_engine.connect() as conn:
+            return [conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i}).scalar() for i in range(n)]
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        res = client.get("/items/2")
+        assert res.headers["server-timing"].endswith('desc="2 queries"')
+        assert not any("N+1" in r.getMessage() for r in caplog.records)
+
+        res = client.get(f"/items/{settings.sql_n_plus_one_threshold}")
+        assert res.headers["server-timing"].startswith("db;dur=")
+
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert warnings == [
+        f"possible N+1 in GET /items/{{n}}: ran {settings.sql_n_plus_one_threshold} times: "
+        "SELECT name FROM items WHERE id = ?"
+    ]
@@ -0,0 +1,44 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.pagination import encode_cursor
+from app.routers.accounts import account_transfers_stmt
+from app.services import reports
+
+
+def query_plan(db, stmt):
+    if db.bind.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN checks are SQLite specific")
+    sql = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    return [row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def assert_uses_history_indexes(plan):
+    searches = [step for step in plan if "transfers" in step]
+    assert any("ix_transfers_from_account_history" in s for s in searches), plan
+    assert any("ix_transfers_to_account_history" in s for s in searches), plan
+    # never a full scan of the transfers table
+    assert not any(s.startswith("SCAN transfers") for s in searches), plan
+
+
+def test_history_first_page_uses_indexes(db):
+    plan = query_plan(db, account_transfers_stmt(1, None, 50))
+    assert_uses_history_indexes(plan)
+    assert "MERGE (UNION ALL)" in plan
+
+
+def test_history_cursor_page_is_range_scan(db):
+    cursor = encode_cursor(datetime(2026, 1, 1, 12, 0, 0), 42)
+    plan = query_plan(db, account_transfers_stmt(1, cursor, 50))
+    assert_uses_history_indexes(plan)
+    assert all("created_at<?" in s for s in plan if "USING INDEX ix_transfers_" in s), plan
+
+
+def test_volume_reports_are_range_scans(db):
+    start, end = date(2026, 1, 1), date(2026, 1, 31)
+    for stmt in (reports.transfer_volume_stmt(db, start, end), reports.top_by_volume_stmt(10, start, end)):
+        searches = [step for step in query_plan(db, stmt) if "transfers" in step]
+        assert searches and all("USING INDEX ix_transfers_created_at (created_at>? AND created_at<?)" in s
+                                for s in searches), searches
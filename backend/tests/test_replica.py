@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware import Middleware
+
+import app.db
+from app.core.balance_cache import LRUBackend, balance_cache
+from app.core.replica import (
+    LAST_WRITE_COOKIE,
+    ReadYourWrites,
+    ReadYourWritesMiddleware,
+    read_routing_total,
+    read_your_writes,
+)
+from app.main import app as api
+from .conftest import TEST_DB_URL
+from .factories import create_customer, create_account
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """A second SQLite file standing in for a read replica of test.db.
+
+    ``replicate()`` plays the part of replication by copying the primary
+    over it. The write marker middleware is installed for the test only.
+    """
+    path = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    def replicate():
+        engine.dispose()
+        src, dst = sqlite3.connect(TEST_DB_URL.removeprefix("sqlite:///")), sqlite3.connect(path)
+        try:
+            src.backup(dst)
+        finally:
+            src.close()
+            dst.close()
+
+    replicate()
+    monkeypatch.setattr(app.db, "ReadSessionLocal", sessionmaker(bind=engine, info={"replica": True}))
+    # the balance cache would answer from the primary's committed state
+    monkeypatch.setattr(balance_cache, "backend", LRUBackend(0))
+    api.user_middleware.insert(0, Middleware(ReadYourWritesMiddleware))
+    api.middleware_stack = None
+    read_your_writes.clear()
+    yield replicate
+    api.user_middleware.pop(0)
+    api.middleware_stack = None
+    engine.dispose()
+
+
+def test_reads_go_to_replica_until_replicated(admin_client, db, replica):
+    acc = create_account(db, create_customer(db).id, balance=10)
+    before = read_routing_total.value(("replica",))
+
+    # written behind the API's back: the replica has not seen it yet
+    assert admin_client.get(f"/accounts/{acc.id}/balance").status_code == 404
+    replica()
+    assert admin_client.get(f"/accounts/{acc.id}/balance").json()["balance"] == "10.00"
+    assert read_routing_total.value(("replica",)) == before + 2
+
+
+def test_client_reads_its_own_writes_from_primary(admin_client, db, replica):
+    acc = create_account(db, create_customer(db).id, balance=10)
+    replica()
+
+    res = admin_client.post(f"/accounts/{acc.id}/deposit", params={"amount": 5})
+    assert res.status_code == 200
+    assert LAST_WRITE_COOKIE in res.cookies
+
+    # the stale replica still says 10; the writer is routed to the primary
+    assert admin_client.get(f"/accounts/{acc.id}/balance").json()["balance"] == "15.00"
+
+    # once the marker is gone the replica answers again
+    read_your_writes.clear()
+    admin_client.cookies.clear()
+    assert admin_client.get(f"/accounts/{acc.id}/balance").json()["balance"] == "10.00"
+
+
+def test_failed_writes_do_not_pin_to_primary(admin_client, replica):
+    res = admin_client.post("/accounts/999999/deposit", params={"amount": 5})
+    assert res.status_code == 404
+    assert LAST_WRITE_COOKIE not in res.cookies
+    assert not read_your_writes.wrote_recently([(b"authorization", admin_client.headers["authorization"].encode())])
+
+
+def test_write_marker_expires():
+    now = [1000.0]
+    ryw = ReadYourWrites(window=5, clock=lambda: now[0])
+    headers = [(b"authorization", b"Bearer abc")]
+    ryw.mark(headers)
+    assert ryw.wrote_recently(headers)
+    assert not ryw.wrote_recently([(b"authorization", b"Bearer other")])
+    assert ryw.wrote_recently([(b"cookie", f"{LAST_WRITE_COOKIE}=999.5".encode())])
+    now[0] += 6
+    assert not ryw.wrote_recently(headers)
@@ -0,0 +1,159 @@
+import threading
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.core.report_cache import ReportCache, report_cache
+from app.services import reports
+from .factories import create_customer, create_account
+
+# Larger than anything other tests create, so these accounts rank first
+BIG = 4_000_000_000
+
+
+def get(client, path, cached=False, **params):
+    if not cached:
+        report_cache.clear()
+    res = client.get(f"/reports/{path}", params=params)
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_deposits_include_striped_credits(admin_client, db):
+    before = get(admin_client, "deposits")
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=50).id
+    admin_client.put(f"/accounts/{b}/stripes", json={"stripes": 2})
+    admin_client.post("/transfers/", json={"from_account_id": a, "to_account_id": b, "amount": 30})
+
+    after = get(admin_client, "deposits")
+    assert after["accounts"] - before["accounts"] == 2
+    assert after["customers"] - before["customers"] == 1
+    assert Decimal(after["total_balance"]) - Decimal(before["total_balance"]) == Decimal("150.00")
+
+
+def test_transfer_volume_per_period(admin_client, db):
+    today = datetime.now(timezone.utc).date()
+    before = get(admin_client, "transfer-volume")
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=0).id
+    for amount in (10, "2.50"):
+        admin_client.post("/transfers/", json={"from_account_id": a, "to_account_id": b, "amount": amount})
+
+    after = get(admin_client, "transfer-volume")
+    assert len(after["periods"]) == 30
+    assert after["periods"][-1]["period"] == str(today)
+    assert after["periods"][-1]["transfers"] - before["periods"][-1]["transfers"] == 2
+    assert Decimal(after["periods"][-1]["amount"]) - Decimal(before["periods"][-1]["amount"]) == Decimal("12.50")
+
+    months = get(admin_client, "transfer-volume", granularity="month", **{"from": "2026-01-01", "to": str(today)})
+    assert months["periods"][0] == {"period": "2026-01-01", "transfers": 0, "amount": "0.00"}
+    assert months["periods"][-1]["transfers"] >= 2
+
+
+def test_top_accounts(admin_client, db):
+    owner = create_customer(db)
+    rich = create_account(db, owner.id, balance=BIG).id
+    richer = create_account(db, owner.id, balance=BIG + 1).id
+    admin_client.post("/transfers/", json={"from_account_id": rich, "to_account_id": richer, "amount": BIG - 1})
+
+    top = get(admin_client, "top-accounts", limit=2)
+    assert top["by"] == "balance"
+    assert len(top["items"]) == 2
+    assert top["items"][0] == {"account_id": richer, "customer_id": owner.id, "value": f"{2 * BIG:.2f}", "transfers": None}
+
+    top = get(admin_client, "top-accounts", by="volume", limit=2)
+    assert {i["account_id"] for i in top["items"]} == {rich, richer}
+    assert {i["value"] for i in top["items"]} == {f"{BIG - 1:.2f}"}
+    assert {i["transfers"] for i in top["items"]} == {1}
+
+
+def test_balance_histogram(admin_client, db):
+    edges = {"edges": ["0.05", "0.10"]}
+    before = get(admin_client, "balance-histogram", **edges)
+    owner = create_customer(db)
+    for balance in ("0.01", "0.05", "0.07"):
+        create_account(db, owner.id, balance=Decimal(balance))
+
+    after = get(admin_client, "balance-histogram", **edges)
+    assert [(b["min"], b["max"]) for b in after["buckets"]] == [(None, "0.05"), ("0.05", "0.10"), ("0.10", None)]
+    gained = [a["accounts"] - b["accounts"] for a, b in zip(after["buckets"], before["buckets"])]
+    assert gained == [1, 2, 0]
+
+    assert len(get(admin_client, "balance-histogram")["buckets"]) == len(reports.DEFAULT_BALANCE_EDGES) + 1
+    assert admin_client.get("/reports/balance-histogram", params={"edges": ["10", "5"]}).status_code == 422
+
+
+def test_reports_are_staff_only(customer_client):
+    for path in ("deposits", "transfer-volume", "top-accounts", "balance-histogram"):
+        assert customer_client.get(f"/reports/{path}").status_code in (401, 403)
+
+
+def test_reports_document_bearer_auth(client):
+    schema = client.get("/openapi.json").json()
+    assert schema["paths"]["/reports/deposits"]["get"]["security"] == [{"BearerAuth": []}]
+
+
+def test_results_are_cached(admin_client, db):
+    first = get(admin_client, "deposits")
+    create_account(db, create_customer(db).id, balance=5)
+
+    assert get(admin_client, "deposits", cached=True) == first
+
+
+# ---------------- ReportCache ---------------- #
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stale_results_are_served_while_one_refresh_runs():
+    clock = Clock()
+    cache = ReportCache(ttl=10, stale=100, maxsize=10, clock=clock)
+    release, calls = threading.Event(), []
+
+    def compute():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    assert cache.get("k", compute) == 1
+    clock.now = 5
+    assert cache.get("k", compute) == 1  # fresh
+    clock.now = 20
+    assert cache.get("k", compute) == 1  # stale: served, refresh started
+    assert cache.get("k", compute) == 1  # refresh still running: not started twice
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.get("k", compute) != 2:  # stale until the refresh lands
+        assert time.monotonic() < deadline
+    assert len(calls) == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_results_are_recomputed_inline():
+    clock = Clock()
+    cache = ReportCache(ttl=10, stale=5, maxsize=1, clock=clock)
+    values = iter(range(10))
+    assert cache.get("a", lambda: next(values)) == 0
+    clock.now = 16
+    assert cache.get("a", lambda: next(values)) == 1
+    assert cache.get("b", lambda: next(values)) == 2  # evicts "a"
+    assert cache.get("a", lambda: next(values)) == 3
+
+
+def test_compute_locks_do_not_pile_up():
+    cache = ReportCache(ttl=10, stale=0, maxsize=2)
+    for key in range(50):
+        cache.get(key, lambda: key)
+    with pytest.raises(ZeroDivisionError):
+        cache.get("boom", lambda: 1 / 0)
+    assert cache._computing == {}
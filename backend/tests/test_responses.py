@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.core import responses
+from app.core.responses import dumps
+from app.schemas.account import AccountOut
+from app.schemas.pagination import Page
+from app.schemas.transfer import Transfer
+from .factories import create_customer, create_account
+
+
+PAYLOAD = {
+    "amount": Decimal("1234.50"),
+    "naive": datetime(2024, 5, 1, 12, 30, 0, 123456),
+    "aware": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+}
+
+
+def test_dumps_matches_pydantic_encoding():
+    assert dumps(PAYLOAD) == TypeAdapter(dict).dump_json(PAYLOAD)
+
+
+def test_stdlib_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+    assert dumps(PAYLOAD) == TypeAdapter(dict).dump_json(PAYLOAD)
+
+
+def test_list_pages_keep_schema_wire_format(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    admin_client.post("/transfers/", json={"from_account_id": a.id, "to_account_id": b.id, "amount": "12.34"})
+
+    # what response_model validation would have produced
+    for path, schema in (("/accounts/", Page[AccountOut]), ("/transfers/", Page[Transfer])):
+        body = admin_client.get(path).json()
+        assert body["items"]
+        assert schema.model_validate(body).model_dump(mode="json") == body
+
+    history = admin_client.get(f"/accounts/{a.id}/transfers").json()["items"]
+    assert history[0]["amount"] == 12.34
+    assert history[0]["direction"] == "outgoing"
@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.models.ledger import DailyAccountRollup, LedgerEntry
+from app.services.rollups import rebuild
+from .factories import create_customer, create_account, pay
+
+
+def today():
+    return datetime.now(timezone.utc).date()
+
+
+def summary(client, account_id, **params):
+    res = client.get(f"/accounts/{account_id}/summary", params=params)
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def rollup_rows(db, account_id):
+    db.expire_all()
+    return db.execute(
+        select(
+            DailyAccountRollup.day,
+            func.sum(DailyAccountRollup.money_in),
+            func.sum(DailyAccountRollup.money_out),
+            func.sum(DailyAccountRollup.transfers_in),
+            func.sum(DailyAccountRollup.transfers_out),
+        )
+        .where(DailyAccountRollup.account_id == account_id)
+        .group_by(DailyAccountRollup.day)
+        .order_by(DailyAccountRollup.day)
+    ).all()
+
+
+def test_writes_update_the_day_in_the_same_transaction(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=50).id
+
+    pay(admin_client, a, b, 30)
+    pay(admin_client, b, a, 5)
+    admin_client.post(f"/accounts/{a}/deposit", params={"amount": "20"})
+    admin_client.post(f"/accounts/{a}/withdraw", params={"amount": "7.50"})
+    admin_client.post(f"/accounts/{a}/withdraw", params={"amount": "999"})  # refused, not rolled up
+    admin_client.post("/transfers/batch", json={"items": [{"from_account_id": b, "to_account_id": a, "amount": 1}]})
+
+    body = summary(admin_client, a)
+    assert (body["granularity"], body["from"], body["to"]) == ("day", str(today() - timedelta(days=29)), str(today()))
+    assert len(body["periods"]) == 30
+    assert body["periods"][-1] == {
+        "period": str(today()),
+        "money_in": "126.00",  # opening 100 + 5 + 20 + 1
+        "money_out": "37.50",
+        "transfers_in": 2,
+        "transfers_out": 1,
+    }
+    assert body["periods"][0]["money_in"] == "0.00"
+
+
+def test_summary_by_month_and_range(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10).id
+    # move the opening entry's rollup to an earlier month
+    earlier = date(2026, 1, 15)
+    db.execute(update(DailyAccountRollup).where(DailyAccountRollup.account_id == a).values(day=earlier))
+    db.commit()
+    admin_client.post(f"/accounts/{a}/deposit", params={"amount": "5"})
+
+    body = summary(admin_client, a, **{"from": "2026-01-20", "to": str(today()), "granularity": "month"})
+    assert body["periods"][0]["period"] == "2026-01-01"
+    assert body["periods"][0]["money_in"] == "0.00"  # the 15th is before 'from'
+    assert body["periods"][-1]["period"] == str(today().replace(day=1))
+    assert body["periods"][-1]["money_in"] == "5.00"
+
+    body = summary(admin_client, a, **{"from": "2026-01-01", "to": "2026-02-28", "granularity": "month"})
+    assert [p["period"] for p in body["periods"]] == ["2026-01-01", "2026-02-01"]
+    assert body["periods"][0]["money_in"] == "10.00"
+
+
+def test_rebuild_matches_the_ledger(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100).id
+    b = create_account(db, owner.id, balance=0).id
+    admin_client.put(f"/accounts/{b}/stripes", json={"stripes": 4})
+    for n in range(1, 6):
+        pay(admin_client, a, b, n)
+    admin_client.put(f"/accounts/{a}", json={"balance": 50})
+    live = {acc: rollup_rows(db, acc) for acc in (a, b)}
+    assert live[b] == [(today(), 15, 0, 5, 0)]
+
+    db.execute(DailyAccountRollup.__table__.delete())
+    assert rebuild(db) >= 2
+    db.commit()
+    assert {acc: rollup_rows(db, acc) for acc in (a, b)} == live
+
+    assert rebuild(db, account_id=a) == 1
+    db.commit()
+    entries = db.execute(select(func.count()).where(LedgerEntry.account_id == a)).scalar_one()
+    assert entries == 7  # opening, 5 transfers, adjustment
+    assert rollup_rows(db, a) == live[a]
+
+
+def test_customer_sees_only_their_own_summary(customer_client, db):
+    assert customer_client.get(f"/accounts/{create_account(db, create_customer(db).id).id}/summary").status_code == 403
+    assert customer_client.get("/accounts/999999/summary").status_code == 404
+
+
+def test_bad_ranges(admin_client, db):
+    a = create_account(db, create_customer(db).id).id
+    assert admin_client.get(f"/accounts/{a}/summary", params={"from": "2026-02-01", "to": "2026-01-01"}).status_code == 422
+    assert admin_client.get(f"/accounts/{a}/summary", params={"from": "1990-01-01"}).status_code == 422
+    assert admin_client.get(f"/accounts/{a}/summary", params={"granularity": "week"}).status_code == 422
+
+
+def test_deleting_an_account_drops_its_rollups(admin_client, db):
+    a = create_account(db, create_customer(db).id).id
+    assert rollup_rows(db, a) != []
+    assert admin_client.delete(f"/accounts/{a}").status_code == 204
+    assert rollup_rows(db, a) == []
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import Customer, Employee
+from app.services.seed import SAMPLE_CUSTOMERS, seed_admin_employee, seed_initial_customers
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def test_seeding_is_idempotent(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        with Session(engine) as db:
+            assert seed_admin_employee(db, password="Secret123!") is True
+            assert seed_initial_customers(db) is True
+            assert seed_admin_employee(db) is False
+            assert seed_initial_customers(db) is False
+            assert db.scalar(select(func.count()).select_from(Employee)) == 1
+            assert db.scalar(select(func.count()).select_from(Customer)) == len(SAMPLE_CUSTOMERS)
+    finally:
+        engine.dispose()
+
+
+def _run(code, db_path, **env):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", **env},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_fast_start_skips_schema_and_seeding(tmp_path):
+    db_path = tmp_path / "fast.db"
+    boot = "import app.main, sys; sys.exit('app.routers.async_accounts' in sys.modules)"
+    assert _run(boot, db_path, FAST_START="true", DB_ASYNC="false").returncode == 0
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        assert inspect(engine).get_table_names() == []
+
+        seeded = _run("from app.cli import main; main(['seed', '--create-schema'])", db_path)
+        assert seeded.returncode == 0, seeded.stderr
+        assert "Admin user admin@bank.com created" in seeded.stdout
+        with Session(engine) as db:
+            assert db.scalar(select(Employee.email)) == "admin@bank.com"
+    finally:
+        engine.dispose()
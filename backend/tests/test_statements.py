@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.models.ledger import LedgerEntry
+from app.services.statements import statement_stmt, stream_statement
+from .factories import create_customer, create_account
+from .test_query_plans import query_plan
+
+
+def test_statement_csv_running_balance(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+
+    admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "25.50"})
+    admin_client.post("/transfers/", json={"from_account_id": a.id, "to_account_id": b.id, "amount": 40})
+    admin_client.post(f"/accounts/{a.id}/withdraw", params={"amount": "0.25"})
+
+    res = admin_client.get(f"/accounts/{a.id}/statement")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+
+    assert [r["kind"] for r in rows] == ["opening", "deposit", "transfer_out", "withdrawal"]
+    assert [r["amount"] for r in rows] == ["100.00", "25.50", "-40.00", "-0.25"]
+    assert [r["balance"] for r in rows] == ["100.00", "125.50", "85.50", "85.25"]
+    assert rows[2]["counterparty_account_id"] == str(b.id)
+    assert rows[1]["counterparty_account_id"] == ""
+
+
+def test_statement_ndjson_window(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=10)
+    admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "5"})
+    start = datetime.now(timezone.utc)
+    admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "7"})
+    end = datetime.now(timezone.utc)
+    admin_client.post(f"/accounts/{a.id}/deposit", params={"amount": "100"})
+
+    res = admin_client.get(
+        f"/accounts/{a.id}/statement",
+        params={"format": "ndjson", "from": start.isoformat(), "to": end.isoformat()},
+    )
+    assert res.status_code == 200
+    assert res.headers["x-opening-balance"] == "15.00"
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert [(l["kind"], l["amount"], l["balance"]) for l in lines] == [("deposit", "7.00", "22.00")]
+
+
+def test_statement_access(customer_client, db):
+    other = create_customer(db)
+    acc = create_account(db, other.id, balance=10)
+    assert customer_client.get(f"/accounts/{acc.id}/statement").status_code == 403
+    assert customer_client.get("/accounts/999999/statement").status_code == 404
+
+
+def test_statement_streams_in_constant_memory(db):
+    owner = create_customer(db)
+    acc = create_account(db, owner.id, balance=0)
+    lines = 20_000
+    db.execute(insert(LedgerEntry), [
+        {"account_id": acc.id, "amount": Decimal("1.00"), "kind": "deposit",
+         "created_at": datetime(2020, 1, 1, tzinfo=timezone.utc)}
+        for _ in range(lines)
+    ])
+    db.commit()
+
+    chunks = stream_statement(db, acc.id, Decimal(0), None, None, "ndjson")
+    tracemalloc.start()
+    count, peak_chunk = 0, 0
+    last = None
+    for chunk in chunks:
+        count += chunk.count("\n")
+        peak_chunk = max(peak_chunk, len(chunk))
+        last = chunk
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == lines + 1
+    assert json.loads(last.splitlines()[-1])["balance"] == f"{lines}.00"
+    # a few batches' worth, not the whole statement
+    assert peak < 20 * peak_chunk
+
+
+def test_statement_window_needs_no_sort(db):
+    plan = query_plan(db, statement_stmt(1, Decimal(0), datetime(2026, 1, 1, tzinfo=timezone.utc), None))
+    assert any("USING INDEX ix_ledger_entries_account_time" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
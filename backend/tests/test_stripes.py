@@ -0,0 +1,134 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.account import Account as AccountModel, AccountStripe
+from app.models.ledger import BalanceCheckpoint, LedgerEntry
+from app.services.stripes import fold_pending
+from .factories import create_customer, create_account, balance, pay
+
+
+def stripes(db, account_id):
+    db.expire_all()
+    return db.execute(
+        select(AccountStripe.balance, AccountStripe.ledger_count)
+        .where(AccountStripe.account_id == account_id)
+        .order_by(AccountStripe.stripe)
+    ).all()
+
+
+def row(db, account_id):
+    db.expire_all()
+    return db.get(AccountModel, account_id)
+
+
+def striped_pair(admin_client, db, stripe_count=4):
+    owner = create_customer(db)
+    hot = create_account(db, owner.id, balance=100).id
+    payer = create_account(db, owner.id, balance=1000).id
+    res = admin_client.put(f"/accounts/{hot}/stripes", json={"stripes": stripe_count})
+    assert res.status_code == 200
+    assert res.json() == {"account_id": hot, "stripes": stripe_count, "balance": 100.0}
+    return hot, payer
+
+
+def test_credits_land_on_stripes_and_reads_see_the_total(admin_client, db):
+    hot, payer = striped_pair(admin_client, db)
+
+    for _ in range(6):
+        pay(admin_client, payer, hot, 5)
+
+    assert row(db, hot).balance == Decimal("100.00")  # the hot row was not written
+    assert sum(b for b, _ in stripes(db, hot)) == Decimal("30.00")
+    assert sum(n for _, n in stripes(db, hot)) == 6
+    assert balance(admin_client, hot) == Decimal("130.00")
+    listed = {a["id"]: a["balance"] for a in admin_client.get("/accounts/", params={"limit": 100}).json()["items"]}
+    assert listed[hot] == "130.00"
+    assert listed[payer] == "970.00"
+
+
+def test_fold_moves_stripes_into_the_account(admin_client, db):
+    hot, payer = striped_pair(admin_client, db, stripe_count=3)
+    for _ in range(4):
+        pay(admin_client, payer, hot, "2.50")
+
+    assert fold_pending(db) >= 1
+
+    acc = row(db, hot)
+    assert (acc.balance, acc.ledger_count) == (Decimal("110.00"), 5)  # opening + 4 credits
+    assert stripes(db, hot) == [(Decimal("0.00"), 0)] * 3
+    assert balance(admin_client, hot) == Decimal("110.00")
+    assert fold_pending(db) == 0
+
+
+def test_debits_fold_first_and_can_spend_striped_credits(admin_client, db):
+    hot, payer = striped_pair(admin_client, db)
+    pay(admin_client, payer, hot, 50)
+
+    # more than the accounts row alone holds
+    res = admin_client.post(f"/accounts/{hot}/withdraw", params={"amount": "120"})
+    assert res.status_code == 200
+    assert res.json()["new_balance"] == 30.0
+    assert stripes(db, hot) == [(Decimal("0.00"), 0)] * 4
+
+    pay(admin_client, payer, hot, 10)
+    pay(admin_client, hot, payer, 40)
+    assert balance(admin_client, hot) == Decimal("0.00")
+
+    res = admin_client.post(f"/accounts/{hot}/deposit", params={"amount": "5"})
+    assert res.json()["balance"] == 5.0
+    res = admin_client.put(f"/accounts/{hot}", json={"balance": 8})
+    assert res.json()["balance"] == "8.00"
+
+
+def test_batch_and_unstripe_keep_the_balance(admin_client, db):
+    hot, payer = striped_pair(admin_client, db)
+    pay(admin_client, payer, hot, 50)
+
+    res = admin_client.post("/transfers/batch", json={"items": [
+        {"from_account_id": hot, "to_account_id": payer, "amount": 140},
+        {"from_account_id": payer, "to_account_id": hot, "amount": 1},
+    ]})
+    assert [item["status"] for item in res.json()["results"]] == ["committed", "committed"]
+    assert balance(admin_client, hot) == Decimal("11.00")
+
+    pay(admin_client, payer, hot, 4)
+    res = admin_client.put(f"/accounts/{hot}/stripes", json={"stripes": 0})
+    assert res.json()["balance"] == 15.0
+    assert stripes(db, hot) == []
+    assert row(db, hot).stripe_count == 0
+    assert balance(admin_client, hot) == Decimal("15.00")
+
+
+def test_ledger_and_checkpoints_stay_exact(admin_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ledger_checkpoint_interval", 3)
+    hot, payer = striped_pair(admin_client, db, stripe_count=2)
+
+    for n in range(1, 5):
+        pay(admin_client, payer, hot, n)
+    # striped credits take no checkpoint until folded
+    checkpoints = select(BalanceCheckpoint.balance).where(BalanceCheckpoint.account_id == hot)
+    assert db.execute(checkpoints).scalars().all() == []
+    # point-in-time reads replay the ledger, which has every credit
+    res = admin_client.get(f"/accounts/{hot}/balance", params={"as_of": datetime.now(timezone.utc).isoformat()})
+    assert Decimal(res.json()["balance"]) == Decimal("110.00")
+
+    fold_pending(db)
+    assert db.execute(checkpoints).scalars().all() == [Decimal("110.00")]
+
+    entries = db.execute(select(LedgerEntry.amount).where(LedgerEntry.account_id == hot)).scalars().all()
+    assert sum(entries) == row(db, hot).balance
+    assert row(db, hot).ledger_count == len(entries)
+
+
+def test_deleting_a_striped_account_drops_its_stripes(admin_client, db):
+    hot, payer = striped_pair(admin_client, db)
+
+    assert admin_client.delete(f"/accounts/{hot}").status_code == 204
+    assert stripes(db, hot) == []
+
+
+def test_unknown_account(admin_client):
+    assert admin_client.put("/accounts/999999/stripes", json={"stripes": 2}).status_code == 404
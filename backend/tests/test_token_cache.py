@@ -0,0 +1,74 @@
+from app.core.security import create_access_token, decode_token, token_cache
+from app.core.token_cache import TokenCache, token_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_decode_hits_cache():
+    token = create_access_token({"sub": "cache@test.com", "role": "admin"})
+    before = token_cache.stats()
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    after = token_cache.stats()
+    assert first == second and first["sub"] == "cache@test.com"
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_entry_evicted_at_exp():
+    clock = FakeClock()
+    cache = TokenCache(maxsize=10, clock=clock)
+    cache.put(b"a", {"sub": "x", "exp": clock.now + 10})
+
+    assert cache.get(b"a") == {"sub": "x", "exp": clock.now + 10}
+    clock.now += 10
+    assert cache.get(b"a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_expired_token_never_decodes():
+    token = create_access_token({"sub": "old@test.com", "role": "admin"}, expires_minutes=-1)
+    assert decode_token(token) is None
+    assert token_cache.get(token_digest(token)) is None
+
+
+def test_lru_bound_and_expired_purge():
+    clock = FakeClock()
+    cache = TokenCache(maxsize=2, clock=clock)
+    cache.put(b"a", {"exp": clock.now + 5})
+    cache.put(b"b", {"exp": clock.now + 100})
+    cache.get(b"a")
+    cache.put(b"c", {"exp": clock.now + 100})
+
+    # b was least recently used
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None
+
+    clock.now += 6
+    cache.put(b"d", {"exp": clock.now + 100})
+    assert cache.stats()["size"] == 2
+    assert cache.get(b"a") is None
+
+
+def test_logout_revokes_cached_token(client, customer_client):
+    token = customer_client.headers["Authorization"].split()[1]
+    assert decode_token(token) is not None
+
+    res = customer_client.post("/auth/logout")
+    assert res.status_code == 200
+
+    assert decode_token(token) is None
+    res = customer_client.get("/accounts/")
+    assert res.status_code == 401
+
+
+def test_logout_without_token(client):
+    assert client.post("/auth/logout").status_code == 200
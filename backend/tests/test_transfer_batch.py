@@ -0,0 +1,114 @@
+from app.config import settings
+from app.services import transfer_engine
+from .factories import create_customer, create_account, balance
+
+
+def test_batch_atomic_chunks(admin_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "transfer_batch_chunk_size", 2)
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    c = create_account(db, owner.id, balance=0)
+
+    # b and c can only pay out what earlier items in the batch paid in
+    items = [
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": 60},
+        {"from_account_id": b.id, "to_account_id": c.id, "amount": 50},
+        {"from_account_id": c.id, "to_account_id": a.id, "amount": 20},
+        {"from_account_id": a.id, "to_account_id": c.id, "amount": 10},
+        {"from_account_id": b.id, "to_account_id": a.id, "amount": 10},
+    ]
+    res = admin_client.post("/transfers/batch", json={"items": items})
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["committed"] == 5 and body["rejected"] == 0
+    assert all(r["status"] == "committed" and r["transfer_id"] for r in body["results"])
+    assert (balance(admin_client, a.id), balance(admin_client, b.id), balance(admin_client, c.id)) == (60, 0, 40)
+
+
+def test_batch_atomic_rejects_everything_on_failure(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+
+    res = admin_client.post("/transfers/batch", json={"items": [
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": 40},
+        {"from_account_id": b.id, "to_account_id": a.id, "amount": 500},
+    ]})
+
+    body = res.json()
+    assert body["committed"] == 0 and body["rejected"] == 1
+    assert body["results"][0]["status"] == "skipped"
+    assert body["results"][1] == {
+        "index": 1, "status": "rejected", "transfer_id": None,
+        "status_code": 400, "detail": "Insufficient funds",
+    }
+    assert balance(admin_client, a.id) == 100
+    assert balance(admin_client, b.id) == 0
+
+
+def test_batch_best_effort_reports_per_item(admin_client, db):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+
+    res = admin_client.post("/transfers/batch", json={"mode": "best_effort", "items": [
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": 70},
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": 70},
+        {"from_account_id": a.id, "to_account_id": 999999, "amount": 1},
+        {"from_account_id": b.id, "to_account_id": a.id, "amount": 5},
+    ]})
+
+    body = res.json()
+    assert [r["status"] for r in body["results"]] == ["committed", "rejected", "rejected", "committed"]
+    assert body["results"][1]["status_code"] == 400
+    assert body["results"][2]["status_code"] == 404
+    assert balance(admin_client, a.id) == 35
+    assert balance(admin_client, b.id) == 65
+
+    history = admin_client.get(f"/accounts/{b.id}/transfers").json()["items"]
+    assert len(history) == 2
+
+
+def test_batch_customer_only_own_accounts(customer_client, db):
+    other = create_customer(db)
+    a = create_account(db, other.id, balance=100)
+    b = create_account(db, other.id, balance=0)
+
+    res = customer_client.post("/transfers/batch", json={"mode": "best_effort", "items": [
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": 10},
+    ]})
+
+    assert res.json()["results"][0]["status_code"] == 403
+
+
+def test_batch_size_limit(admin_client, monkeypatch):
+    monkeypatch.setattr(settings, "transfer_batch_max_items", 1)
+    item = {"from_account_id": 1, "to_account_id": 2, "amount": 1}
+
+    res = admin_client.post("/transfers/batch", json={"items": [item, item]})
+    assert res.status_code == 413
+
+
+def test_batch_best_effort_rejects_only_the_item_whose_guard_trips(admin_client, db, monkeypatch):
+    owner = create_customer(db)
+    a = create_account(db, owner.id, balance=100)
+    b = create_account(db, owner.id, balance=0)
+    real_apply = transfer_engine._apply_chunk
+
+    def drained(db, chunk):
+        # as if a concurrent writer had drained the account before the amount-3 transfer
+        if any(item.amount == 3 for item in chunk):
+            return None
+        return real_apply(db, chunk)
+
+    monkeypatch.setattr(transfer_engine, "_apply_chunk", drained)
+    res = admin_client.post("/transfers/batch", json={"mode": "best_effort", "items": [
+        {"from_account_id": a.id, "to_account_id": b.id, "amount": amount} for amount in (1, 2, 3, 4, 5)
+    ]})
+
+    body = res.json()
+    assert [r["status"] for r in body["results"]] == ["committed", "committed", "rejected", "committed", "committed"]
+    assert body["results"][2]["status_code"] == 409
+    assert (balance(admin_client, a.id), balance(admin_client, b.id)) == (88, 12)
@@ -0,0 +1,87 @@
+import random
+import threading
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models.account import Account as AccountModel
+from app.services.transfer_engine import execute_transfer
+from .factories import create_customer, create_account
+
+
+def test_engine_rejects_overdraft_without_side_effects(db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=100)
+    acc2 = create_account(db, receiver.id, balance=0)
+
+    with pytest.raises(HTTPException) as exc:
+        execute_transfer(db, acc1.id, acc2.id, Decimal("100.01"))
+    assert exc.value.status_code == 400
+
+    db.expire_all()
+    assert db.get(AccountModel, acc1.id).balance == 100
+    assert db.get(AccountModel, acc2.id).balance == 0
+
+
+def test_engine_returns_loaded_transfer(db):
+    sender = create_customer(db)
+    receiver = create_customer(db)
+    acc1 = create_account(db, sender.id, balance=100)
+    acc2 = create_account(db, receiver.id, balance=0)
+
+    transfer = execute_transfer(db, acc1.id, acc2.id, Decimal("40"), customer_id=sender.id)
+    assert transfer.id and transfer.created_at is not None
+    assert transfer.amount == Decimal("40")
+
+    with pytest.raises(HTTPException) as exc:
+        execute_transfer(db, acc1.id, acc2.id, Decimal("1"), customer_id=receiver.id)
+    assert exc.value.status_code == 403
+
+
+def test_concurrent_transfers_conserve_money(db, session_factory):
+    """Hammer a few accounts from many threads; money is neither created nor lost."""
+    owner = create_customer(db)
+    account_ids = [create_account(db, owner.id, balance=50).id for _ in range(6)]
+
+    def total():
+        with session_factory() as s:
+            return s.execute(
+                select(func.sum(AccountModel.balance)).where(AccountModel.id.in_(account_ids))
+            ).scalar_one()
+
+    before = total()
+    threads, per_thread = 8, 40
+    outcomes = {"ok": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        with session_factory() as s:
+            for _ in range(per_thread):
+                src, dst = rng.sample(account_ids, 2)
+                try:
+                    execute_transfer(s, src, dst, Decimal(rng.randint(1, 30)))
+                    key = "ok"
+                except HTTPException as e:
+                    assert e.status_code == 400
+                    key = "rejected"
+                with lock:
+                    outcomes[key] += 1
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    assert outcomes["ok"] + outcomes["rejected"] == threads * per_thread
+    assert outcomes["ok"] > 0
+    assert total() == before
+    with session_factory() as s:
+        balances = s.execute(
+            select(AccountModel.balance).where(AccountModel.id.in_(account_ids))
+        ).scalars().all()
+    assert min(balances) >= 0
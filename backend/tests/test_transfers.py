@@ -54,4 +54,22 @@ def test_transfer_history_after_operation(admin_client, db):
     })
 
     history = admin_client.get(f"/accounts/{acc1.id}/transfers").json()
-    assert len(history) == 1
+    assert len(history["items"]) == 1
+
+
+def test_created_transfer_matches_later_reads(admin_client, db):
+    owner = create_customer(db)
+    acc1 = create_account(db, owner.id, balance=100)
+    acc2 = create_account(db, owner.id, balance=0)
+
+    res = admin_client.post("/transfers/", json={
+        "from_account_id": acc1.id,
+        "to_account_id": acc2.id,
+        "amount": "10"
+    })
+    assert res.status_code == 201
+    created = res.json()
+    assert created["amount"] == "10.00"
+
+    listed = admin_client.get("/transfers/", params={"limit": 100}).json()["items"]
+    assert [t for t in listed if t["id"] == created["id"]] == [created]